@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+"""Load test the HTTP API against the configured Postgres database.
+
+Starts the API in-process with uvicorn, then sends ``--requests`` GET
+requests from ``--concurrency`` client threads, cycling over the list, search
+and detail endpoints. Each scenario reports requests per second and latency
+percentiles:
+
+* ``uncached`` - response cache and query cache disabled, every request
+  reads from Postgres and serializes
+* ``cached`` - encoded responses served from the cache
+* ``revalidated`` - clients send ``If-None-Match`` and get 304 responses
+
+Point ``TCI_POSTGRES_DB`` at a database with data, e.g. one filled by
+``scripts/import_companies.py``.
+"""
+import argparse
+import socket
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+import requests
+import uvicorn
+
+from tci.api.routes import app
+from tci.core.cache import query_cache
+from tci.core.config import settings
+from tci.services.company import company_service
+from tci.services.jobs import job_service
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port: int) -> uvicorn.Server:
+    config = uvicorn.Config(
+        app, host="127.0.0.1", port=port, log_level="warning", access_log=False
+    )
+    server = uvicorn.Server(config)
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+def endpoints() -> List[str]:
+    paths = ["/companies", "/jobs", "/companies?limit=200", "/search?q=engineer"]
+    page = company_service.get_company_summaries_page(limit=20)
+    paths += [f"/companies/{company.id}" for company in page.items]
+    jobs = job_service.get_job_summaries_page(limit=20)
+    paths += [f"/jobs/{job.id}" for job in jobs.items]
+    return paths
+
+
+def run(
+    base_url: str,
+    paths: List[str],
+    total: int,
+    concurrency: int,
+    etags: Optional[Dict[str, str]] = None,
+) -> Dict[str, float]:
+    local = threading.local()
+
+    def request(index: int) -> float:
+        if not hasattr(local, "session"):
+            local.session = requests.Session()
+            local.session.headers["Accept-Encoding"] = "br, gzip"
+        path = paths[index % len(paths)]
+        headers = {"If-None-Match": etags[path]} if etags else None
+        started = time.perf_counter()
+        response = local.session.get(base_url + path, headers=headers)
+        elapsed = time.perf_counter() - started
+        if response.status_code not in (200, 304):
+            raise RuntimeError(f"{path}: HTTP {response.status_code}")
+        return elapsed
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        latencies = sorted(pool.map(request, range(total)))
+    elapsed = time.perf_counter() - started
+    return {
+        "rps": total / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test the HTTP API")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    port = free_port()
+    server = start_server(port)
+    base_url = f"http://127.0.0.1:{port}"
+    paths = endpoints()
+
+    print(f"{'scenario':<12} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8}")
+
+    def report(name: str, result: Dict[str, float]) -> None:
+        print(
+            f"{name:<12} {result['rps']:8.0f} {result['p50_ms']:8.1f} "
+            f"{result['p99_ms']:8.1f}"
+        )
+
+    ttl, settings.API_RESPONSE_CACHE = query_cache.ttl, False
+    query_cache.ttl = 0
+    report("uncached", run(base_url, paths, args.requests, args.concurrency))
+
+    query_cache.ttl, settings.API_RESPONSE_CACHE = ttl, True
+    query_cache.clear()
+    run(base_url, paths, len(paths), 1)  # warm the cache
+    report("cached", run(base_url, paths, args.requests, args.concurrency))
+
+    etags = {path: requests.get(base_url + path).headers["ETag"] for path in paths}
+    report("revalidated", run(base_url, paths, args.requests, args.concurrency, etags))
+    server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
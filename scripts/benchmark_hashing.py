@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+"""Benchmark password verification throughput at different pool sizes.
+
+Simulates a burst of logins: ``--clients`` request threads each verify
+passwords through a :class:`~tci.services.hashing.PasswordHasher`, and the
+script reports logins per second for every pool size. Throughput should grow
+with the pool until it reaches the number of cores, since bcrypt releases the
+GIL while hashing.
+"""
+import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from tci.core.config import settings
+from tci.services.hashing import PasswordHasher
+
+PASSWORD = "correct horse battery staple"
+
+
+def logins_per_second(hasher: PasswordHasher, hashed: str, logins: int, clients: int):
+    """Verify ``logins`` passwords from ``clients`` concurrent request threads"""
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as requests:
+        results = list(
+            requests.map(lambda _: hasher.verify(PASSWORD, hashed), range(logins))
+        )
+    elapsed = time.perf_counter() - started
+    assert all(results)
+    return logins / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark password hashing")
+    parser.add_argument(
+        "--rounds",
+        type=int,
+        default=settings.BCRYPT_LOG_ROUNDS,
+        help="bcrypt cost factor",
+    )
+    parser.add_argument(
+        "--pool-sizes",
+        type=int,
+        nargs="+",
+        default=[1, 2, 4, 8],
+        help="Worker pool sizes to compare",
+    )
+    parser.add_argument("--logins", type=int, default=32, help="Logins per pool size")
+    parser.add_argument(
+        "--clients", type=int, default=32, help="Concurrent request threads"
+    )
+    args = parser.parse_args()
+
+    hashed = PasswordHasher(rounds=args.rounds, max_workers=1).hash(PASSWORD)
+    print(f"bcrypt cost {args.rounds}, {args.logins} logins, {args.clients} clients")
+    print(f"{'workers':>8} {'logins/s':>10} {'ms/login':>10}")
+
+    for size in args.pool_sizes:
+        hasher = PasswordHasher(rounds=args.rounds, max_workers=size)
+        rate = logins_per_second(hasher, hashed, args.logins, args.clients)
+        hasher.shutdown()
+        print(f"{size:>8} {rate:>10.1f} {1000 / rate:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
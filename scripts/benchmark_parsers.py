@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+"""Benchmark the scraper parser backends on large HTML pages.
+
+Compares records per second of the original parsing path (whole-document
+``html.parser`` soup, selector strings re-parsed for every field) with the
+``soup`` and ``lxml`` backends from ``tci.data.scrapers.parsers``.
+
+Without arguments a large synthetic career page is generated and saved under
+``--fixtures-dir`` so later runs reuse the same file; pass saved pages to
+benchmark real markup instead.
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterator
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from bs4 import BeautifulSoup
+
+from tci.data.scrapers.company import DEFAULT_SELECTORS as COMPANY_SELECTORS
+from tci.data.scrapers.jobs import DEFAULT_SELECTORS as JOB_SELECTORS
+from tci.data.scrapers.parsers import PARSERS
+
+JOB_TEMPLATE = """
+  <div class="job-posting" data-id="{i}">
+    <h3 class="job-title">Senior Engineer {i}</h3>
+    <div class="department">R&amp;D</div>
+    <div class="location">Tel Aviv</div>
+    <div class="job-description"><p>Build services for team {i}.</p>
+      <ul><li>Python</li><li>PostgreSQL</li><li>Kubernetes</li></ul></div>
+    <a class="apply-button" href="/jobs/{i}/apply">Apply</a>
+  </div>"""
+
+
+def generate_fixture(path: Path, containers: int) -> Path:
+    """Write a synthetic career page with ``containers`` job postings"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('<html><head><meta charset="utf-8"></head><body>')
+        f.write('<nav><a href="/">Home</a></nav><main>')
+        for i in range(containers):
+            f.write(JOB_TEMPLATE.format(i=i))
+        f.write("</main><footer>Example Tech</footer></body></html>")
+    return path
+
+
+def baseline_records(content: bytes, selectors: Dict[str, str], container_key: str):
+    """The parsing loop the scrapers used before the parser layer existed"""
+    soup = BeautifulSoup(content, "html.parser")
+    for container in soup.select(selectors[container_key]):
+        record = {}
+        for field, selector in selectors.items():
+            if field == container_key:
+                continue
+            element = container.select_one(selector)
+            record[field] = element.text.strip() if element else None
+        yield record
+
+
+def time_parser(parse: Callable[[], Iterator[dict]], repeat: int) -> Dict[str, float]:
+    best = float("inf")
+    records = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        records = sum(1 for _ in parse())
+        best = min(best, time.perf_counter() - start)
+    return {"records": records, "seconds": best, "rate": records / best}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark scraper parsers")
+    parser.add_argument("html_files", nargs="*", type=Path, help="Saved HTML pages")
+    parser.add_argument(
+        "--kind",
+        choices=["jobs", "companies"],
+        default="jobs",
+        help="Which default selectors to apply to the pages",
+    )
+    parser.add_argument(
+        "--containers",
+        type=int,
+        default=20000,
+        help="Number of postings in the generated fixture",
+    )
+    parser.add_argument(
+        "--fixtures-dir",
+        type=Path,
+        default=project_root / "benchmarks" / "fixtures",
+        help="Where generated fixtures are saved",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per backend")
+    args = parser.parse_args()
+
+    if args.kind == "jobs":
+        selectors, container_key = JOB_SELECTORS, "job_container"
+    else:
+        selectors, container_key = COMPANY_SELECTORS, "company_container"
+
+    files = args.html_files
+    if not files:
+        fixture = args.fixtures_dir / f"jobs_{args.containers}.html"
+        if not fixture.exists():
+            print(f"Generating fixture: {fixture}")
+            generate_fixture(fixture, args.containers)
+        files = [fixture]
+        selectors, container_key = JOB_SELECTORS, "job_container"
+
+    for path in files:
+        content = path.read_bytes()
+        print(f"\n{path} ({len(content) / 1024 / 1024:.1f} MiB)")
+        candidates = {
+            "baseline": lambda: baseline_records(content, selectors, container_key)
+        }
+        for name, backend in PARSERS.items():
+            candidates[name] = lambda backend=backend: backend.iter_records(
+                content, selectors, container_key
+            )
+
+        baseline_rate = None
+        for name, parse in candidates.items():
+            result = time_parser(parse, args.repeat)
+            baseline_rate = baseline_rate or result["rate"]
+            print(
+                f"  {name:<10} {result['records']:>8} records  "
+                f"{result['seconds']:>7.3f}s  {result['rate']:>10.0f} records/s  "
+                f"x{result['rate'] / baseline_rate:.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
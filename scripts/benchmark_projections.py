@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+"""Benchmark ORM hydration against read-only projections.
+
+Inserts ``--rows`` synthetic jobs inside a transaction, loads them once as
+full ``Job`` instances and once as ``JobSummary`` projections, and reports
+rows per second and peak Python memory for each. The transaction is rolled
+back afterwards, so the database is left untouched.
+"""
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from tci.core.utils import batched
+from tci.db.models import Job
+from tci.db.postgresql import db
+from tci.db.projections import JobSummary, job_summaries, to_projections
+
+
+def insert_jobs(session: Session, count: int) -> None:
+    """Insert ``count`` jobs that look like scraped postings"""
+    now = datetime.utcnow()
+    rows = (
+        {
+            "title": f"Senior Backend Engineer {i}",
+            "description": "Build and operate data services. " * 20,
+            "location": "Tel Aviv",
+            "job_type": "Full-time",
+            "salary_range": "30k-40k",
+            "created_at": now - timedelta(seconds=i),
+            "updated_at": now,
+        }
+        for i in range(count)
+    )
+    for chunk in batched(rows, 5000):
+        session.execute(insert(Job.__table__), chunk)
+
+
+def measure(load: Callable[[], List]) -> Dict[str, float]:
+    """Run ``load`` once, returning rows/s and peak traced memory"""
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    rows = load()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "rows": len(rows),
+        "rows_per_second": len(rows) / elapsed,
+        "peak_mb": peak / 1024 / 1024,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare ORM hydration with read-only projections"
+    )
+    parser.add_argument("--rows", type=int, default=100_000, help="Jobs to load")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per method")
+    args = parser.parse_args()
+
+    with db.get_session() as session:
+        try:
+            insert_jobs(session, args.rows)
+
+            def orm() -> List[Job]:
+                session.expunge_all()
+                return session.query(Job).limit(args.rows).all()
+
+            def projection() -> List[JobSummary]:
+                return to_projections(
+                    JobSummary, job_summaries(session).limit(args.rows)
+                )
+
+            print(f"{'method':<12} {'rows':>8} {'rows/s':>12} {'peak MB':>10}")
+            for name, load in (("orm", orm), ("projection", projection)):
+                runs = [measure(load) for _ in range(args.repeat)]
+                best = max(runs, key=lambda run: run["rows_per_second"])
+                print(
+                    f"{name:<12} {best['rows']:>8} "
+                    f"{best['rows_per_second']:>12,.0f} {best['peak_mb']:>10.1f}"
+                )
+        finally:
+            session.rollback()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+"""Export companies or jobs to NDJSON, CSV or Parquet."""
+import argparse
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from tci.data.export import EXPORTS, MEDIA_TYPES, export
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Export companies or jobs")
+    parser.add_argument("kind", choices=sorted(EXPORTS))
+    parser.add_argument(
+        "--format", choices=sorted(MEDIA_TYPES), default="ndjson", dest="fmt"
+    )
+    parser.add_argument(
+        "--output", type=Path, help="Output file, defaults to standard output"
+    )
+    parser.add_argument(
+        "--since",
+        type=datetime.fromisoformat,
+        help="Only rows updated at or after this UTC time, e.g. 2024-05-01T00:00",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        help="Rows per fetch and encoded chunk, defaults to settings.EXPORT_CHUNK_SIZE",
+    )
+    args = parser.parse_args()
+
+    if args.output is None:
+        stats = export(
+            args.kind, args.fmt, sys.stdout.buffer, args.since, args.chunk_size
+        )
+    else:
+        with open(args.output, "wb") as out:
+            stats = export(args.kind, args.fmt, out, args.since, args.chunk_size)
+
+    print(
+        f"Exported {stats.rows} {args.kind} ({stats.bytes / 1024 / 1024:.1f} MB) "
+        f"in {stats.seconds:.1f}s",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,89 +1,137 @@
 #!/usr/bin/env python
-"""Import companies from a CSV file into the database."""
+"""Import companies from a CSV file into the database.
+
+Rows are upserted on the unique company name. Databases created before names
+were unique need ``python scripts/init_database.py`` first: it merges
+companies sharing a name (moving their jobs) and adds the constraint.
+"""
 import argparse
 import csv
 import sys
+import time
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Dict, Iterator, Optional
 
 # Add project root to Python path
 project_root = Path(__file__).parent.parent
 sys.path.append(str(project_root))
 
+from tci.core.utils import batched
+from tci.data.processors.entities import CompanyResolver
+from tci.db.bulk import UpsertCounts, upsert_companies
 from tci.db.postgresql import db
-from tci.db.models import Company
+
+DEFAULT_CHUNK_SIZE = 5000
 
 
-def read_companies_csv(csv_path: Path) -> List[Dict[str, str]]:
-    """Read company data from CSV file."""
-    companies: List[Dict[str, str]] = []
-    
-    with open(csv_path, 'r', encoding='utf-8') as f:
+def read_companies_csv(csv_path: Path) -> Iterator[Dict[str, Optional[str]]]:
+    """Stream company data from a CSV file, one row at a time."""
+    with open(csv_path, "r", encoding="utf-8", newline="") as f:
         reader = csv.DictReader(f)
-        if not {'name', 'website'}.issubset(set(reader.fieldnames or [])):
+        if not {"name", "website"}.issubset(set(reader.fieldnames or [])):
             raise ValueError("CSV must contain 'name' and 'website' columns")
-        
+
         for row in reader:
-            companies.append({
-                'name': row['name'].strip(),
-                'website': row['website'].strip() if row['website'] else None,
-                'description': row.get('description', '').strip() or None
-            })
-    
-    return companies
+            name = (row["name"] or "").strip()
+            if not name:
+                continue
+            yield {
+                "name": name,
+                "website": (row["website"] or "").strip() or None,
+                "description": (row.get("description") or "").strip() or None,
+            }
+
+
+def import_companies(
+    companies: Iterator[Dict[str, Optional[str]]],
+    dry_run: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    resolve: bool = True,
+) -> UpsertCounts:
+    """Import companies into the database in chunks.
 
+    Each chunk is upserted with a single statement and committed on its own,
+    so an interrupted import keeps the chunks that already finished. A dry run
+    performs the same statements in one transaction and rolls it back.
+
+    With ``resolve``, rows are first matched against the stored companies (and
+    each other) by normalized name and website domain, so "Example Ltd" with
+    www.example.com updates the existing "Example" instead of adding a
+    duplicate.
+    """
+    totals = UpsertCounts()
+    started = time.monotonic()
 
-def import_companies(companies: List[Dict[str, str]], dry_run: bool = False) -> None:
-    """Import companies into the database."""
     with db.get_session() as session:
-        for company_data in companies:
-            # Check if company already exists
-            existing = session.query(Company).filter(
-                Company.name == company_data['name']
-            ).first()
-            
-            if existing:
-                print(f"[SKIP] Company already exists: {company_data['name']}")
-                continue
-            
-            company = Company(**company_data)
-            session.add(company)
-            print(f"[{'WOULD ADD' if dry_run else 'ADD'}] {company_data['name']}")
-        
-        if not dry_run:
-            session.commit()
-            print(f"\nSuccessfully imported {len(companies)} companies")
-        else:
+        if resolve:
+            resolver = CompanyResolver()
+            known = resolver.load_existing(session)
+            print(f"Matching against {known} existing companies")
+            companies = resolver.canonicalize_all(companies)
+
+        for number, chunk in enumerate(batched(companies, chunk_size), start=1):
+            totals += upsert_companies(session, chunk)
+            if not dry_run:
+                session.commit()
+
+            rate = totals.total / max(time.monotonic() - started, 1e-9)
+            print(
+                f"[chunk {number}] {totals.total} rows - added {totals.added}, "
+                f"updated {totals.updated}, skipped {totals.skipped} "
+                f"({rate:.0f} rows/s)"
+            )
+
+        if dry_run:
             session.rollback()
-            print(f"\nDry run completed. Would import {len(companies)} companies")
+
+    action = "Dry run completed. Would have" if dry_run else "Successfully"
+    print(
+        f"\n{action} added {totals.added}, updated {totals.updated} "
+        f"and skipped {totals.skipped} companies"
+    )
+    return totals
 
 
 def main() -> None:
     parser = argparse.ArgumentParser(description="Import companies from CSV")
     parser.add_argument(
-        "csv_file",
-        type=Path,
-        help="Path to CSV file containing company data"
+        "csv_file", type=Path, help="Path to CSV file containing company data"
     )
     parser.add_argument(
         "--dry-run",
         action="store_true",
-        help="Show what would be imported without making changes"
+        help="Show what would be imported without making changes",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help="Rows per upsert statement and commit",
+    )
+    parser.add_argument(
+        "--exact-names",
+        action="store_true",
+        help="Match existing companies by exact name only, without entity resolution",
     )
-    
+
     args = parser.parse_args()
-    
+
     if not args.csv_file.exists():
         print(f"Error: File not found: {args.csv_file}")
         sys.exit(1)
-    
+
     try:
         companies = read_companies_csv(args.csv_file)
-        import_companies(companies, dry_run=args.dry_run)
+        import_companies(
+            companies,
+            dry_run=args.dry_run,
+            chunk_size=args.chunk_size,
+            resolve=not args.exact_names,
+        )
     except Exception as e:
         print(f"Error: {str(e)}")
         sys.exit(1)
 
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
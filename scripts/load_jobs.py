@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+"""Scrape career pages and load their job openings into the database."""
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from tci.data.loaders.jobs import JobLoader
+from tci.data.processors.dedup import JobDeduplicator
+from tci.data.scrapers.jobs import iter_crawled_job_openings
+from tci.db.postgresql import db
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load scraped jobs")
+    parser.add_argument("urls", nargs="*", help="Career page URLs")
+    parser.add_argument(
+        "--url-file", type=Path, help="File with one career page URL per line"
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        help="Jobs per upsert and commit, defaults to settings.JOB_LOAD_BATCH_SIZE",
+    )
+    parser.add_argument(
+        "--no-dedup",
+        action="store_true",
+        help="Load near-duplicate postings instead of dropping them",
+    )
+    parser.add_argument(
+        "--keep-missing",
+        action="store_true",
+        help="Do not close stored postings that the pages no longer list",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    urls = list(args.urls)
+    if args.url_file:
+        urls += [
+            line.strip()
+            for line in args.url_file.read_text().splitlines()
+            if line.strip()
+        ]
+    if not urls:
+        parser.error("no career page URLs given")
+
+    deduplicator = None
+    if not args.no_dedup:
+        deduplicator = JobDeduplicator()
+        with db.session_scope() as session:
+            print(f"Indexed {deduplicator.load_existing(session)} open jobs")
+
+    loader = JobLoader(batch_size=args.batch_size, deduplicator=deduplicator)
+    stats = loader.load(
+        iter_crawled_job_openings(urls), close_missing=not args.keep_missing
+    )
+    print(stats.summary())
+
+
+if __name__ == "__main__":
+    main()
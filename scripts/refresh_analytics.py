@@ -0,0 +1,32 @@
+#!/usr/bin/env python
+"""Refresh the job rollups behind the Analytics page."""
+import argparse
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from tci.services.analytics import analytics_service
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Refresh analytics rollups")
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Rebuild from every job instead of the jobs changed since last refresh",
+    )
+    args = parser.parse_args()
+
+    stats = analytics_service.refresh(full=args.full)
+    print(
+        f"Scanned {stats.scanned} jobs: {stats.changed} changed, "
+        f"{stats.unchanged} unchanged, {stats.deleted} deleted; "
+        f"updated {stats.keys_updated} rollups in {stats.seconds:.2f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
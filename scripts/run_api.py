@@ -0,0 +1,31 @@
+#!/usr/bin/env python
+"""Serve the read-only HTTP API with uvicorn."""
+import argparse
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+import uvicorn
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the HTTP API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes")
+    args = parser.parse_args()
+
+    uvicorn.run(
+        "tci.api.routes:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        access_log=False,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+"""Train the ML models and save them under settings.MODEL_PATH."""
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from tci.ml.training.pipelines import job_type_pipeline, save_model
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Train ML models")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Processes for cross-validation (default: one per CPU)",
+    )
+    parser.add_argument(
+        "--force",
+        nargs="*",
+        default=[],
+        metavar="STAGE",
+        help="Rerun these stages even if cached (load, split, search, evaluate)",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    try:
+        result = job_type_pipeline(n_jobs=args.workers).run(force=args.force)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    path = save_model("job_type", result)
+    metrics = result.artifacts["evaluate"]
+    print(f"\n{result.summary()}\n")
+    print(
+        f"Best params {result.artifacts['search']['best_params']}: "
+        f"accuracy {metrics['accuracy']:.3f}, macro F1 {metrics['macro_f1']:.3f} "
+        f"on {metrics['test_size']} held-out jobs"
+    )
+    print(f"Model saved to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+"""Embed new and changed companies and jobs."""
+import argparse
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from tci.ml.features.embeddings import SOURCES, EmbeddingPipeline, get_encoder
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Update company and job embeddings")
+    # Not `choices`: argparse checks the empty default list against them
+    parser.add_argument(
+        "kinds",
+        nargs="*",
+        help=f"What to embed: {', '.join(sorted(SOURCES))} (default: all)",
+    )
+    parser.add_argument(
+        "--encoder", help="Encoder name, defaults to settings.EMBEDDING_MODEL"
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Check every row's text hash, not only rows updated since last run",
+    )
+    args = parser.parse_args(argv)
+    unknown = sorted(set(args.kinds) - set(SOURCES))
+    if unknown:
+        parser.error(f"unknown kinds: {', '.join(unknown)}")
+
+    pipeline = EmbeddingPipeline(get_encoder(args.encoder))
+    for kind in args.kinds or sorted(SOURCES):
+        stats = pipeline.run(kind, full=args.full)
+        print(
+            f"{kind}: scanned {stats.scanned}, unchanged {stats.unchanged}, "
+            f"encoded {stats.encoded}, reused {stats.reused}, "
+            f"removed {stats.removed} ({stats.seconds:.1f}s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Encoded, revalidatable JSON responses.
+
+An :class:`EncodedResponse` holds a serialized JSON body together with its
+ETag and, lazily, its gzip and brotli encodings, so a response kept in the
+cache is serialized and compressed once and then served as is. Clients that
+send the ETag back in ``If-None-Match`` get an empty ``304 Not Modified``.
+
+Brotli is used when the ``brotli`` package is installed and the client
+accepts it, gzip otherwise.
+"""
+
+import gzip
+import hashlib
+import threading
+from typing import Any, Dict, Optional
+
+import orjson
+from fastapi import Request, Response
+
+from tci.core.config import settings
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+JSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY
+GZIP_LEVEL = 6
+# Quality 4-5 compresses about as well as gzip -6 while being faster
+BROTLI_QUALITY = 4
+
+
+def dumps(payload: Any) -> bytes:
+    """Serialize to JSON with orjson; datetimes are written as UTC ISO 8601"""
+    return orjson.dumps(payload, option=JSON_OPTIONS)
+
+
+def make_etag(*parts: Any) -> str:
+    """Weak ETag for the given version information, e.g. ids and updated_at"""
+    digest = hashlib.blake2b(
+        orjson.dumps(parts, default=str, option=JSON_OPTIONS), digest_size=16
+    )
+    return f'W/"{digest.hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of ``etag`` against an If-None-Match header"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Preferred content coding the client accepts: "br", "gzip" or None"""
+    accepted = set()
+    for item in (accept_encoding or "").split(","):
+        coding, _, params = item.strip().partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(coding.strip().lower())
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted or "*" in accepted:
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+    raise ValueError(f"Unsupported content encoding: {encoding!r}")
+
+
+class EncodedResponse:
+    """A JSON body with its ETag and memoized compressed encodings"""
+
+    def __init__(self, payload: Any, etag: str):
+        self.body = dumps(payload)
+        self.etag = etag
+        self._encoded: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def encoded(self, encoding: Optional[str]) -> bytes:
+        if encoding is None or len(self.body) < settings.API_COMPRESS_MIN_BYTES:
+            return self.body
+        with self._lock:
+            if encoding not in self._encoded:
+                self._encoded[encoding] = compress(self.body, encoding)
+            return self._encoded[encoding]
+
+    def render(self, request: Request) -> Response:
+        """Full response, or 304 if the client's copy is still current"""
+        headers = {
+            "ETag": self.etag,
+            "Cache-Control": "no-cache",
+            "Vary": "Accept-Encoding",
+        }
+        if etag_matches(request.headers.get("if-none-match"), self.etag):
+            return Response(status_code=304, headers=headers)
+
+        encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+        body = self.encoded(encoding)
+        if body is not self.body:
+            headers["Content-Encoding"] = encoding
+        return Response(body, media_type="application/json", headers=headers)
@@ -0,0 +1,220 @@
+"""Read-only HTTP API for companies, jobs and search.
+
+Lists use the same opaque cursors as the services (see
+``tci.db.pagination``); search results, which are ordered by relevance, are
+paged with cursors wrapping an offset. Every response carries an ETag
+computed from the ids and ``updated_at`` of the rows it contains, and
+encoded responses are kept in the query cache under the "companies" and
+"jobs" namespaces, so writes that invalidate those namespaces drop them too.
+
+Run with ``scripts/run_api.py`` or any ASGI server: ``uvicorn tci.api.routes:app``.
+"""
+
+import base64
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import orjson
+from fastapi import APIRouter, FastAPI, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+
+from tci.api.responses import EncodedResponse, make_etag
+from tci.core.cache import query_cache
+from tci.core.config import settings
+from tci.data.export import (
+    COMPANY_FIELDS,
+    EXPORTS,
+    JOB_FIELDS,
+    MEDIA_TYPES,
+    stream_export,
+)
+from tci.db.pagination import Page
+from tci.services.company import company_service
+from tci.services.jobs import job_service
+
+router = APIRouter()
+
+Limit = Query(None, ge=1, description="Page size, defaults to settings.API_PAGE_SIZE")
+
+
+def page_size(limit: Optional[int]) -> int:
+    return min(limit or settings.API_PAGE_SIZE, settings.API_MAX_PAGE_SIZE)
+
+
+def encode_offset(offset: int) -> str:
+    return base64.urlsafe_b64encode(orjson.dumps({"offset": offset})).decode("ascii")
+
+
+def decode_offset(cursor: Optional[str]) -> int:
+    if not cursor:
+        return 0
+    try:
+        offset = int(orjson.loads(base64.urlsafe_b64decode(cursor))["offset"])
+    except (TypeError, ValueError, KeyError, orjson.JSONDecodeError) as e:
+        raise HTTPException(400, f"Invalid cursor: {cursor!r}") from e
+    if offset < 0:
+        raise HTTPException(400, f"Invalid cursor: {cursor!r}")
+    return offset
+
+
+def versions(items: List[Dict[str, Any]]) -> List[Tuple[Any, Any]]:
+    """What the ETag of a list is computed from"""
+    return [(item["id"], item.get("updated_at")) for item in items]
+
+
+def respond(
+    request: Request,
+    namespace: str,
+    build: Callable[[], Tuple[Dict[str, Any], str]],
+) -> Response:
+    """Serve ``build()``'s payload and ETag, from the response cache if possible"""
+    if not settings.API_RESPONSE_CACHE:
+        return EncodedResponse(*build()).render(request)
+    key = (
+        namespace,
+        "api",
+        request.url.path,
+        tuple(sorted(request.query_params.multi_items())),
+    )
+    response = query_cache.get_or_set(key, lambda: EncodedResponse(*build()))
+    return response.render(request)
+
+
+def page_payload(page: Page) -> Tuple[Dict[str, Any], str]:
+    items = [item._asdict() for item in page.items]
+    payload = {
+        "items": items,
+        "next_cursor": page.next_cursor,
+        "prev_cursor": page.prev_cursor,
+    }
+    return payload, make_etag(versions(items), page.next_cursor, page.prev_cursor)
+
+
+def row_payload(row: Any, fields: Tuple[str, ...]) -> Tuple[Dict[str, Any], str]:
+    payload = {field: getattr(row, field) for field in fields}
+    return payload, make_etag(payload["id"], payload["updated_at"])
+
+
+def list_or_400(load: Callable[[], Page]) -> Page:
+    try:
+        return load()
+    except ValueError as e:
+        raise HTTPException(400, str(e)) from e
+
+
+@router.get("/companies")
+def list_companies(
+    request: Request, cursor: Optional[str] = None, limit: Optional[int] = Limit
+) -> Response:
+    """Companies, newest first"""
+
+    def build():
+        return page_payload(
+            list_or_400(
+                lambda: company_service.get_company_summaries_page(
+                    cursor, page_size(limit)
+                )
+            )
+        )
+
+    return respond(request, "companies", build)
+
+
+@router.get("/companies/{company_id}")
+def get_company(request: Request, company_id: int) -> Response:
+    def build():
+        company = company_service.get_company(company_id)
+        if company is None:
+            raise HTTPException(404, "Company not found")
+        return row_payload(company, COMPANY_FIELDS)
+
+    return respond(request, "companies", build)
+
+
+@router.get("/jobs")
+def list_jobs(
+    request: Request, cursor: Optional[str] = None, limit: Optional[int] = Limit
+) -> Response:
+    """Jobs, newest first"""
+
+    def build():
+        return page_payload(
+            list_or_400(
+                lambda: job_service.get_job_summaries_page(cursor, page_size(limit))
+            )
+        )
+
+    return respond(request, "jobs", build)
+
+
+@router.get("/jobs/{job_id}")
+def get_job(request: Request, job_id: int) -> Response:
+    def build():
+        job = job_service.get_job_by_id(job_id)
+        if job is None:
+            raise HTTPException(404, "Job not found")
+        return row_payload(job, JOB_FIELDS)
+
+    return respond(request, "jobs", build)
+
+
+@router.get("/search")
+def search(
+    request: Request,
+    q: str = Query(..., min_length=1, description="Search terms"),
+    kind: str = Query("jobs", pattern="^(jobs|companies)$"),
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Limit,
+) -> Response:
+    """Jobs or companies matching ``q``, most relevant first"""
+    offset = decode_offset(cursor)
+    size = page_size(limit)
+
+    def build():
+        # One extra row tells whether there is a next page
+        if kind == "jobs":
+            rows = job_service.search_job_summaries(q, size + 1, offset)
+        else:
+            rows = company_service.get_company_summaries(q, size + 1, offset)
+        items = [row._asdict() for row in rows[:size]]
+        next_cursor = encode_offset(offset + size) if len(rows) > size else None
+        prev_cursor = encode_offset(max(offset - size, 0)) if offset else None
+        payload = {
+            "items": items,
+            "next_cursor": next_cursor,
+            "prev_cursor": prev_cursor,
+        }
+        return payload, make_etag(q, kind, offset, versions(items), next_cursor)
+
+    return respond(request, kind, build)
+
+
+@router.get("/export/{kind}")
+def export(
+    kind: str,
+    format: str = Query("ndjson", pattern="^(ndjson|csv|parquet)$"),
+    updated_since: Optional[datetime] = Query(
+        None, description="Only rows updated at or after this time"
+    ),
+) -> StreamingResponse:
+    """Full or incremental dump of companies or jobs, streamed chunk by chunk"""
+    if kind not in EXPORTS:
+        raise HTTPException(404, f"Unknown export: {kind!r}")
+    if updated_since is not None and updated_since.tzinfo is not None:
+        # Stored timestamps are naive UTC
+        updated_since = updated_since.astimezone(timezone.utc).replace(tzinfo=None)
+    filename = f"{kind}.{format}"
+    return StreamingResponse(
+        stream_export(kind, format, updated_since),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+def create_app() -> FastAPI:
+    app = FastAPI(title="Tech Companies Israel API", version="1.0")
+    app.include_router(router)
+    return app
+
+
+app = create_app()
@@ -0,0 +1,170 @@
+"""Thread-safe in-process TTL/LRU cache.
+
+Keys are tuples whose first element names a *namespace* (e.g. ``"companies"``)
+so a write can drop every cached read it may have affected with one
+:meth:`TTLCache.invalidate` call. Each namespace carries a generation number
+that invalidation bumps; :meth:`TTLCache.get_or_set` only stores a value if
+the generation it started with is still current, so a read that raced with a
+write can never put stale data back into the cache.
+"""
+
+import functools
+import inspect
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+from tci.core.config import settings
+
+T = TypeVar("T")
+CacheKey = Tuple[Hashable, ...]
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Size-bounded LRU cache whose entries also expire after ``ttl`` seconds
+
+    Usage:
+        cache = TTLCache(maxsize=1024, ttl=60)
+        companies = cache.get_or_set(("companies", "list"), load_companies)
+        cache.invalidate("companies")
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[CacheKey, Tuple[float, Any]]" = OrderedDict()
+        self._generations: Dict[Hashable, int] = {}
+        self._epoch = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0 and self.ttl > 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: CacheKey, default: Any = None) -> Any:
+        """Return the cached value, or ``default`` if missing or expired"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                if entry[0] > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key: CacheKey, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value, evicting the least recently used entries when full
+
+        ``ttl`` overrides the cache-wide lifetime for this entry.
+        """
+        if not self.enabled:
+            return
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._store(key, value, ttl)
+
+    def _store(self, key: CacheKey, value: Any, ttl: float) -> None:
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def get_or_set(self, key: CacheKey, load: Callable[[], T]) -> T:
+        """Return the cached value for ``key``, calling ``load`` on a miss
+
+        The loaded value is discarded instead of cached if the key's
+        namespace was invalidated while ``load`` was running.
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        with self._lock:
+            generation = self._generation(key[0])
+        value = load()
+        if self.enabled:
+            with self._lock:
+                if self._generation(key[0]) == generation:
+                    self._store(key, value, self.ttl)
+        return value
+
+    def _generation(self, namespace: Hashable) -> Tuple[int, int]:
+        return self._epoch, self._generations.get(namespace, 0)
+
+    def delete(self, key: CacheKey) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def invalidate(self, *namespaces: Hashable) -> None:
+        """Drop every entry in the given namespaces"""
+        with self._lock:
+            for namespace in namespaces:
+                self._generations[namespace] = self._generations.get(namespace, 0) + 1
+            stale = [key for key in self._data if key[0] in namespaces]
+            for key in stale:
+                del self._data[key]
+            self.invalidations += len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._epoch += 1
+            self._data.clear()
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss counters for checking the cache is effective"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+# Shared by every Streamlit session in the process
+query_cache = TTLCache(
+    maxsize=settings.QUERY_CACHE_MAX_ENTRIES, ttl=settings.QUERY_CACHE_TTL
+)
+
+
+def cached(namespace: Hashable) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    """Cache a service read method in :data:`query_cache` under ``namespace``
+
+    The key is built from the method name and its bound arguments (defaults
+    applied, ``self`` left out), so every call has to be hashable. Writes that
+    affect the result must call ``query_cache.invalidate(namespace)`` once
+    their transaction has committed.
+    """
+
+    def decorator(method: Callable[..., T]) -> Callable[..., T]:
+        signature = inspect.signature(method)
+
+        @functools.wraps(method)
+        def wrapper(self, *args: Any, **kwargs: Any) -> T:
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            key = (namespace, method.__qualname__) + tuple(bound.arguments.values())[1:]
+            return query_cache.get_or_set(key, lambda: method(self, *args, **kwargs))
+
+        return wrapper
+
+    return decorator
@@ -16,7 +16,7 @@ class Settings(BaseSettings):
     ENV: str = "development"
 
     # Project paths
-    PROJECT_ROOT: Path = Path(__file__).parent.parent.parent.parent
+    PROJECT_ROOT: Path = Path(__file__).resolve().parents[2]  # the checkout
 
     # Database settings
     POSTGRES_USER: str = "postgres"
@@ -26,24 +26,69 @@ class Settings(BaseSettings):
     POSTGRES_DB: str = "tci"
     POSTGRES_URL: str = None  # Will be constructed
 
+    # Connection pool settings
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30  # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # seconds before a connection is replaced
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_TIMEOUT_MS: int = 30000  # 0 disables the timeout
+
     MONGODB_URL: str = "mongodb://localhost:27017"
     QDRANT_URL: str = "http://localhost:6333"
 
     # ML settings
     MODEL_PATH: Path = PROJECT_ROOT / "models"
-    EMBEDDING_MODEL: str = "all-MiniLM-L6-v2"
+    EMBEDDING_MODEL: str = "all-MiniLM-L6-v2"  # or "hashing" for offline use
+    EMBEDDING_BATCH_SIZE: int = 64
+    FEATURE_CACHE_PATH: Path = PROJECT_ROOT / "cache" / "features"
+
+    # Vector store settings
+    VECTOR_STORE_BACKEND: str = "local"  # memory-mapped NumPy collections
+    VECTOR_STORE_PATH: Path = PROJECT_ROOT / "vectors"
+
+    # Query cache settings, shared by all sessions in the process
+    QUERY_CACHE_TTL: int = 60  # seconds; 0 disables caching
+    QUERY_CACHE_MAX_ENTRIES: int = 1024
+
+    # API settings
+    API_PAGE_SIZE: int = 50
+    API_MAX_PAGE_SIZE: int = 500
+    API_RESPONSE_CACHE: bool = True  # keep encoded responses in the query cache
+    API_COMPRESS_MIN_BYTES: int = 1024  # smaller responses are sent as is
+    EXPORT_CHUNK_SIZE: int = 10000  # rows per cursor fetch and encoded chunk
+
+    # Analytics settings
+    ANALYTICS_REFRESH_OVERLAP: int = 300  # seconds re-read before the watermark
+
+    # Search settings
+    SEARCH_BACKEND: str = "postgres"  # or "memory" for the in-process BM25 index
+    SEARCH_REFRESH_INTERVAL: float = 10.0  # seconds between memory index syncs
 
     # Scraping settings
     SCRAPE_DELAY: int = 2
     USER_AGENT: str = "TCI Bot/1.0"
+    SCRAPE_TIMEOUT: int = 30
+    SCRAPE_MAX_WORKERS: int = 16
+    SCRAPE_PARSER: str = "lxml"
+    SCRAPE_CACHE_ENABLED: bool = True
+    SCRAPE_CACHE_DIR: Path = PROJECT_ROOT / "cache" / "scrape"
+    SCRAPE_CACHE_MAX_BYTES: int = 512 * 1024 * 1024
+    DEDUP_THRESHOLD: float = 0.8  # estimated Jaccard similarity of shingles
+    DEDUP_NUM_PERM: int = 128
+    ENTITY_MATCH_THRESHOLD: float = 0.9  # fuzzy company name similarity
+    JOB_LOAD_BATCH_SIZE: int = 1000  # scraped jobs per upsert and commit
 
     # Auth settings
     SECRET_KEY: str = "change-me-in-production"
     TOKEN_EXPIRE_MINUTES: int = 1440
+    AUTH_CACHE_MAX_ENTRIES: int = 10000
+    AUTH_USER_CACHE_TTL: int = 300  # seconds; 0 disables the user cache
 
     # Security settings
     PASSWORD_MIN_LENGTH: int = 8
     BCRYPT_LOG_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 4  # concurrent bcrypt operations
 
     class Config:
         env_prefix = "TCI_"
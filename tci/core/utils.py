@@ -0,0 +1,13 @@
+from itertools import islice
+from typing import Iterable, Iterator, List, TypeVar
+
+T = TypeVar("T")
+
+
+def batched(iterable: Iterable[T], size: int) -> Iterator[List[T]]:
+    """Group an iterable into lists of up to ``size`` items"""
+    if size < 1:
+        raise ValueError("batch size must be at least 1")
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
@@ -0,0 +1,254 @@
+"""Streaming bulk export of companies and jobs.
+
+Rows are read over a server-side cursor ``chunk_size`` at a time and every
+chunk is encoded and handed out before the next one is fetched, so memory
+use depends on the chunk size, not on the size of the table. Supported
+formats:
+
+* ``ndjson`` - one JSON object per line
+* ``csv`` - with a header row
+* ``parquet`` - one row group per chunk; needs ``pyarrow``
+
+Passing ``updated_since`` exports only rows updated at or after that time,
+for incremental dumps.
+"""
+
+import csv
+import io
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import BinaryIO, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import orjson
+from sqlalchemy import DateTime, Integer, select
+from sqlalchemy.orm import Session
+
+from tci.core.config import settings
+from tci.db.models import Company, Job
+from tci.db.postgresql import db
+
+COMPANY_FIELDS = ("id", "name", "website", "description", "created_at", "updated_at")
+JOB_FIELDS = (
+    "id",
+    "company_id",
+    "title",
+    "description",
+    "location",
+    "department",
+    "job_type",
+    "salary_range",
+    "apply_link",
+    "source_url",
+    "closed_at",
+    "created_at",
+    "updated_at",
+)
+
+EXPORTS: Dict[str, Tuple[type, Tuple[str, ...]]] = {
+    "companies": (Company, COMPANY_FIELDS),
+    "jobs": (Job, JOB_FIELDS),
+}
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+def iter_chunks(
+    session: Session,
+    kind: str,
+    updated_since: Optional[datetime] = None,
+    chunk_size: Optional[int] = None,
+) -> Iterator[List[tuple]]:
+    """Rows of ``kind`` in id order, ``chunk_size`` at a time
+
+    Rows are fetched over a server-side cursor.
+    """
+    model, fields = EXPORTS[kind]
+    chunk_size = chunk_size or settings.EXPORT_CHUNK_SIZE
+    stmt = select(*(getattr(model, field) for field in fields)).order_by(model.id)
+    if updated_since is not None:
+        stmt = stmt.where(model.updated_at >= updated_since)
+    result = session.execute(
+        stmt,
+        execution_options={"stream_results": True, "max_row_buffer": chunk_size},
+    )
+    for rows in result.partitions(chunk_size):
+        yield [tuple(row) for row in rows]
+
+
+def encode_ndjson(
+    fields: Sequence[str], chunks: Iterator[List[tuple]]
+) -> Iterator[bytes]:
+    for rows in chunks:
+        yield b"".join(
+            orjson.dumps(dict(zip(fields, row)), option=orjson.OPT_NAIVE_UTC) + b"\n"
+            for row in rows
+        )
+
+
+def encode_csv(fields: Sequence[str], chunks: Iterator[List[tuple]]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    for rows in chunks:
+        writer.writerows(
+            [
+                value.isoformat() if isinstance(value, datetime) else value
+                for value in row
+            ]
+            for row in rows
+        )
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+class _Drain(io.RawIOBase):
+    """Write-only file that hands written bytes out instead of keeping them"""
+
+    def __init__(self):
+        self._parts: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._parts.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data, self._parts = b"".join(self._parts), []
+        return data
+
+
+def arrow_schema(kind: str):
+    import pyarrow as pa
+
+    model, fields = EXPORTS[kind]
+    columns = model.__table__.columns
+    types = []
+    for field in fields:
+        column_type = columns[field].type
+        if isinstance(column_type, Integer):
+            types.append(pa.int64())
+        elif isinstance(column_type, DateTime):
+            types.append(pa.timestamp("us"))
+        else:
+            types.append(pa.string())
+    return pa.schema(list(zip(fields, types)))
+
+
+def encode_parquet(kind: str, chunks: Iterator[List[tuple]]) -> Iterator[bytes]:
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("pyarrow is required for Parquet exports") from e
+
+    schema = arrow_schema(kind)
+    sink = _Drain()
+    with pq.ParquetWriter(sink, schema, compression="zstd") as writer:
+        for rows in chunks:
+            columns = [list(column) for column in zip(*rows)]
+            writer.write_table(pa.Table.from_arrays(columns, schema=schema))
+            yield sink.drain()
+    # Closing the writer appends the footer
+    yield sink.drain()
+
+
+def check_export(kind: str, fmt: str) -> None:
+    """Raise ValueError for an unknown export kind or format"""
+    if kind not in EXPORTS:
+        raise ValueError(f"Unknown export: {kind!r}")
+    if fmt not in MEDIA_TYPES:
+        raise ValueError(f"Unknown export format: {fmt!r}")
+
+
+def encode(kind: str, fmt: str, chunks: Iterator[List[tuple]]) -> Iterator[bytes]:
+    """Encode row chunks of ``kind`` as ``fmt``, one piece of output per chunk"""
+    check_export(kind, fmt)
+    fields = EXPORTS[kind][1]
+    if fmt == "ndjson":
+        return encode_ndjson(fields, chunks)
+    if fmt == "csv":
+        return encode_csv(fields, chunks)
+    return encode_parquet(kind, chunks)
+
+
+def stream_export(
+    kind: str,
+    fmt: str = "ndjson",
+    updated_since: Optional[datetime] = None,
+    chunk_size: Optional[int] = None,
+    session: Optional[Session] = None,
+) -> Iterator[bytes]:
+    """Encoded export of every (or every recently updated) row of ``kind``
+
+    Without a session, one is opened for as long as the export is consumed.
+
+    Raises:
+        ValueError: If ``kind`` or ``fmt`` is unknown, before any row is read
+    """
+    check_export(kind, fmt)
+    if session is None:
+        return _stream_in_session(kind, fmt, updated_since, chunk_size)
+    return encode(kind, fmt, iter_chunks(session, kind, updated_since, chunk_size))
+
+
+def _stream_in_session(
+    kind: str,
+    fmt: str,
+    updated_since: Optional[datetime],
+    chunk_size: Optional[int],
+) -> Iterator[bytes]:
+    with db.session_scope() as session:
+        yield from encode(
+            kind, fmt, iter_chunks(session, kind, updated_since, chunk_size)
+        )
+
+
+@dataclass
+class ExportStats:
+    rows: int = 0
+    bytes: int = 0
+    seconds: float = 0.0
+
+
+def export(
+    kind: str,
+    fmt: str,
+    out: BinaryIO,
+    updated_since: Optional[datetime] = None,
+    chunk_size: Optional[int] = None,
+    session: Optional[Session] = None,
+) -> ExportStats:
+    """Write an export to a binary file object"""
+    if session is None:
+        with db.session_scope() as session:
+            return export(kind, fmt, out, updated_since, chunk_size, session)
+
+    stats = ExportStats()
+    started = time.monotonic()
+
+    def counted(chunks: Iterator[List[tuple]]) -> Iterator[List[tuple]]:
+        for rows in chunks:
+            stats.rows += len(rows)
+            yield rows
+
+    chunks = counted(iter_chunks(session, kind, updated_since, chunk_size))
+    for data in encode(kind, fmt, chunks):
+        out.write(data)
+        stats.bytes += len(data)
+    stats.seconds = time.monotonic() - started
+    return stats
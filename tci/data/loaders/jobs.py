@@ -0,0 +1,250 @@
+"""Incremental ingestion of scraped job postings.
+
+Career pages are re-scraped daily and mostly list the same postings as the
+day before. Each scraped posting gets:
+
+* a stable ``source_key`` - the page it was listed on plus its apply link
+  (or its title when there is none) - identifying it across scrapes, and
+* a ``content_hash`` of the scraped fields, so an unchanged posting is
+  recognised without comparing every column.
+
+:func:`ingest_jobs` upserts postings in chunks, writing only new and changed
+rows, then closes the stored postings of the scraped pages that were not
+listed anymore. :class:`JobLoader` does the same for crawler output at scale:
+it drops near-duplicate postings, resolves each posting's company from its
+page's domain and reports throughput.
+"""
+
+import hashlib
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, Optional, Set
+
+from sqlalchemy.orm import Session
+
+from tci.core.cache import query_cache
+from tci.core.config import settings
+from tci.core.utils import batched
+from tci.data.processors.dedup import JobDeduplicator, record_key
+from tci.data.processors.entities import company_domain
+from tci.db.bulk import JobSyncCounts, close_jobs, upsert_jobs
+from tci.db.models import Company
+from tci.db.postgresql import db
+from tci.services.search import search_index
+
+logger = logging.getLogger(__name__)
+
+Record = Dict[str, Any]
+
+# Scraped fields that make up a posting's content
+CONTENT_FIELDS = ("title", "department", "location", "description", "apply_link")
+
+# Lengths of the String columns scraped values are written to
+COLUMN_LENGTHS = {"title": 255, "department": 255, "location": 255}
+
+
+def _clean(value: Any) -> Optional[str]:
+    """Whitespace-collapsed text, None for missing or blank values"""
+    if value is None:
+        return None
+    text = " ".join(str(value).split())
+    return text or None
+
+
+def source_key(record: Record) -> str:
+    """Identity of a posting across re-scrapes of its page
+
+    A hash of the deduplicator's :func:`record_key`, so both agree on which
+    records are the same posting.
+    """
+    page, identity = record_key(record)
+    payload = f"{page}\x1f{identity}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def content_hash(record: Record) -> str:
+    """Hash of the scraped fields, insensitive to whitespace changes"""
+    payload = "\x1f".join(_clean(record.get(field)) or "" for field in CONTENT_FIELDS)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def to_job_row(record: Record) -> Record:
+    """Job table values for a scraped posting, with its key and content hash"""
+    row: Record = {
+        field: _clean(record.get(field))
+        for field in CONTENT_FIELDS
+        if field != "description"
+    }
+    # Keep the description's line breaks
+    row["description"] = (record.get("description") or "").strip() or None
+    for field, length in COLUMN_LENGTHS.items():
+        if row[field]:
+            row[field] = row[field][:length]
+    row["source_url"] = record.get("source_url")
+    row["company_id"] = record.get("company_id")
+    row["source_key"] = source_key(record)
+    row["content_hash"] = content_hash(record)
+    return row
+
+
+def company_ids_by_domain(session: Session) -> Dict[str, int]:
+    """Company id for every registrable website domain, oldest company first"""
+    companies = (
+        session.query(Company.id, Company.website)
+        .filter(Company.website.isnot(None))
+        .order_by(Company.id)
+        .yield_per(5000)
+    )
+    domains: Dict[str, int] = {}
+    for company_id, website in companies:
+        domain = company_domain(website)
+        if domain:
+            domains.setdefault(domain, company_id)
+    return domains
+
+
+@dataclass
+class LoadStats:
+    """Outcome and throughput of one load"""
+
+    counts: JobSyncCounts = field(default_factory=JobSyncCounts)
+    scraped: int = 0
+    duplicates: int = 0
+    untitled: int = 0
+    # Loaded without a company, because no company website matched
+    unresolved: int = 0
+    batches: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.scraped / self.seconds if self.seconds else 0.0
+
+    def summary(self) -> str:
+        counts = self.counts
+        return (
+            f"{self.scraped} scraped in {self.batches} batches: "
+            f"{counts.inserted} inserted, {counts.changed} changed, "
+            f"{counts.unchanged} unchanged, {counts.closed} closed, "
+            f"{self.duplicates} duplicates, {self.unresolved} without a company "
+            f"({self.rows_per_second:.0f} rows/s)"
+        )
+
+
+class JobLoader:
+    """Loads scraped job postings into the jobs table in batches
+
+    Every batch is one multi-row upsert (see :func:`tci.db.bulk.upsert_jobs`)
+    committed on its own, so an interrupted load keeps the batches that
+    already finished.
+
+    Usage:
+        dedup = JobDeduplicator()
+        with db.session_scope() as session:
+            dedup.load_existing(session)
+        loader = JobLoader(deduplicator=dedup)
+        stats = loader.load(iter_crawled_job_openings(urls))
+        print(stats.summary())
+    """
+
+    def __init__(
+        self,
+        batch_size: Optional[int] = None,
+        deduplicator: Optional[JobDeduplicator] = None,
+        resolve_companies: bool = True,
+    ):
+        self.batch_size = batch_size or settings.JOB_LOAD_BATCH_SIZE
+        self.deduplicator = deduplicator
+        self.resolve_companies = resolve_companies
+
+    def load(
+        self,
+        records: Iterable[Record],
+        session: Optional[Session] = None,
+        sources: Optional[Iterable[str]] = None,
+        close_missing: bool = True,
+    ) -> LoadStats:
+        """Sync scraped postings into the jobs table, touching only the delta
+
+        Postings without a title and near-duplicates of other postings are
+        dropped. A posting without a ``company_id`` gets the company whose
+        website has the same domain as its ``source_url``. Afterwards, open
+        jobs listed on the scraped pages whose postings were not seen are
+        marked closed; the scraped pages default to the ``source_url`` values
+        of the records, pass ``sources`` to also close the postings of pages
+        that now list none.
+        """
+        if session is None:
+            with db.get_session() as session:
+                return self.load(records, session, sources, close_missing)
+
+        stats = LoadStats()
+        started = time.monotonic()
+        domains = company_ids_by_domain(session) if self.resolve_companies else {}
+        seen_keys: Set[str] = set()
+        seen_urls: Set[str] = set(sources or ())
+        duplicates_before = (
+            self.deduplicator.stats.duplicates if self.deduplicator else 0
+        )
+
+        def titled() -> Iterator[Record]:
+            for record in records:
+                stats.scraped += 1
+                if _clean(record.get("title")):
+                    yield record
+                else:
+                    stats.untitled += 1
+
+        stream = titled()
+        if self.deduplicator is not None:
+            stream = self.deduplicator.filter(stream)
+
+        for batch in batched(stream, self.batch_size):
+            rows = [to_job_row(record) for record in batch]
+            for row in rows:
+                seen_keys.add(row["source_key"])
+                if row["source_url"]:
+                    seen_urls.add(row["source_url"])
+                    if row["company_id"] is None and self.resolve_companies:
+                        domain = company_domain(row["source_url"])
+                        row["company_id"] = domains.get(domain)
+                if row["company_id"] is None:
+                    stats.unresolved += 1
+            stats.counts += upsert_jobs(session, rows)
+            session.commit()
+            stats.batches += 1
+            logger.info(
+                "[batch %d] %d rows, %.0f rows/s",
+                stats.batches,
+                stats.counts.total,
+                stats.counts.total / max(time.monotonic() - started, 1e-9),
+            )
+
+        if close_missing and seen_urls:
+            stats.counts.closed = close_jobs(session, seen_urls, seen_keys)
+            session.commit()
+
+        if stats.counts.inserted or stats.counts.changed or stats.counts.closed:
+            # Company reads embed their open jobs and analytics count them
+            query_cache.invalidate("jobs", "companies", "analytics")
+            search_index.mark_stale()
+        if self.deduplicator is not None:
+            stats.duplicates = self.deduplicator.stats.duplicates - duplicates_before
+        stats.seconds = time.monotonic() - started
+        return stats
+
+
+def ingest_jobs(
+    records: Iterable[Record],
+    session: Optional[Session] = None,
+    chunk_size: Optional[int] = None,
+    sources: Optional[Iterable[str]] = None,
+    close_missing: bool = True,
+) -> JobSyncCounts:
+    """Sync scraped postings as they are, without deduplication or company lookup
+
+    See :meth:`JobLoader.load`.
+    """
+    loader = JobLoader(batch_size=chunk_size, resolve_companies=False)
+    return loader.load(records, session, sources, close_missing).counts
@@ -0,0 +1,268 @@
+"""Near-duplicate detection for job postings with MinHash and LSH.
+
+The same posting often appears on a company's career page and on several
+aggregators with small wording changes. Comparing every pair of postings is
+quadratic, so each posting is instead reduced to a MinHash signature of its
+word shingles, and signatures are split into bands that are hashed into
+buckets (locality-sensitive hashing). Only postings sharing a bucket are
+compared, which makes both inserting and querying roughly constant time.
+
+Postings whose estimated Jaccard similarity reaches the threshold are
+treated as duplicates; the band layout is chosen so that pairs around the
+threshold are likely to share at least one bucket.
+"""
+
+import hashlib
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from tci.core.config import settings
+from tci.data.processors.text import tokenize
+from tci.db.models import Job
+
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+MAX_HASH = np.uint64((1 << 32) - 1)
+LOAD_BATCH_SIZE = 5000
+
+Record = Dict[str, Any]
+
+
+def shingles(text: Optional[str], size: int = 3) -> Set[str]:
+    """Overlapping word n-grams of the normalized text"""
+    tokens = tokenize(text)
+    if len(tokens) <= size:
+        return {" ".join(tokens)} if tokens else set()
+    return {" ".join(tokens[i : i + size]) for i in range(len(tokens) - size + 1)}
+
+
+def _hash_shingle(shingle: str) -> int:
+    digest = hashlib.blake2b(shingle.encode("utf-8"), digest_size=4).digest()
+    return int.from_bytes(digest, "little")
+
+
+def optimal_bands(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """(bands, rows) whose LSH S-curve crosses 50% closest to ``threshold``"""
+    best = (num_perm, 1)
+    best_error = float("inf")
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        error = abs((1 / bands) ** (1 / rows) - threshold)
+        if error < best_error:
+            best, best_error = (bands, rows), error
+    return best
+
+
+class MinHashIndex:
+    """Incremental LSH index over MinHash signatures
+
+    Usage:
+        index = MinHashIndex(threshold=0.8)
+        index.add("job-1", "Senior backend engineer, Tel Aviv ...")
+        index.query("Sr. backend engineer, Tel Aviv ...")  # [("job-1", 0.86)]
+    """
+
+    def __init__(
+        self,
+        threshold: Optional[float] = None,
+        num_perm: Optional[int] = None,
+        shingle_size: int = 3,
+        seed: int = 1,
+    ):
+        self.threshold = settings.DEDUP_THRESHOLD if threshold is None else threshold
+        if not 0 < self.threshold <= 1:
+            raise ValueError("threshold must be in (0, 1]")
+        self.num_perm = num_perm or settings.DEDUP_NUM_PERM
+        self.shingle_size = shingle_size
+        self.bands, self.rows = optimal_bands(self.threshold, self.num_perm)
+
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, MERSENNE_PRIME, self.num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, MERSENNE_PRIME, self.num_perm, dtype=np.uint64)
+
+        self._signatures: Dict[Hashable, np.ndarray] = {}
+        self._buckets: List[Dict[bytes, List[Hashable]]] = [
+            defaultdict(list) for _ in range(self.bands)
+        ]
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._signatures
+
+    def signature(self, text: Optional[str]) -> np.ndarray:
+        """MinHash signature of the text's shingles, one uint32 per permutation"""
+        values = np.fromiter(
+            (_hash_shingle(s) for s in shingles(text, self.shingle_size)),
+            dtype=np.uint64,
+        )
+        if len(values) == 0:
+            return np.full(self.num_perm, MAX_HASH, dtype=np.uint32)
+        # Universal hashing (a * x + b) mod p for every permutation at once;
+        # the products wrap at 64 bits, which keeps them well mixed
+        permuted = (values[:, None] * self._a + self._b) % MERSENNE_PRIME & MAX_HASH
+        return permuted.min(axis=0).astype(np.uint32)
+
+    def _band_keys(self, signature: np.ndarray) -> Iterator[Tuple[int, bytes]]:
+        for band in range(self.bands):
+            start = band * self.rows
+            yield band, signature[start : start + self.rows].tobytes()
+
+    def add(self, key: Hashable, text: Optional[str]) -> np.ndarray:
+        """Index a document; re-adding a key replaces its previous version"""
+        return self.add_signature(key, self.signature(text))
+
+    def add_signature(self, key: Hashable, signature: np.ndarray) -> np.ndarray:
+        with self._lock:
+            self.remove(key)
+            self._signatures[key] = signature
+            for band, band_key in self._band_keys(signature):
+                self._buckets[band][band_key].append(key)
+        return signature
+
+    def remove(self, key: Hashable) -> bool:
+        with self._lock:
+            signature = self._signatures.pop(key, None)
+            if signature is None:
+                return False
+            for band, band_key in self._band_keys(signature):
+                bucket = self._buckets[band][band_key]
+                bucket.remove(key)
+                if not bucket:
+                    del self._buckets[band][band_key]
+            return True
+
+    def query_signature(self, signature: np.ndarray) -> List[Tuple[Hashable, float]]:
+        """Indexed keys at or above the threshold, most similar first"""
+        with self._lock:
+            candidates: Set[Hashable] = set()
+            for band, band_key in self._band_keys(signature):
+                candidates.update(self._buckets[band].get(band_key, ()))
+            matches = []
+            for key in candidates:
+                similarity = float(np.mean(self._signatures[key] == signature))
+                if similarity >= self.threshold:
+                    matches.append((key, similarity))
+        return sorted(matches, key=lambda match: -match[1])
+
+    def query(self, text: Optional[str]) -> List[Tuple[Hashable, float]]:
+        return self.query_signature(self.signature(text))
+
+
+def job_document(record: Record) -> str:
+    """The text a posting is compared on"""
+    return " ".join(
+        str(record.get(field) or "") for field in ("title", "location", "description")
+    )
+
+
+def _collapse(value: Any) -> str:
+    return " ".join(str(value).split()) if value is not None else ""
+
+
+def record_key(record: Record) -> Tuple[str, str]:
+    """Identity of a scraped posting: its page plus its apply link or title
+
+    Aggregators often reuse the company's apply link, so the page is part of
+    the key; only a re-scrape of the same page has the same key.
+    ``tci.data.loaders.jobs.source_key`` is a hash of this key.
+    """
+    identity = _collapse(record.get("apply_link")) or _collapse(record.get("title"))
+    return record.get("source_url") or "", identity
+
+
+def _same_page(indexed: Hashable, key: Tuple[str, str]) -> bool:
+    """Whether an indexed key belongs to a posting on the page of ``key``"""
+    if indexed == key:
+        return True
+    return bool(key[0]) and isinstance(indexed, tuple) and indexed[0] == key[0]
+
+
+@dataclass
+class DedupStats:
+    seen: int = 0
+    duplicates: int = 0
+
+    @property
+    def unique(self) -> int:
+        return self.seen - self.duplicates
+
+
+class JobDeduplicator:
+    """Drops scraped postings that nearly duplicate a stored or earlier posting
+
+    Usage:
+        dedup = JobDeduplicator()
+        dedup.load_existing(session)
+        for record in dedup.filter(iter_crawled_job_openings(urls)):
+            ...  # insert the record
+    """
+
+    def __init__(self, index: Optional[MinHashIndex] = None):
+        self.index = index or MinHashIndex()
+        self.stats = DedupStats()
+
+    def load_existing(self, session: Session) -> int:
+        """Index the open jobs already in the database
+
+        Scraped jobs are keyed like the records they came from (see
+        :func:`record_key`), so a re-scrape of a stored posting is not taken
+        for a duplicate of it; other jobs are keyed as ``("job", id)``.
+        """
+        jobs = (
+            session.query(
+                Job.id,
+                Job.title,
+                Job.location,
+                Job.description,
+                Job.apply_link,
+                Job.source_url,
+            )
+            .filter(Job.closed_at.is_(None))
+            .yield_per(LOAD_BATCH_SIZE)
+        )
+        count = 0
+        for job_id, title, location, description, apply_link, source_url in jobs:
+            record = {
+                "title": title,
+                "location": location,
+                "description": description,
+                "apply_link": apply_link,
+                "source_url": source_url,
+            }
+            key = record_key(record) if source_url else ("job", job_id)
+            self.index.add(key, job_document(record))
+            count += 1
+        return count
+
+    def find_duplicate(self, record: Record) -> Optional[Hashable]:
+        """Key of the most similar indexed posting, if any reaches the threshold"""
+        matches = self.index.query(job_document(record))
+        return matches[0][0] if matches else None
+
+    def check(self, record: Record) -> Optional[Hashable]:
+        """Index the record unless it is a duplicate, returning what it duplicates"""
+        self.stats.seen += 1
+        signature = self.index.signature(job_document(record))
+        key = record_key(record)
+        for match, _ in self.index.query_signature(signature):
+            # A posting listed on the same page again is a re-scrape, even if
+            # its title or apply link changed: the loader must see it as an
+            # update, or it would close the stored posting as no longer listed
+            if not _same_page(match, key):
+                self.stats.duplicates += 1
+                return match
+        self.index.add_signature(key, signature)
+        return None
+
+    def filter(self, records: Iterable[Record]) -> Iterator[Record]:
+        """Yield only the records that are not near-duplicates"""
+        for record in records:
+            if self.check(record) is None:
+                yield record
@@ -0,0 +1,314 @@
+"""Company entity resolution for imports and scrapes.
+
+Company names arrive in many spellings - "Example Tech Ltd", "Example Tech",
+"אקזמפל טק בע״מ" - and websites with or without ``www.``, paths or country
+domains. :class:`CompanyResolver` maps each incoming record onto the company
+it refers to:
+
+1. Names are normalized: Unicode/case folding, Hebrew niqqud, geresh and
+   final-letter forms, punctuation, and trailing legal suffixes in English
+   and Hebrew. Websites are reduced to their registrable domain, unless they
+   are pages on a host shared by many companies, like a LinkedIn profile.
+2. Every known company is filed under a few *blocking keys* (its domain, its
+   compact normalized name, its first letters and its distinctive name
+   tokens). A record is only scored against companies sharing at least one
+   key, so resolution costs about the same per record no matter how many
+   companies exist.
+3. Candidates are scored by fuzzy name similarity, with identical domains
+   overriding the name score and conflicting ones lowering it, and the best
+   one at or above the threshold wins.
+"""
+
+import re
+import threading
+from difflib import SequenceMatcher
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+from sqlalchemy.orm import Session
+
+from tci.core.config import settings
+from tci.data.processors.text import normalize_text
+from tci.db.models import Company
+
+Record = Dict[str, Any]
+
+LEGAL_SUFFIXES = {
+    # English
+    ("ltd",),
+    ("limited",),
+    ("inc",),
+    ("incorporated",),
+    ("corp",),
+    ("corporation",),
+    ("co",),
+    ("company",),
+    ("llc",),
+    ("plc",),
+    ("gmbh",),
+    ("bv",),
+    ("sa",),
+    ("com",),
+    ("israel", "ltd"),
+    # Hebrew: בע"מ (בערבון מוגבל) and "חברה", final letters already folded
+    ("בעמ",),
+    ("בע", "מ"),
+    ("בערבונ", "מוגבל"),
+    ("חברה",),
+}
+MAX_SUFFIX_WORDS = max(len(suffix) for suffix in LEGAL_SUFFIXES)
+
+# Common words that say nothing about which company is meant
+GENERIC_TOKENS = frozenset(
+    "the and of tech technologies technology systems solutions software labs "
+    "group holdings ai data cloud digital global israel networks security "
+    "טכנולוגיות מערכות ישראל".split()
+)
+
+# Second-level domains under which names are registered (example.co.il)
+PUBLIC_SECOND_LEVEL = frozenset(
+    "co.il org.il net.il ac.il gov.il muni.il co.uk org.uk ac.uk "
+    "com.au net.au co.jp co.in com.br".split()
+)
+
+# Hosts serving the pages of many companies (profiles, site builders), whose
+# domain says nothing about which company a website belongs to
+SHARED_HOSTS = frozenset(
+    "linkedin.com facebook.com instagram.com twitter.com x.com youtube.com "
+    "github.com github.io gitlab.io medium.com angel.co wellfound.com "
+    "crunchbase.com wixsite.com sites.google.com wordpress.com blogspot.com "
+    "notion.site webflow.io carrd.co linktr.ee".split()
+)
+
+_FINAL_LETTERS = str.maketrans("ךםןףץ", "כמנפצ")
+_QUOTES_RE = re.compile("[\"'`׳״‘’“”]")
+_NON_WORD_RE = re.compile(r"[^\w]+", re.UNICODE)
+
+
+def normalize_name(name: Optional[str]) -> str:
+    """Comparable form of a company name, without legal suffixes"""
+    if not name:
+        return ""
+    text = normalize_text(name).translate(_FINAL_LETTERS).replace("&", " and ")
+    text = _QUOTES_RE.sub("", text)
+    tokens = _NON_WORD_RE.sub(" ", text).split()
+    # Strip suffixes repeatedly ("Example Israel Ltd" -> "example"), but
+    # never the whole name
+    stripped = True
+    while stripped and len(tokens) > 1:
+        stripped = False
+        for size in range(min(MAX_SUFFIX_WORDS, len(tokens) - 1), 0, -1):
+            if tuple(tokens[-size:]) in LEGAL_SUFFIXES:
+                del tokens[-size:]
+                stripped = True
+                break
+    return " ".join(tokens)
+
+
+def _hostname(url: Optional[str]) -> Optional[str]:
+    if not url or not url.strip():
+        return None
+    url = url.strip().lower()
+    if "://" not in url:
+        url = f"http://{url}"
+    try:
+        host = urlsplit(url).hostname
+    except ValueError:
+        return None
+    if not host or "." not in host:
+        return None
+    try:
+        host = host.encode("idna").decode("ascii")
+    except UnicodeError:
+        pass
+    return host.strip(".")
+
+
+def _registrable(host: str) -> str:
+    labels = host.split(".")
+    keep = 3 if ".".join(labels[-2:]) in PUBLIC_SECOND_LEVEL else 2
+    return ".".join(labels[-keep:])
+
+
+def canonical_domain(url: Optional[str]) -> Optional[str]:
+    """Registrable domain of a website
+
+    "https://www.example.co.il/x" -> "example.co.il"
+    """
+    host = _hostname(url)
+    return _registrable(host) if host else None
+
+
+def company_domain(url: Optional[str]) -> Optional[str]:
+    """Registrable domain of a company's own website
+
+    None for pages on shared hosts ("linkedin.com/company/example"), which
+    do not tell companies apart.
+    """
+    host = _hostname(url)
+    if host is None:
+        return None
+    if any(host == shared or host.endswith(f".{shared}") for shared in SHARED_HOSTS):
+        return None
+    return _registrable(host)
+
+
+def domain_label(domain: Optional[str]) -> Optional[str]:
+    """Name part of a registrable domain ("example.co.il" -> "example")"""
+    return domain.split(".")[0] if domain else None
+
+
+def name_similarity(a: str, b: str) -> float:
+    """Fuzzy similarity of two normalized names, 0 to 1"""
+    if not a or not b:
+        return 0.0
+    if a == b:
+        return 1.0
+    direct = SequenceMatcher(None, a, b).ratio()
+    sorted_tokens = SequenceMatcher(
+        None, " ".join(sorted(a.split())), " ".join(sorted(b.split()))
+    ).ratio()
+    compact = SequenceMatcher(None, a.replace(" ", ""), b.replace(" ", "")).ratio()
+    return max(direct, sorted_tokens, compact)
+
+
+class Entity(NamedTuple):
+    name: str  # the stored company name
+    normalized: str
+    domain: Optional[str]
+
+
+class Match(NamedTuple):
+    name: str
+    score: float
+    reason: str  # "domain" or "name"
+
+
+def blocking_keys(normalized: str, domain: Optional[str]) -> Set[str]:
+    keys = set()
+    if domain:
+        keys.add(f"d:{domain_label(domain)}")
+    if normalized:
+        compact = normalized.replace(" ", "")
+        keys.add(f"n:{compact}")
+        # Prefix block, for typos after the first few letters
+        keys.add(f"p:{compact[:4]}")
+        tokens = normalized.split()
+        distinctive = [
+            token for token in tokens if len(token) > 2 and token not in GENERIC_TOKENS
+        ]
+        for token in distinctive or tokens[:1]:
+            keys.add(f"t:{token}")
+    return keys
+
+
+class CompanyResolver:
+    """Matches company records to known companies in near-constant time
+
+    Usage:
+        resolver = CompanyResolver()
+        resolver.load_existing(session)
+        resolver.resolve("Example Tech Ltd", "https://www.example.com")
+        # Match(name='Example Tech', score=1.0, reason='domain')
+    """
+
+    def __init__(self, threshold: Optional[float] = None, max_block_size: int = 500):
+        self.threshold = (
+            settings.ENTITY_MATCH_THRESHOLD if threshold is None else threshold
+        )
+        # Blocks grown past this size are too unspecific to be worth scoring
+        self.max_block_size = max_block_size
+        self._entities: List[Entity] = []
+        self._by_name: Dict[str, int] = {}
+        self._blocks: Dict[str, List[int]] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._entities)
+
+    def add(self, name: str, website: Optional[str] = None) -> None:
+        """Register a known company under its stored name"""
+        normalized = normalize_name(name)
+        domain = company_domain(website)
+        with self._lock:
+            index = self._by_name.get(name)
+            if index is not None:
+                # Only learn a website the company did not have yet
+                entity = self._entities[index]
+                if domain is None or entity.domain is not None:
+                    return
+                self._entities[index] = entity._replace(domain=domain)
+            else:
+                index = len(self._entities)
+                self._entities.append(Entity(name, normalized, domain))
+                self._by_name[name] = index
+            for key in blocking_keys(normalized, domain):
+                self._blocks.setdefault(key, []).append(index)
+
+    def load_existing(self, session: Session) -> int:
+        """Register every company in the database"""
+        count = 0
+        for name, website in session.query(Company.name, Company.website).yield_per(
+            5000
+        ):
+            self.add(name, website)
+            count += 1
+        return count
+
+    def _score(
+        self, normalized: str, domain: Optional[str], entity: Entity
+    ) -> Tuple[float, str]:
+        similarity = name_similarity(normalized, entity.normalized)
+        if domain and entity.domain:
+            if domain == entity.domain:
+                return 1.0, "domain"
+            # The same name under another country domain ("example.co.il"
+            # and "example.com") is left to the name; different websites
+            # otherwise point to different companies sharing a name
+            if domain_label(domain) != domain_label(entity.domain):
+                return similarity - 0.15, "name"
+        return similarity, "name"
+
+    def resolve(self, name: str, website: Optional[str] = None) -> Optional[Match]:
+        """Best matching known company, or None if nothing reaches the threshold"""
+        if name in self._by_name:
+            return Match(name, 1.0, "name")
+        normalized = normalize_name(name)
+        domain = company_domain(website)
+        with self._lock:
+            candidates: Set[int] = set()
+            for key in blocking_keys(normalized, domain):
+                block = self._blocks.get(key, ())
+                if len(block) <= self.max_block_size or key[0] in "dn":
+                    candidates.update(block)
+
+            best: Optional[Match] = None
+            for index in candidates:
+                entity = self._entities[index]
+                score, reason = self._score(normalized, domain, entity)
+                if score >= self.threshold and (best is None or score > best.score):
+                    best = Match(entity.name, score, reason)
+        return best
+
+    def canonicalize(self, record: Record) -> Record:
+        """Point a record at the company it matches, registering it if new
+
+        A matched record gets the stored company's ``name`` and keeps its own
+        spelling as ``source_name``. Unmatched records become known companies
+        themselves, so later records in the same batch resolve to them.
+        """
+        name = (record.get("name") or "").strip()
+        if not name:
+            return record
+        match = self.resolve(name, record.get("website"))
+        if match is None:
+            self.add(name, record.get("website"))
+            return record
+        self.add(match.name, record.get("website"))
+        if match.name == name:
+            return record
+        return {**record, "name": match.name, "source_name": name}
+
+    def canonicalize_all(self, records: Iterable[Record]) -> Iterator[Record]:
+        for record in records:
+            yield self.canonicalize(record)
@@ -0,0 +1,254 @@
+"""Text normalization and an in-memory BM25 search index.
+
+Tokenization handles English and Hebrew side by side: text is NFKC-normalized
+and lowercased, Hebrew niqqud and cantillation marks are dropped and common
+stopwords removed. Hebrew attaches prepositions and conjunctions to the next
+word ("ובתל", "והמשרה"), so when indexing a document a single-letter prefix is
+also stripped and the bare word indexed alongside the original.
+
+:class:`BM25Index` keeps one postings list per term as a pair of compact
+``array`` buffers (document slots and term frequencies) and scores queries
+with NumPy over those buffers. Updates append a new slot and tombstone the
+old one; tombstoned slots are compacted away once they make up a large share
+of the index.
+"""
+
+import re
+import threading
+import unicodedata
+from array import array
+from bisect import bisect_left
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_HEBREW_MARKS_RE = re.compile("[\u0591-\u05c7]")
+_HEBREW_LETTERS_RE = re.compile("^[\u05d0-\u05ea]+$")
+HEBREW_PREFIXES = "והבלמשכ"
+
+ENGLISH_STOPWORDS = frozenset(
+    "a an and are as at be by for from has in is it its of on or that the to "
+    "was were will with we you our your".split()
+)
+HEBREW_STOPWORDS = frozenset(
+    "של את על עם זה זו גם או כי אם לא יש הוא היא הם הן אנחנו אני אתה כל".split()
+)
+STOPWORDS = ENGLISH_STOPWORDS | HEBREW_STOPWORDS
+
+
+def normalize_text(text: str) -> str:
+    """NFKC-normalize, lowercase and strip Hebrew diacritics"""
+    text = unicodedata.normalize("NFKC", text).lower()
+    return _HEBREW_MARKS_RE.sub("", text)
+
+
+def _stem_english(token: str) -> str:
+    """Fold simple English plurals ("engineers" -> "engineer")"""
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        if token.endswith("ies") and len(token) > 4:
+            return token[:-3] + "y"
+        return token[:-1]
+    return token
+
+
+def tokenize(text: Optional[str], expand_prefixes: bool = False) -> List[str]:
+    """Split text into normalized search terms
+
+    Args:
+        text: English and/or Hebrew text.
+        expand_prefixes: Also emit Hebrew words with a leading prefix letter
+            removed. Used when indexing so bare-word queries match.
+    """
+    if not text:
+        return []
+    tokens = []
+    for token in _TOKEN_RE.findall(normalize_text(text)):
+        if token in STOPWORDS:
+            continue
+        if _HEBREW_LETTERS_RE.match(token):
+            tokens.append(token)
+            if (
+                expand_prefixes
+                and len(token) > 3
+                and token[0] in HEBREW_PREFIXES
+                and token[1:] not in STOPWORDS
+            ):
+                tokens.append(token[1:])
+        else:
+            tokens.append(_stem_english(token))
+    return tokens
+
+
+class BM25Index:
+    """Incrementally updatable in-memory BM25 index.
+
+    Usage:
+        index = BM25Index()
+        index.add(1, "Backend engineer in Tel Aviv")
+        index.search("engineer")  # [(1, 0.28)]
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75, compact_ratio: float = 0.25):
+        self.k1 = k1
+        self.b = b
+        self.compact_ratio = compact_ratio
+
+        # Document slots: slot -> external id (None once deleted), length and
+        # a live flag
+        self._doc_ids: List[Optional[Hashable]] = []
+        self._doc_lengths = array("I")
+        self._live = bytearray()
+        self._slots: Dict[Hashable, int] = {}
+        self._total_length = 0
+
+        # term -> (document slots, term frequencies), slots in ascending order
+        self._postings: Dict[str, Tuple[array, array]] = {}
+        self._sorted_terms: Optional[List[str]] = None
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, doc_id: Hashable) -> bool:
+        return doc_id in self._slots
+
+    def add(self, doc_id: Hashable, text: Optional[str]) -> None:
+        """Index a document, replacing any previous version with the same id"""
+        tokens = tokenize(text, expand_prefixes=True)
+        counts: Dict[str, int] = {}
+        for token in tokens:
+            counts[token] = counts.get(token, 0) + 1
+
+        with self._lock:
+            self._remove(doc_id)
+            slot = len(self._doc_ids)
+            self._doc_ids.append(doc_id)
+            self._doc_lengths.append(len(tokens))
+            self._live.append(1)
+            self._slots[doc_id] = slot
+            self._total_length += len(tokens)
+
+            for term, count in counts.items():
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = (array("I"), array("I"))
+                    self._sorted_terms = None
+                postings[0].append(slot)
+                postings[1].append(count)
+            self._maybe_compact()
+
+    update = add
+
+    def add_many(self, documents: Iterable[Tuple[Hashable, Optional[str]]]) -> None:
+        for doc_id, text in documents:
+            self.add(doc_id, text)
+
+    def remove(self, doc_id: Hashable) -> bool:
+        """Delete a document, returning whether it was indexed"""
+        with self._lock:
+            removed = self._remove(doc_id)
+            self._maybe_compact()
+            return removed
+
+    def _remove(self, doc_id: Hashable) -> bool:
+        slot = self._slots.pop(doc_id, None)
+        if slot is None:
+            return False
+        self._doc_ids[slot] = None
+        self._live[slot] = 0
+        self._total_length -= self._doc_lengths[slot]
+        return True
+
+    def _maybe_compact(self) -> None:
+        tombstones = len(self._doc_ids) - len(self._slots)
+        if tombstones and tombstones > self.compact_ratio * len(self._doc_ids):
+            self.compact()
+
+    def compact(self) -> None:
+        """Rewrite postings without deleted documents"""
+        with self._lock:
+            remap = array("l", [-1]) * len(self._doc_ids)
+            doc_ids: List[Optional[Hashable]] = []
+            lengths = array("I")
+            for slot, doc_id in enumerate(self._doc_ids):
+                if doc_id is not None:
+                    remap[slot] = len(doc_ids)
+                    doc_ids.append(doc_id)
+                    lengths.append(self._doc_lengths[slot])
+
+            postings: Dict[str, Tuple[array, array]] = {}
+            for term, (slots, freqs) in self._postings.items():
+                new_slots, new_freqs = array("I"), array("I")
+                for slot, freq in zip(slots, freqs):
+                    if remap[slot] >= 0:
+                        new_slots.append(remap[slot])
+                        new_freqs.append(freq)
+                if new_slots:
+                    postings[term] = (new_slots, new_freqs)
+
+            self._doc_ids = doc_ids
+            self._doc_lengths = lengths
+            self._live = bytearray([1]) * len(doc_ids)
+            self._slots = {doc_id: slot for slot, doc_id in enumerate(doc_ids)}
+            self._postings = postings
+            self._sorted_terms = None
+
+    def _expand_prefix(self, prefix: str, max_terms: int = 50) -> List[str]:
+        if self._sorted_terms is None:
+            self._sorted_terms = sorted(self._postings)
+        terms = []
+        i = bisect_left(self._sorted_terms, prefix)
+        while i < len(self._sorted_terms) and len(terms) < max_terms:
+            term = self._sorted_terms[i]
+            if not term.startswith(prefix):
+                break
+            terms.append(term)
+            i += 1
+        return terms
+
+    def search(
+        self, query: str, limit: int = 10, prefix: bool = True
+    ) -> List[Tuple[Hashable, float]]:
+        """Return up to ``limit`` ``(doc_id, score)`` pairs, best first
+
+        With ``prefix`` the last query word also matches longer terms, so
+        results update while a word is still being typed.
+        """
+        tokens = tokenize(query)
+        if not tokens or limit <= 0:
+            return []
+
+        with self._lock:
+            if not self._slots:
+                return []
+            terms = set(tokens)
+            if prefix:
+                terms.update(self._expand_prefix(tokens[-1]))
+
+            n_slots = len(self._doc_ids)
+            lengths = np.frombuffer(self._doc_lengths, dtype=np.uint32).astype(
+                np.float64
+            )
+            avgdl = self._total_length / len(self._slots) or 1.0
+            scores = np.zeros(n_slots)
+
+            for term in terms:
+                postings = self._postings.get(term)
+                if postings is None:
+                    continue
+                slots = np.frombuffer(postings[0], dtype=np.uint32)
+                freqs = np.frombuffer(postings[1], dtype=np.uint32).astype(np.float64)
+                # Deleted documents count towards df until compaction, as in Lucene
+                df = len(slots)
+                idf = np.log(1 + (n_slots - df + 0.5) / (df + 0.5))
+                norm = self.k1 * (1 - self.b + self.b * lengths[slots] / avgdl)
+                scores[slots] += idf * freqs * (self.k1 + 1) / (freqs + norm)
+
+            scores[np.frombuffer(self._live, dtype=np.uint8) == 0] = 0.0
+            matched = np.flatnonzero(scores)
+            if len(matched) > limit:
+                top = np.argpartition(-scores[matched], limit - 1)[:limit]
+                matched = matched[top]
+            ranked = matched[np.lexsort((matched, -scores[matched]))]
+            return [(self._doc_ids[slot], float(scores[slot])) for slot in ranked]
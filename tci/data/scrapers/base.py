@@ -0,0 +1,278 @@
+"""Shared crawl engine for the company and job scrapers.
+
+The :class:`Crawler` fetches many pages concurrently from a thread pool over a
+single pooled ``requests.Session`` (so keep-alive connections are reused),
+spaces out requests to the same host by ``settings.SCRAPE_DELAY`` and records
+throughput in :class:`CrawlStats`. When given a
+:class:`~tci.data.scrapers.cache.FetchCache` it revalidates pages with
+conditional requests and serves unchanged ones from disk. Page parsing is
+delegated to *extractors*: plain callables taking ``(url, content)`` and
+returning the parsed records.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Set
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from tci.core.config import settings
+from tci.data.scrapers.cache import FetchCache
+
+logger = logging.getLogger(__name__)
+
+Extractor = Callable[[str, bytes], Any]
+
+
+def create_session(
+    user_agent: Optional[str] = None, pool_size: Optional[int] = None
+) -> requests.Session:
+    """Create a session with a connection pool sized for concurrent crawling"""
+    pool_size = pool_size or settings.SCRAPE_MAX_WORKERS
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["User-Agent"] = user_agent or settings.USER_AGENT
+    return session
+
+
+class HostRateLimiter:
+    """Enforces a minimum delay between requests to the same host.
+
+    Each caller reserves the next free slot for its host under a lock and then
+    sleeps outside of it, so workers targeting different hosts never block
+    each other.
+    """
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self._next_slot: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url: str) -> None:
+        if self.delay <= 0:
+            return
+        host = urlsplit(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.delay
+        if slot > now:
+            time.sleep(slot - now)
+
+
+@dataclass
+class CrawlStats:
+    """Throughput counters for a crawler"""
+
+    pages: int = 0
+    failures: int = 0
+    bytes: int = 0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
+
+    def start(self) -> None:
+        with self._lock:
+            if self.started_at is None:
+                self.started_at = time.monotonic()
+            self.finished_at = None
+
+    def finish(self) -> None:
+        with self._lock:
+            self.finished_at = time.monotonic()
+
+    def record(self, size: int = 0, failed: bool = False) -> None:
+        with self._lock:
+            if failed:
+                self.failures += 1
+            else:
+                self.pages += 1
+                self.bytes += size
+
+    @property
+    def elapsed(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        end = self.finished_at if self.finished_at is not None else time.monotonic()
+        return end - self.started_at
+
+    @property
+    def pages_per_second(self) -> float:
+        elapsed = self.elapsed
+        return self.pages / elapsed if elapsed > 0 else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "pages": self.pages,
+            "failures": self.failures,
+            "bytes": self.bytes,
+            "elapsed": round(self.elapsed, 3),
+            "pages_per_second": round(self.pages_per_second, 2),
+        }
+
+    def summary(self) -> str:
+        return (
+            f"{self.pages} pages ({self.failures} failed, {self.bytes} bytes) "
+            f"in {self.elapsed:.1f}s - {self.pages_per_second:.2f} pages/s"
+        )
+
+
+@dataclass
+class Page:
+    """A fetched page body, possibly served from the fetch cache"""
+
+    url: str
+    content: bytes
+    status_code: int
+    from_cache: bool = False
+
+
+@dataclass
+class CrawlResult:
+    """Outcome of fetching and extracting a single URL"""
+
+    url: str
+    data: Any = None
+    error: Optional[Exception] = None
+    status_code: Optional[int] = None
+    from_cache: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class Crawler:
+    """Concurrent, per-host rate-limited page fetcher.
+
+    Usage:
+        with Crawler() as crawler:
+            for result in crawler.crawl(urls, extract_job_openings):
+                ...
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        delay: Optional[float] = None,
+        user_agent: Optional[str] = None,
+        timeout: Optional[float] = None,
+        session: Optional[requests.Session] = None,
+        cache: Optional[FetchCache] = None,
+    ):
+        self.max_workers = max_workers or settings.SCRAPE_MAX_WORKERS
+        self.timeout = timeout or settings.SCRAPE_TIMEOUT
+        self.session = session or create_session(user_agent, self.max_workers)
+        self.rate_limiter = HostRateLimiter(
+            settings.SCRAPE_DELAY if delay is None else delay
+        )
+        self.cache = cache
+        self.stats = CrawlStats()
+
+    def _get(self, url: str, headers: Dict[str, str]) -> requests.Response:
+        self.rate_limiter.wait(url)
+        self.stats.start()
+        try:
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+            response.raise_for_status()
+        except requests.RequestException:
+            self.stats.record(failed=True)
+            raise
+        self.stats.record(len(response.content))
+        return response
+
+    def fetch(self, url: str) -> Page:
+        """Fetch a single URL, honouring the per-host delay and the fetch cache
+
+        Raises:
+            requests.RequestException: If the request fails or returns an error
+        """
+        if self.cache is None:
+            response = self._get(url, {})
+            return Page(url, response.content, response.status_code)
+
+        response = self._get(url, self.cache.conditional_headers(url))
+        if response.status_code == 304:
+            content = self.cache.load(url)
+            if content is not None:
+                return Page(url, content, 200, from_cache=True)
+            # The body vanished from disk, fetch it again unconditionally
+            response = self._get(url, {})
+        self.cache.store(url, response.content, response.headers)
+        return Page(url, response.content, response.status_code)
+
+    def _process(self, url: str, extractor: Extractor) -> CrawlResult:
+        try:
+            page = self.fetch(url)
+        except requests.RequestException as e:
+            status = e.response.status_code if e.response is not None else None
+            return CrawlResult(url=url, error=e, status_code=status)
+        try:
+            data = extractor(url, page.content)
+        except Exception as e:
+            return CrawlResult(url=url, error=e, status_code=page.status_code)
+        return CrawlResult(
+            url=url, data=data, status_code=page.status_code, from_cache=page.from_cache
+        )
+
+    def crawl(
+        self,
+        urls: Iterable[str],
+        extractor: Extractor,
+        max_pending: Optional[int] = None,
+    ) -> Iterator[CrawlResult]:
+        """Fetch all URLs concurrently, yielding results as they complete
+
+        URLs are read lazily and at most ``max_pending`` pages (default twice
+        the workers) are in flight or waiting to be consumed, so memory does
+        not grow with the number of URLs. Failures are reported on the result
+        instead of being raised, so one bad page does not abort the whole crawl.
+        """
+        max_pending = max_pending or self.max_workers * 2
+        self.stats.start()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending: Set[Future] = set()
+            for url in urls:
+                pending.add(executor.submit(self._process, url, extractor))
+                if len(pending) >= max_pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        self.stats.finish()
+        logger.info("Crawl finished: %s", self.stats.summary())
+
+    def close(self) -> None:
+        self.session.close()
+
+    def __enter__(self) -> "Crawler":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+_default_crawler: Optional[Crawler] = None
+_default_crawler_lock = threading.Lock()
+
+
+def get_default_crawler() -> Crawler:
+    """Process-wide crawler so one-off scrapes still share pooled connections"""
+    global _default_crawler
+    with _default_crawler_lock:
+        if _default_crawler is None:
+            cache = FetchCache() if settings.SCRAPE_CACHE_ENABLED else None
+            _default_crawler = Crawler(cache=cache)
+        return _default_crawler
@@ -0,0 +1,159 @@
+"""Persistent HTTP conditional-request cache for scraper fetches.
+
+Response bodies are stored as files next to a small SQLite index holding each
+URL's ``ETag``/``Last-Modified`` validators, size and last access time. The
+crawler sends the validators back as ``If-None-Match``/``If-Modified-Since``
+and serves ``304 Not Modified`` answers from disk. Once the stored bodies
+exceed ``max_bytes`` the least recently used entries are evicted.
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Mapping, Optional
+
+from tci.core.config import settings
+
+
+class FetchCache:
+    """Size-bounded on-disk store of response bodies and their validators"""
+
+    def __init__(self, path: Optional[Path] = None, max_bytes: Optional[int] = None):
+        self.path = Path(path or settings.SCRAPE_CACHE_DIR)
+        self.max_bytes = max_bytes or settings.SCRAPE_CACHE_MAX_BYTES
+        self.path.mkdir(parents=True, exist_ok=True)
+        (self.path / "bodies").mkdir(exist_ok=True)
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.path / "index.sqlite"), check_same_thread=False
+        )
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                size INTEGER NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_entries_accessed_at ON entries (accessed_at)"
+        )
+        self._conn.commit()
+
+    def _body_path(self, url: str) -> Path:
+        digest = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.path / "bodies" / digest
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Validators to send with the next request for ``url``"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified FROM entries WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return {}
+        headers = {}
+        if row[0]:
+            headers["If-None-Match"] = row[0]
+        if row[1]:
+            headers["If-Modified-Since"] = row[1]
+        return headers
+
+    def load(self, url: str) -> Optional[bytes]:
+        """Return the stored body for a ``304`` response, counting it as a hit"""
+        try:
+            body = self._body_path(url).read_bytes()
+        except FileNotFoundError:
+            self.invalidate(url)
+            return None
+        with self._lock:
+            self._conn.execute(
+                "UPDATE entries SET accessed_at = ? WHERE url = ?", (time.time(), url)
+            )
+            self._conn.commit()
+            self.hits += 1
+        return body
+
+    def store(self, url: str, body: bytes, headers: Mapping[str, str]) -> None:
+        """Record a full ``200`` response, counting it as a miss
+
+        Responses without an ``ETag`` or ``Last-Modified`` header can never be
+        revalidated, so only their miss is counted.
+        """
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        with self._lock:
+            self.misses += 1
+        if not etag and not last_modified:
+            self.invalidate(url)
+            return
+        if len(body) > self.max_bytes:
+            return
+
+        self._body_path(url).write_bytes(body)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+                (url, etag, last_modified, len(body), time.time()),
+            )
+            self._conn.commit()
+            self._evict()
+
+    def invalidate(self, url: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM entries WHERE url = ?", (url,))
+            self._conn.commit()
+        self._body_path(url).unlink(missing_ok=True)
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until under ``max_bytes``"""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries")
+        excess = total.fetchone()[0] - self.max_bytes
+        if excess <= 0:
+            return
+        victims = []
+        for url, size in self._conn.execute(
+            "SELECT url, size FROM entries ORDER BY accessed_at"
+        ):
+            victims.append(url)
+            excess -= size
+            if excess <= 0:
+                break
+        self._conn.executemany(
+            "DELETE FROM entries WHERE url = ?", [(url,) for url in victims]
+        )
+        self._conn.commit()
+        for url in victims:
+            self._body_path(url).unlink(missing_ok=True)
+        self.evictions += len(victims)
+
+    @property
+    def size(self) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()[0]
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "bytes": self.size,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -1,4 +1,168 @@
-def scrape_startup_database(url, selectors=None):
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+import pandas as pd
+import requests
+
+from tci.core.utils import batched
+from tci.data.processors.entities import CompanyResolver
+from tci.data.scrapers.base import Crawler, get_default_crawler
+from tci.data.scrapers.parsers import get_parser
+
+DEFAULT_SELECTORS = {
+    "company_container": "div.portfolio-company",
+    "name": "h3.company-name",
+    "description": "p.company-description",
+    "website": "a.company-website",
+}
+
+Record = Dict[str, Any]
+
+
+def parse_companies(
+    url: str,
+    content: bytes,
+    selectors: Optional[Dict[str, str]] = None,
+    parser: Optional[str] = None,
+) -> Iterator[Record]:
+    """
+    Lazily parses company records from an already fetched startup database page.
+
+    Each company container is turned into a record as soon as it has been
+    parsed, so callers can process companies while the rest of the page is
+    still being worked through.
+
+    Args:
+        url: The URL the page was fetched from, stored as `source_url`.
+        content: The raw page body.
+        selectors: Dictionary of CSS selectors, see `scrape_startup_database`.
+
+    Yields:
+        Company dicts, one per company container.
+
+    Raises:
+        ValueError: If required selectors are missing or invalid
+    """
+    selectors = selectors or DEFAULT_SELECTORS
+    backend = get_parser(parser)
+
+    try:
+        for company_data in backend.iter_records(
+            content, selectors, "company_container", href_fields=("website",)
+        ):
+            # Add source URL or domain as reference
+            company_data["source_url"] = url
+            yield company_data
+    except Exception as e:
+        raise ValueError(f"Error parsing data: {str(e)}")
+
+
+def extract_companies(
+    url: str,
+    content: bytes,
+    selectors: Optional[Dict[str, str]] = None,
+    parser: Optional[str] = None,
+) -> List[Record]:
+    """
+    Extracts company records from an already fetched startup database page.
+
+    This is the eager counterpart of `parse_companies` and can be plugged into
+    `Crawler.crawl` directly.
+
+    Returns:
+        A list of company dicts.
+    """
+    return list(parse_companies(url, content, selectors, parser))
+
+
+def iter_companies(
+    url,
+    selectors=None,
+    batch_size: Optional[int] = None,
+    crawler: Optional[Crawler] = None,
+    parser: Optional[str] = None,
+    resolver: Optional[CompanyResolver] = None,
+) -> Iterator[Union[Record, List[Record]]]:
+    """
+    Streams company records from a startup database page.
+
+    Args:
+        url: The URL of the startup database.
+        selectors: Dictionary of CSS selectors, see `scrape_startup_database`.
+        batch_size: If set, yield lists of up to this many records instead of
+            single records.
+        crawler: Crawler to fetch with. Defaults to the shared process-wide crawler.
+        parser: Parser backend name, see `tci.data.scrapers.parsers`. Defaults to
+            `settings.SCRAPE_PARSER`.
+        resolver: If set, each record's name is replaced by the name of the
+            known company it matches (the scraped name is kept as
+            `source_name`), see `tci.data.processors.entities`.
+
+    Yields:
+        Company dicts, or lists of company dicts when `batch_size` is set.
+
+    Raises:
+        requests.RequestException: If the URL cannot be accessed
+        ValueError: If required selectors are missing or invalid
+    """
+    crawler = crawler or get_default_crawler()
+
+    try:
+        page = crawler.fetch(url)
+    except requests.RequestException as e:
+        raise requests.RequestException(f"Failed to fetch URL: {str(e)}")
+
+    records = parse_companies(url, page.content, selectors, parser)
+    if resolver is not None:
+        records = resolver.canonicalize_all(records)
+    yield from batched(records, batch_size) if batch_size else records
+
+
+def iter_crawled_companies(
+    urls: Iterable[str],
+    selectors=None,
+    batch_size: Optional[int] = None,
+    crawler: Optional[Crawler] = None,
+    parser: Optional[str] = None,
+    resolver: Optional[CompanyResolver] = None,
+) -> Iterator[Union[Record, List[Record]]]:
+    """
+    Streams company records from many startup database pages fetched concurrently.
+
+    Pages are parsed in the calling thread as they finish downloading, so only
+    one page's records are materialized at a time, and `Crawler.crawl` keeps
+    only a small window of fetched bodies waiting. Pages that fail to fetch or
+    parse are skipped; use `Crawler.crawl` with `extract_companies` to inspect
+    the errors. With a `resolver`, records are matched to known companies as
+    in `iter_companies`, and the same company listed on several pages resolves
+    to one name.
+
+    Yields:
+        Company dicts, or lists of company dicts when `batch_size` is set.
+    """
+    crawler = crawler or get_default_crawler()
+
+    def records() -> Iterator[Record]:
+        for result in crawler.crawl(urls, lambda url, content: content):
+            if not result.ok:
+                continue
+            try:
+                yield from parse_companies(result.url, result.data, selectors, parser)
+            except ValueError:
+                continue
+
+    stream = records()
+    if resolver is not None:
+        stream = resolver.canonicalize_all(stream)
+    yield from batched(stream, batch_size) if batch_size else stream
+
+
+def scrape_startup_database(
+    url,
+    selectors=None,
+    crawler: Optional[Crawler] = None,
+    parser: Optional[str] = None,
+    resolver: Optional[CompanyResolver] = None,
+):
     """
     Scrapes a startup database for company information using customizable selectors.
 
@@ -12,6 +176,10 @@ def scrape_startup_database(url, selectors=None):
                 'description': 'p.company-description',
                 'website': 'a.company-website'
             }
+        crawler: Crawler to fetch with. Defaults to the shared process-wide crawler.
+        parser: Parser backend name, see `tci.data.scrapers.parsers`. Defaults to
+            `settings.SCRAPE_PARSER`.
+        resolver: Matches records to known companies, see `iter_companies`.
 
     Returns:
         A pandas DataFrame with company data.
@@ -20,50 +188,28 @@ def scrape_startup_database(url, selectors=None):
         requests.RequestException: If the URL cannot be accessed
         ValueError: If required selectors are missing or invalid
     """
-    # Use default selectors if none provided
-    default_selectors = {
-        "company_container": "div.portfolio-company",
-        "name": "h3.company-name",
-        "description": "p.company-description",
-        "website": "a.company-website",
-    }
-    selectors = selectors or default_selectors
+    return pd.DataFrame(
+        iter_companies(
+            url, selectors, crawler=crawler, parser=parser, resolver=resolver
+        )
+    )
 
-    # ... existing imports ...
-
-    try:
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.content, "html.parser")
-
-        companies = []
-        company_elements = soup.select(selectors["company_container"])
-
-        for company in company_elements:
-            company_data = {}
-
-            # Dynamically extract data based on selectors
-            for field, selector in selectors.items():
-                if field == "company_container":
-                    continue
-
-                element = company.select_one(selector)
-                if element:
-                    company_data[field] = (
-                        element.text.strip()
-                        if field != "website"
-                        else element.get("href", "")
-                    )
-                else:
-                    company_data[field] = None
-
-            # Add source URL or domain as reference
-            company_data["source_url"] = url
-            companies.append(company_data)
 
-        return pd.DataFrame(companies)
+def crawl_startup_databases(
+    urls: Iterable[str],
+    selectors=None,
+    crawler: Optional[Crawler] = None,
+    parser: Optional[str] = None,
+    resolver: Optional[CompanyResolver] = None,
+) -> pd.DataFrame:
+    """
+    Scrapes many startup database pages concurrently.
 
-    except requests.RequestException as e:
-        raise requests.RequestException(f"Failed to fetch URL: {str(e)}")
-    except Exception as e:
-        raise ValueError(f"Error parsing data: {str(e)}")
+    Returns:
+        A pandas DataFrame with the company data of all pages.
+    """
+    return pd.DataFrame(
+        iter_crawled_companies(
+            urls, selectors, crawler=crawler, parser=parser, resolver=resolver
+        )
+    )
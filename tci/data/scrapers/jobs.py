@@ -1,4 +1,160 @@
-def scrape_job_openings(url, selectors=None):
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+import pandas as pd
+import requests
+
+from tci.core.utils import batched
+from tci.data.scrapers.base import Crawler, get_default_crawler
+from tci.data.scrapers.parsers import get_parser
+
+DEFAULT_SELECTORS = {
+    "job_container": "div.job-posting",
+    "title": "h3.job-title",
+    "department": "div.department",
+    "location": "div.location",
+    "description": "div.job-description",
+    "apply_link": "a.apply-button",
+}
+
+Record = Dict[str, Any]
+
+
+def parse_job_openings(
+    url: str,
+    content: bytes,
+    selectors: Optional[Dict[str, str]] = None,
+    parser: Optional[str] = None,
+) -> Iterator[Record]:
+    """
+    Lazily parses job openings from an already fetched career page.
+
+    Each job container is turned into a record as soon as it has been parsed,
+    so callers can process jobs while the rest of the page is still being
+    worked through.
+
+    Args:
+        url: The URL the page was fetched from, stored as `source_url`.
+        content: The raw page body.
+        selectors: Dictionary of CSS selectors, see `scrape_job_openings`.
+
+    Yields:
+        Job dicts, one per job container.
+
+    Raises:
+        ValueError: If required selectors are missing or invalid
+    """
+    selectors = selectors or DEFAULT_SELECTORS
+    backend = get_parser(parser)
+
+    try:
+        for job_data in backend.iter_records(
+            content, selectors, "job_container", href_fields=("apply_link",)
+        ):
+            # Add metadata
+            job_data["source_url"] = url
+            job_data["scraped_date"] = datetime.now().isoformat()
+            yield job_data
+    except Exception as e:
+        raise ValueError(f"Error parsing job data: {str(e)}")
+
+
+def extract_job_openings(
+    url: str,
+    content: bytes,
+    selectors: Optional[Dict[str, str]] = None,
+    parser: Optional[str] = None,
+) -> List[Record]:
+    """
+    Extracts job openings from an already fetched career page.
+
+    This is the eager counterpart of `parse_job_openings` and can be plugged
+    into `Crawler.crawl` directly.
+
+    Returns:
+        A list of job dicts.
+    """
+    return list(parse_job_openings(url, content, selectors, parser))
+
+
+def iter_job_openings(
+    url,
+    selectors=None,
+    batch_size: Optional[int] = None,
+    crawler: Optional[Crawler] = None,
+    parser: Optional[str] = None,
+) -> Iterator[Union[Record, List[Record]]]:
+    """
+    Streams job openings from a company's career page or job board.
+
+    Args:
+        url: The URL of the job listings page
+        selectors: Dictionary of CSS selectors, see `scrape_job_openings`.
+        batch_size: If set, yield lists of up to this many records instead of
+            single records.
+        crawler: Crawler to fetch with. Defaults to the shared process-wide crawler.
+        parser: Parser backend name, see `tci.data.scrapers.parsers`. Defaults to
+            `settings.SCRAPE_PARSER`.
+
+    Yields:
+        Job dicts, or lists of job dicts when `batch_size` is set.
+
+    Raises:
+        requests.RequestException: If the URL cannot be accessed
+        ValueError: If required selectors are missing or invalid
+    """
+    crawler = crawler or get_default_crawler()
+
+    try:
+        page = crawler.fetch(url)
+    except requests.RequestException as e:
+        raise requests.RequestException(f"Failed to fetch URL: {str(e)}")
+
+    records = parse_job_openings(url, page.content, selectors, parser)
+    yield from batched(records, batch_size) if batch_size else records
+
+
+def iter_crawled_job_openings(
+    urls: Iterable[str],
+    selectors=None,
+    batch_size: Optional[int] = None,
+    crawler: Optional[Crawler] = None,
+    parser: Optional[str] = None,
+) -> Iterator[Union[Record, List[Record]]]:
+    """
+    Streams job openings from many career pages fetched concurrently.
+
+    Pages are parsed in the calling thread as they finish downloading, so only
+    one page's records are materialized at a time, and `Crawler.crawl` keeps
+    only a small window of fetched bodies waiting. Pages that fail to fetch or
+    parse are skipped; use `Crawler.crawl` with `extract_job_openings` to
+    inspect the errors.
+
+    Yields:
+        Job dicts, or lists of job dicts when `batch_size` is set.
+    """
+    crawler = crawler or get_default_crawler()
+
+    def records() -> Iterator[Record]:
+        for result in crawler.crawl(urls, lambda url, content: content):
+            if not result.ok:
+                continue
+            try:
+                yield from parse_job_openings(
+                    result.url, result.data, selectors, parser
+                )
+            except ValueError:
+                continue
+
+    yield from batched(records(), batch_size) if batch_size else records()
+
+
+def scrape_job_openings(
+    url,
+    selectors=None,
+    crawler: Optional[Crawler] = None,
+    parser: Optional[str] = None,
+):
     """
     Scrapes job openings from a company's career page or job board.
 
@@ -14,6 +170,9 @@ def scrape_job_openings(url, selectors=None):
                 'description': 'div.job-description',
                 'apply_link': 'a.apply-button'
             }
+        crawler: Crawler to fetch with. Defaults to the shared process-wide crawler.
+        parser: Parser backend name, see `tci.data.scrapers.parsers`. Defaults to
+            `settings.SCRAPE_PARSER`.
 
     Returns:
         A pandas DataFrame with job opening data.
@@ -22,49 +181,23 @@ def scrape_job_openings(url, selectors=None):
         requests.RequestException: If the URL cannot be accessed
         ValueError: If required selectors are missing or invalid
     """
-    default_selectors = {
-        "job_container": "div.job-posting",
-        "title": "h3.job-title",
-        "department": "div.department",
-        "location": "div.location",
-        "description": "div.job-description",
-        "apply_link": "a.apply-button",
-    }
-    selectors = selectors or default_selectors
+    return pd.DataFrame(
+        iter_job_openings(url, selectors, crawler=crawler, parser=parser)
+    )
 
-    try:
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.content, "html.parser")
-
-        jobs = []
-        job_elements = soup.select(selectors["job_container"])
-
-        for job in job_elements:
-            job_data = {}
-
-            # Dynamically extract data based on selectors
-            for field, selector in selectors.items():
-                if field == "job_container":
-                    continue
-
-                element = job.select_one(selector)
-                if element:
-                    if field == "apply_link":
-                        job_data[field] = element.get("href", "")
-                    else:
-                        job_data[field] = element.text.strip()
-                else:
-                    job_data[field] = None
 
-            # Add metadata
-            job_data["source_url"] = url
-            job_data["scraped_date"] = datetime.now().isoformat()
-            jobs.append(job_data)
-
-        return pd.DataFrame(jobs)
+def crawl_job_openings(
+    urls: Iterable[str],
+    selectors=None,
+    crawler: Optional[Crawler] = None,
+    parser: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    Scrapes many career pages concurrently.
 
-    except requests.RequestException as e:
-        raise requests.RequestException(f"Failed to fetch URL: {str(e)}")
-    except Exception as e:
-        raise ValueError(f"Error parsing job data: {str(e)}")
+    Returns:
+        A pandas DataFrame with the job openings of all pages.
+    """
+    return pd.DataFrame(
+        iter_crawled_job_openings(urls, selectors, crawler=crawler, parser=parser)
+    )
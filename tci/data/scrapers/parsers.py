@@ -0,0 +1,210 @@
+"""Pluggable HTML parsing backends for the scrapers.
+
+A selector dict (see ``scrape_job_openings``) names one *container* selector
+and a selector per field. Backends compile each selector dict once, cache the
+result, and turn a page into one ``{field: value}`` dict per container:
+
+* ``soup`` - BeautifulSoup with ``html.parser`` and precompiled soupsieve
+  patterns. Slow but tolerant, and matches the historical behaviour exactly.
+* ``lxml`` - libxml2's incremental HTML parser with the selectors translated to
+  compiled XPath. Containers are recognised as soon as their closing tag has
+  been parsed, their fields are read from that subtree only and the subtree is
+  then cleared, so memory stays flat on large directory pages. Like soupsieve,
+  field selectors are matched against the whole page ("#jobs li h3" finds
+  the ``h3`` of a ``li`` container), only their result must be inside the
+  container.
+"""
+
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import soupsieve
+from bs4 import BeautifulSoup
+from bs4.dammit import UnicodeDammit
+from cssselect import HTMLTranslator
+from cssselect.xpath import XPathExpr
+from lxml import etree
+
+from tci.core.config import settings
+
+FieldValues = Dict[str, Optional[str]]
+SelectorItems = Tuple[Tuple[str, str], ...]
+
+
+class ParserBackend(ABC):
+    """Turns page content into one field dict per container"""
+
+    name: str
+
+    @abstractmethod
+    def iter_records(
+        self,
+        content: bytes,
+        selectors: Dict[str, str],
+        container_key: str,
+        href_fields: Sequence[str] = (),
+    ) -> Iterator[FieldValues]:
+        """Yield the field values of every container in the page
+
+        Fields listed in ``href_fields`` take the matched element's ``href``
+        attribute, all others its stripped text. Unmatched fields are ``None``.
+
+        Raises:
+            KeyError: If ``container_key`` is missing from ``selectors``
+            ValueError: If a selector cannot be compiled
+        """
+
+
+def _split_selectors(
+    selectors: SelectorItems, container_key: str
+) -> Tuple[str, List[Tuple[str, str]]]:
+    fields = [(field, css) for field, css in selectors if field != container_key]
+    return dict(selectors)[container_key], fields
+
+
+class SoupBackend(ParserBackend):
+    name = "soup"
+
+    def __init__(self, features: str = "html.parser"):
+        self.features = features
+
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def _compile(selectors: SelectorItems, container_key: str):
+        container, fields = _split_selectors(selectors, container_key)
+        try:
+            return soupsieve.compile(container), [
+                (field, soupsieve.compile(css)) for field, css in fields
+            ]
+        except soupsieve.SelectorSyntaxError as e:
+            raise ValueError(f"Invalid selector: {e}")
+
+    def iter_records(self, content, selectors, container_key, href_fields=()):
+        container, fields = self._compile(tuple(selectors.items()), container_key)
+        soup = BeautifulSoup(content, self.features)
+
+        for element in container.select(soup):
+            record: FieldValues = {}
+            for field, pattern in fields:
+                match = pattern.select_one(element)
+                if match is None:
+                    record[field] = None
+                elif field in href_fields:
+                    record[field] = match.get("href", "")
+                else:
+                    record[field] = match.text.strip()
+            yield record
+
+
+class _SelfMatchTranslator(HTMLTranslator):
+    """Translates a selector into a test of the context element itself.
+
+    The stock translation walks *down* from the document root; here every
+    combinator instead becomes a predicate on the rightmost element looking
+    back at its ancestors and preceding siblings, which are all known by the
+    time the element's closing tag has been parsed.
+    """
+
+    def xpath_descendant_combinator(self, left: XPathExpr, right: XPathExpr):
+        return right.add_condition(f"ancestor::{left}")
+
+    def xpath_child_combinator(self, left: XPathExpr, right: XPathExpr):
+        return right.add_condition(f"parent::{left}")
+
+    def xpath_direct_adjacent_combinator(self, left: XPathExpr, right: XPathExpr):
+        return right.add_condition(f"preceding-sibling::*[1]/self::{left}")
+
+    def xpath_indirect_adjacent_combinator(self, left: XPathExpr, right: XPathExpr):
+        return right.add_condition(f"preceding-sibling::{left}")
+
+
+_text_content = etree.XPath("string()")
+_self_translator = _SelfMatchTranslator()
+
+
+def _decode(content: bytes) -> str:
+    """Decode a page body, preferring UTF-8 before sniffing the encoding"""
+    if isinstance(content, str):
+        return content
+    try:
+        return content.decode("utf-8")
+    except UnicodeDecodeError:
+        return UnicodeDammit(content).unicode_markup
+
+
+class LxmlBackend(ParserBackend):
+    name = "lxml"
+
+    def __init__(self, chunk_size: int = 64 * 1024):
+        self.chunk_size = chunk_size
+
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def _compile(selectors: SelectorItems, container_key: str):
+        container, fields = _split_selectors(selectors, container_key)
+        try:
+            matcher = etree.XPath(
+                "boolean({})".format(
+                    _self_translator.css_to_xpath(container, prefix="self::")
+                )
+            )
+            compiled = [
+                (
+                    field,
+                    etree.XPath(
+                        "(descendant::*[{}])[1]".format(
+                            _self_translator.css_to_xpath(css, prefix="self::")
+                        )
+                    ),
+                )
+                for field, css in fields
+            ]
+        except Exception as e:
+            raise ValueError(f"Invalid selector: {e}")
+        return matcher, compiled
+
+    def iter_records(self, content, selectors, container_key, href_fields=()):
+        matcher, fields = self._compile(tuple(selectors.items()), container_key)
+        parser = etree.HTMLPullParser(events=("end",))
+        text = _decode(content)
+
+        def drain() -> Iterator[FieldValues]:
+            for _, element in parser.read_events():
+                if not matcher(element):
+                    continue
+                record: FieldValues = {}
+                for field, path in fields:
+                    matches = path(element)
+                    if not matches:
+                        record[field] = None
+                    elif field in href_fields:
+                        record[field] = matches[0].get("href", "")
+                    else:
+                        record[field] = _text_content(matches[0]).strip()
+
+                # Keep the empty element so sibling-based selectors still work
+                element.clear(keep_tail=True)
+                yield record
+
+        for start in range(0, len(text), self.chunk_size):
+            parser.feed(text[start : start + self.chunk_size])
+            yield from drain()
+        if text:
+            parser.close()
+            yield from drain()
+
+
+PARSERS: Dict[str, ParserBackend] = {
+    SoupBackend.name: SoupBackend(),
+    LxmlBackend.name: LxmlBackend(),
+}
+
+
+def get_parser(parser: Optional[str] = None) -> ParserBackend:
+    """Look up a parser backend by name, defaulting to ``settings.SCRAPE_PARSER``"""
+    name = parser or settings.SCRAPE_PARSER
+    try:
+        return PARSERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown parser backend: {name}")
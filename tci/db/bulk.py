@@ -0,0 +1,217 @@
+"""Set-based bulk loading helpers.
+
+These bypass the ORM unit of work and write whole chunks with batched
+multi-row ``INSERT ... ON CONFLICT`` statements, which is what makes large
+imports fast. Callers own the transaction: commit or roll back after each
+chunk.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Collection, Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import func, literal_column, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from tci.core.utils import batched
+from tci.db.models import Company, Job
+
+# Scraped job columns written by ``upsert_jobs``, besides the sync metadata
+JOB_COLUMNS = (
+    "title",
+    "description",
+    "company_id",
+    "location",
+    "department",
+    "apply_link",
+    "source_url",
+)
+
+
+@dataclass
+class UpsertCounts:
+    """Outcome of an upsert, per input row"""
+
+    added: int = 0
+    updated: int = 0
+    skipped: int = 0
+
+    @property
+    def total(self) -> int:
+        return self.added + self.updated + self.skipped
+
+    def __add__(self, other: "UpsertCounts") -> "UpsertCounts":
+        return UpsertCounts(
+            self.added + other.added,
+            self.updated + other.updated,
+            self.skipped + other.skipped,
+        )
+
+
+@dataclass
+class JobSyncCounts:
+    """Outcome of syncing scraped postings, per input row plus closed jobs"""
+
+    inserted: int = 0
+    changed: int = 0
+    unchanged: int = 0
+    closed: int = 0
+
+    @property
+    def total(self) -> int:
+        return self.inserted + self.changed + self.unchanged
+
+    def __add__(self, other: "JobSyncCounts") -> "JobSyncCounts":
+        return JobSyncCounts(
+            self.inserted + other.inserted,
+            self.changed + other.changed,
+            self.unchanged + other.unchanged,
+            self.closed + other.closed,
+        )
+
+
+def upsert_companies(
+    session: Session, rows: Sequence[Dict[str, Optional[str]]]
+) -> UpsertCounts:
+    """Insert or update a chunk of companies keyed on their unique name
+
+    Existing companies only get their website/description replaced by
+    non-empty values, and rows that would not change anything are skipped
+    without touching the table. When a name repeats within the chunk the last
+    row wins and the earlier ones count as skipped.
+    """
+    unique: Dict[str, Dict[str, Optional[str]]] = {}
+    for row in rows:
+        unique[row["name"]] = row
+    if not unique:
+        return UpsertCounts()
+
+    now = datetime.utcnow()
+    values: List[Dict] = [
+        {
+            "name": row["name"],
+            "website": row.get("website"),
+            "description": row.get("description"),
+            "created_at": now,
+            "updated_at": now,
+        }
+        for row in unique.values()
+    ]
+
+    table = Company.__table__
+    stmt = insert(table)
+    website = func.coalesce(stmt.excluded.website, table.c.website)
+    description = func.coalesce(stmt.excluded.description, table.c.description)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.name],
+        set_={
+            "website": website,
+            "description": description,
+            "updated_at": stmt.excluded.updated_at,
+        },
+        where=or_(
+            website.is_distinct_from(table.c.website),
+            description.is_distinct_from(table.c.description),
+        ),
+    ).returning(literal_column("xmax = 0").label("inserted"))
+
+    # Executed with a parameter list, SQLAlchemy batches the rows into
+    # multi-row VALUES clauses. Postgres reports freshly inserted rows with
+    # xmax = 0; rows held back by the WHERE clause of the conflict action are
+    # not returned at all.
+    result = session.connection().execute(stmt, values)
+    inserted = [row.inserted for row in result]
+    added = sum(inserted)
+    updated = len(inserted) - added
+    return UpsertCounts(
+        added=added, updated=updated, skipped=len(rows) - added - updated
+    )
+
+
+def upsert_jobs(session: Session, rows: Sequence[Dict[str, Any]]) -> JobSyncCounts:
+    """Insert or update a chunk of scraped jobs keyed on their ``source_key``
+
+    Every row needs ``source_key`` and ``content_hash`` next to the
+    ``JOB_COLUMNS``. A stored job is only rewritten when its content hash
+    differs or it was closed and is listed again (which reopens it), so a
+    re-scrape of unchanged postings writes nothing. A missing ``company_id``
+    keeps the stored one. When a key repeats within the chunk the last row
+    wins and the earlier ones count as unchanged.
+    """
+    unique: Dict[str, Dict[str, Any]] = {}
+    for row in rows:
+        unique[row["source_key"]] = row
+    if not unique:
+        return JobSyncCounts()
+
+    now = datetime.utcnow()
+    values: List[Dict] = [
+        {
+            **{column: row.get(column) for column in JOB_COLUMNS},
+            "source_key": row["source_key"],
+            "content_hash": row["content_hash"],
+            "created_at": now,
+            "updated_at": now,
+        }
+        for row in unique.values()
+    ]
+
+    table = Job.__table__
+    stmt = insert(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.source_key],
+        set_={
+            **{column: stmt.excluded[column] for column in JOB_COLUMNS},
+            "company_id": func.coalesce(stmt.excluded.company_id, table.c.company_id),
+            "content_hash": stmt.excluded.content_hash,
+            "updated_at": stmt.excluded.updated_at,
+            "closed_at": None,
+        },
+        where=or_(
+            table.c.content_hash.is_distinct_from(stmt.excluded.content_hash),
+            table.c.closed_at.isnot(None),
+        ),
+    ).returning(literal_column("xmax = 0").label("inserted"))
+
+    # See upsert_companies: inserted rows report xmax = 0 and unchanged rows
+    # are not returned
+    result = session.connection().execute(stmt, values)
+    inserted = [row.inserted for row in result]
+    added = sum(inserted)
+    changed = len(inserted) - added
+    return JobSyncCounts(
+        inserted=added, changed=changed, unchanged=len(rows) - added - changed
+    )
+
+
+def close_jobs(
+    session: Session,
+    source_urls: Iterable[str],
+    seen_keys: Collection[str],
+    chunk_size: int = 5000,
+) -> int:
+    """Mark open jobs listed on ``source_urls`` but not in ``seen_keys`` closed
+
+    Returns the number of jobs closed.
+    """
+    now = datetime.utcnow()
+    closed = 0
+    for urls in batched(set(source_urls), chunk_size):
+        open_jobs = session.execute(
+            select(Job.id, Job.source_key).where(
+                Job.source_url.in_(urls),
+                Job.source_key.isnot(None),
+                Job.closed_at.is_(None),
+            )
+        )
+        vanished = [id_ for id_, key in open_jobs if key not in seen_keys]
+        for ids in batched(vanished, chunk_size):
+            session.execute(
+                update(Job)
+                .where(Job.id.in_(ids))
+                .values(closed_at=now, updated_at=now),
+                execution_options={"synchronize_session": False},
+            )
+            closed += len(ids)
+    return closed
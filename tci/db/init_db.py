@@ -1,10 +1,11 @@
 # The model registration happens automatically when the model classes are imported,
 # since they inherit from Base which tracks all model classes.
 # Simply importing them is enough to register them with SQLAlchemy's metadata.
+from tci.db.migrations import unique_company_names
 from tci.db.models import Company  # Company model
 from tci.db.models import Job  # Job model
 from tci.db.models import User  # Add any new models here; User model
-from tci.db.postgresql import Base, engine
+from tci.db.postgresql import Base, db, engine
 
 
 def init_database():
@@ -17,6 +18,15 @@ def init_database():
     Base.metadata.create_all(bind=engine)
     print("Database tables created successfully!")
 
+    # Tables that already existed may predate newer constraints
+    with db.session_scope() as session:
+        merged = unique_company_names(session)
+    if merged.companies:
+        print(
+            f"Merged {merged.companies} duplicate companies "
+            f"(moved {merged.jobs} jobs) before making names unique"
+        )
+
 
 if __name__ == "__main__":
     init_database()
@@ -0,0 +1,81 @@
+"""Schema changes that ``create_all`` cannot apply to an existing database.
+
+``Base.metadata.create_all`` only creates missing tables, so constraints added
+to existing tables need a data fix-up first. Every migration here is
+idempotent and run by ``scripts/init_database.py``; callers own the
+transaction.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import delete, func, inspect, select, text, update
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.orm import Session
+
+from tci.db.models import Company, Job
+
+COMPANY_NAME_CONSTRAINT = "companies_name_key"
+
+
+@dataclass
+class MergeCounts:
+    companies: int = 0  # duplicate companies merged away
+    jobs: int = 0  # jobs re-pointed to the company they were merged into
+
+
+def has_unique_company_names(session: Session) -> bool:
+    constraints = inspect(session.connection()).get_unique_constraints("companies")
+    return any(c["column_names"] == ["name"] for c in constraints)
+
+
+def merge_duplicate_companies(session: Session) -> MergeCounts:
+    """Fold companies sharing a name into the oldest of them
+
+    The kept company takes the website and description of a duplicate where
+    it has none, and the duplicates' jobs move to it. Moved jobs get a new
+    ``updated_at`` so incremental consumers (rollups, embeddings) see them.
+    """
+    counts = MergeCounts()
+    groups = session.execute(
+        select(func.array_agg(aggregate_order_by(Company.id, Company.id)))
+        .group_by(Company.name)
+        .having(func.count(Company.id) > 1)
+    ).all()
+    now = datetime.utcnow()
+    for (ids,) in groups:
+        keep, duplicates = ids[0], ids[1:]
+        companies = {
+            company.id: company
+            for company in session.scalars(select(Company).where(Company.id.in_(ids)))
+        }
+        kept = companies[keep]
+        for duplicate in duplicates:
+            kept.website = kept.website or companies[duplicate].website
+            kept.description = kept.description or companies[duplicate].description
+        counts.jobs += session.execute(
+            update(Job)
+            .where(Job.company_id.in_(duplicates))
+            .values(company_id=keep, updated_at=now)
+        ).rowcount
+        session.flush()
+        session.execute(delete(Company).where(Company.id.in_(duplicates)))
+        counts.companies += len(duplicates)
+    return counts
+
+
+def unique_company_names(session: Session) -> MergeCounts:
+    """Merge duplicate company names, then add the unique name constraint
+
+    ``upsert_companies`` relies on the constraint for ``ON CONFLICT (name)``.
+    """
+    if has_unique_company_names(session):
+        return MergeCounts()
+    counts = merge_duplicate_companies(session)
+    session.execute(
+        text(
+            f"ALTER TABLE companies ADD CONSTRAINT {COMPANY_NAME_CONSTRAINT} "
+            "UNIQUE (name)"
+        )
+    )
+    return counts
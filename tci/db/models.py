@@ -1,12 +1,25 @@
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import date, datetime
 from typing import List, Optional
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String, Text
-from sqlalchemy.orm import Mapped, RelationshipProperty, relationship
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    text,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import Mapped, RelationshipProperty, deferred, relationship
 
 from tci.db.postgresql import Base
+from tci.db.search import weighted_tsvector
 
 
 class User(Base):
@@ -31,7 +44,7 @@ class Company(Base):
     __tablename__ = "companies"
 
     id: Mapped[int] = Column(Integer, primary_key=True)
-    name: Mapped[str] = Column(String(255), nullable=False)
+    name: Mapped[str] = Column(String(255), nullable=False, unique=True)
     description: Mapped[Optional[str]] = Column(Text)
     website: Mapped[Optional[str]] = Column(String(255))
     created_at: Mapped[datetime] = Column(DateTime, default=datetime.utcnow)
@@ -39,9 +52,19 @@ class Company(Base):
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
     )
 
+    # Full-text search document, maintained by Postgres
+    search_vector: Mapped[str] = deferred(
+        Column(TSVECTOR, weighted_tsvector(("name", "A"), ("description", "B")))
+    )
+
     # Add the relationship
     jobs: Mapped[List[Job]] = relationship("Job", back_populates="company")
 
+    __table_args__ = (
+        Index("ix_companies_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_companies_created_at_id", "created_at", "id"),
+    )
+
     def __repr__(self) -> str:
         return f"<Company(name='{self.name}', website='{self.website}')>"
 
@@ -56,10 +79,76 @@ class Job(Base):
     location: Mapped[Optional[str]] = Column(String(255))
     salary_range: Mapped[Optional[str]] = Column(String(255))
     job_type: Mapped[Optional[str]] = Column(String(50))
+    department: Mapped[Optional[str]] = Column(String(255))
+    apply_link: Mapped[Optional[str]] = Column(Text)
+    # Scraped postings: the page they were listed on, a stable identity within
+    # that page and a hash of the scraped content, for incremental re-scrapes
+    source_url: Mapped[Optional[str]] = Column(Text)
+    source_key: Mapped[Optional[str]] = Column(String(64), unique=True)
+    content_hash: Mapped[Optional[str]] = Column(String(64))
+    closed_at: Mapped[Optional[datetime]] = Column(DateTime)
     created_at: Mapped[datetime] = Column(DateTime, default=datetime.utcnow)
     updated_at: Mapped[datetime] = Column(
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
     )
 
+    # Full-text search document, maintained by Postgres
+    search_vector: Mapped[str] = deferred(
+        Column(
+            TSVECTOR,
+            weighted_tsvector(("title", "A"), ("description", "B"), ("location", "C")),
+        )
+    )
+
     # Relationships
     company: Mapped[Company] = relationship("Company", back_populates="jobs")
+
+    __table_args__ = (
+        Index("ix_jobs_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_jobs_created_at_id", "created_at", "id"),
+        # Incremental reads: exports and analytics rollup refreshes
+        Index("ix_jobs_updated_at", "updated_at"),
+        Index(
+            "ix_jobs_open_source_url",
+            "source_url",
+            postgresql_where=text("closed_at IS NULL"),
+        ),
+    )
+
+
+class JobSnapshot(Base):
+    """A job's analytics attributes as of the last rollup refresh
+
+    Diffing these against the jobs table tells which rollup counts a changed
+    or deleted job has to be moved out of. There is deliberately no foreign
+    key, so snapshots outlive the jobs they describe until the next refresh.
+    """
+
+    __tablename__ = "analytics_job_snapshots"
+
+    job_id: Mapped[int] = Column(Integer, primary_key=True, autoincrement=False)
+    company_id: Mapped[Optional[int]] = Column(Integer)
+    location: Mapped[Optional[str]] = Column(String(255))
+    job_type: Mapped[Optional[str]] = Column(String(50))
+    week: Mapped[Optional[date]] = Column(Date)
+    is_open: Mapped[bool] = Column(Boolean, nullable=False)
+
+
+class JobRollup(Base):
+    """Precomputed job count for one value of one analytics dimension"""
+
+    __tablename__ = "analytics_job_rollups"
+
+    dimension: Mapped[str] = Column(String(20), primary_key=True)
+    key: Mapped[str] = Column(String(255), primary_key=True)
+    job_count: Mapped[int] = Column(Integer, nullable=False, default=0)
+
+
+class RollupState(Base):
+    """Progress of an incremental rollup refresh"""
+
+    __tablename__ = "analytics_rollup_state"
+
+    name: Mapped[str] = Column(String(50), primary_key=True)
+    watermark: Mapped[Optional[datetime]] = Column(DateTime)
+    refreshed_at: Mapped[Optional[datetime]] = Column(DateTime)
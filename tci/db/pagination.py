@@ -0,0 +1,101 @@
+"""Keyset (cursor) pagination over ``(created_at, id)``.
+
+Rows are listed newest first. Instead of an ``OFFSET`` every page seeks
+directly past the last row of the previous page using the composite
+``(created_at, id)`` index, so deep pages cost the same as the first one and
+rows inserted meanwhile never shift later pages. Cursors are opaque,
+URL-safe strings.
+"""
+
+import base64
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Generic, List, Optional, Tuple, TypeVar
+
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query
+
+T = TypeVar("T")
+
+NEXT = "next"
+PREV = "prev"
+
+
+@dataclass
+class Page(Generic[T]):
+    items: List[T] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+
+
+def encode_cursor(created_at: datetime, id_: int, direction: str = NEXT) -> str:
+    payload = json.dumps([created_at.isoformat(), id_, direction])
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int, str]:
+    """Parse a cursor produced by :func:`encode_cursor`
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        created_at, id_, direction = json.loads(base64.urlsafe_b64decode(cursor))
+        if direction not in (NEXT, PREV):
+            raise ValueError(direction)
+        return datetime.fromisoformat(created_at), int(id_), direction
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+def paginate(
+    query: Query, model, cursor: Optional[str] = None, limit: int = 50
+) -> Page:
+    """Return one page of ``query`` ordered by ``model.created_at, model.id`` descending
+
+    Args:
+        query: Query selecting ``model`` rows, without ordering or limits.
+        model: Mapped class with ``created_at`` and ``id`` columns.
+        cursor: ``next_cursor`` or ``prev_cursor`` of a previously returned page,
+            or None for the first page.
+        limit: Page size.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    key = tuple_(model.created_at, model.id)
+    direction = NEXT
+    if cursor:
+        created_at, id_, direction = decode_cursor(cursor)
+        if direction == NEXT:
+            query = query.filter(key < tuple_(created_at, id_))
+        else:
+            query = query.filter(key > tuple_(created_at, id_))
+
+    if direction == NEXT:
+        query = query.order_by(model.created_at.desc(), model.id.desc())
+    else:
+        query = query.order_by(model.created_at.asc(), model.id.asc())
+
+    # One extra row tells whether there is anything beyond this page
+    rows = query.limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if direction == PREV:
+        rows.reverse()
+    if not rows:
+        return Page()
+
+    first, last = rows[0], rows[-1]
+    if direction == NEXT:
+        more_after, more_before = has_more, cursor is not None
+    else:
+        more_after, more_before = True, has_more
+    return Page(
+        items=rows,
+        next_cursor=encode_cursor(last.created_at, last.id) if more_after else None,
+        prev_cursor=(
+            encode_cursor(first.created_at, first.id, PREV) if more_before else None
+        ),
+    )
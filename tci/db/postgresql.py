@@ -1,25 +1,139 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import declarative_base, sessionmaker
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+from sqlalchemy import create_engine, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, declarative_base, sessionmaker
+from sqlalchemy.pool import QueuePool
 
 from tci.core.config import settings
 
-engine = create_engine(settings.POSTGRES_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long checkouts wait for a connection.
+
+    The measured time covers waiting for a free connection as well as opening
+    a new one when the pool grows, i.e. everything a request spends before it
+    can talk to the database.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.wait_count = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.timeouts = 0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            with self._stats_lock:
+                self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            with self._stats_lock:
+                self.wait_count += 1
+                self.wait_total += waited
+                self.wait_max = max(self.wait_max, waited)
+
+
+def create_db_engine(url: Optional[str] = None) -> Engine:
+    """Create an engine with the pool and timeouts configured in settings"""
+    connect_args = {}
+    if settings.DB_STATEMENT_TIMEOUT_MS:
+        connect_args["options"] = (
+            f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"
+        )
+    return create_engine(
+        url or settings.POSTGRES_URL,
+        poolclass=TimedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args=connect_args,
+    )
+
+
+def create_session_factory(bind: Engine) -> sessionmaker:
+    # Objects stay readable after their session closes, services hand them out
+    return sessionmaker(
+        autocommit=False, autoflush=False, expire_on_commit=False, bind=bind
+    )
+
+
+engine = create_db_engine()
+SessionLocal = create_session_factory(engine)
 Base = declarative_base()
 
 
 class Database:
-    def __init__(self):
-        self.engine = engine
-        self.SessionLocal = SessionLocal
+    def __init__(self, bind: Optional[Engine] = None):
+        if bind is None:
+            self.engine = engine
+            self.SessionLocal = SessionLocal
+        else:
+            self.engine = bind
+            self.SessionLocal = create_session_factory(bind)
         self.Base = Base
 
-    def get_session(self):
-        db = SessionLocal()
+    def get_session(self) -> Session:
+        """Return a new session; the caller is responsible for closing it
+
+        Usage:
+            with db.get_session() as session:
+                ...
+                session.commit()
+        """
+        return self.SessionLocal()
+
+    @contextmanager
+    def session_scope(self) -> Iterator[Session]:
+        """Provide a transactional scope around a series of operations
+
+        Commits when the block exits normally, rolls back if it raises and
+        always closes the session.
+        """
+        session = self.SessionLocal()
         try:
-            return db
+            yield session
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
         finally:
-            db.close()
+            session.close()
+
+    def pool_stats(self) -> Dict[str, float]:
+        """Connection pool usage, for sizing the pool against concurrent users"""
+        pool = self.engine.pool
+        stats: Dict[str, float] = {
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": max(pool.overflow(), 0),
+        }
+        if isinstance(pool, TimedQueuePool):
+            stats.update(
+                {
+                    "wait_count": pool.wait_count,
+                    "wait_avg_ms": (
+                        1000 * pool.wait_total / pool.wait_count
+                        if pool.wait_count
+                        else 0.0
+                    ),
+                    "wait_max_ms": 1000 * pool.wait_max,
+                    "timeouts": pool.timeouts,
+                }
+            )
+        return stats
 
 
 db = Database()
@@ -0,0 +1,56 @@
+"""Read-only row projections for list and search views.
+
+Loading full ORM objects means building an instance per row, registering it
+in the session's identity map and tracking its attribute state, all for pages
+that only show a handful of fields. The projections here are plain named
+tuples built straight from result rows: they select only their own columns,
+are immutable and therefore safe to cache and share between sessions, and
+need no session to read.
+"""
+
+from datetime import datetime
+from typing import Iterable, List, NamedTuple, Optional, Type, TypeVar
+
+from sqlalchemy.orm import Query, Session
+
+from tci.db.models import Company, Job
+
+P = TypeVar("P", bound=tuple)
+
+
+class CompanySummary(NamedTuple):
+    id: int
+    name: str
+    website: Optional[str]
+    description: Optional[str]
+    created_at: datetime
+    updated_at: Optional[datetime]
+
+
+class JobSummary(NamedTuple):
+    id: int
+    company_id: Optional[int]
+    title: str
+    location: Optional[str]
+    job_type: Optional[str]
+    salary_range: Optional[str]
+    created_at: datetime
+    updated_at: Optional[datetime]
+
+
+def project_query(session: Session, projection: Type[P], model) -> Query:
+    """Query selecting exactly the columns of ``projection`` from ``model``"""
+    return session.query(*(getattr(model, field) for field in projection._fields))
+
+
+def to_projections(projection: Type[P], rows: Iterable[tuple]) -> List[P]:
+    """Build projections from result rows whose columns match its fields"""
+    return list(map(projection._make, rows))
+
+
+def company_summaries(session: Session) -> Query:
+    return project_query(session, CompanySummary, Company)
+
+
+def job_summaries(session: Session) -> Query:
+    return project_query(session, JobSummary, Job)
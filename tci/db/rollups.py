@@ -0,0 +1,232 @@
+"""Incrementally maintained job count rollups for the Analytics page.
+
+``analytics_job_rollups`` holds one job count per (dimension, key):
+
+* ``company`` / ``location`` / ``job_type`` - open jobs per company id,
+  location and job type
+* ``week`` - jobs posted per week (Monday of the ``created_at`` week)
+* ``total`` - ``open`` and ``all`` jobs
+
+A refresh reads only the jobs updated since the previous refresh, compares
+each with its snapshot in ``analytics_job_snapshots`` and turns the
+difference into count deltas: a job whose location changed moves one count
+from the old location to the new one, a job that closed leaves the open-job
+dimensions, and a job that was deleted (found by an anti-join of the
+snapshots against the jobs table) is subtracted entirely. Deltas are applied
+with one upsert, so the page never has to aggregate the jobs table itself.
+"""
+
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, exists, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from tci.core.config import settings
+from tci.core.utils import batched
+from tci.db.models import Job, JobRollup, JobSnapshot, RollupState
+
+STATE_NAME = "jobs"
+
+DIMENSIONS = ("company", "location", "job_type", "week", "total")
+SNAPSHOT_COLUMNS = ("company_id", "location", "job_type", "week", "is_open")
+
+# (company_id, location, job_type, week, is_open)
+Attributes = Tuple[Optional[int], Optional[str], Optional[str], Optional[date], bool]
+RollupKey = Tuple[str, str]
+
+
+@dataclass
+class RefreshStats:
+    scanned: int = 0
+    unchanged: int = 0
+    changed: int = 0
+    deleted: int = 0
+    keys_updated: int = 0
+    seconds: float = 0.0
+
+
+def week_of(moment: Optional[datetime]) -> Optional[date]:
+    if moment is None:
+        return None
+    day = moment.date()
+    return day - timedelta(days=day.weekday())
+
+
+def job_attributes(
+    company_id: Optional[int],
+    location: Optional[str],
+    job_type: Optional[str],
+    created_at: Optional[datetime],
+    closed_at: Optional[datetime],
+) -> Attributes:
+    location = " ".join(location.split())[:255] if location else None
+    job_type = job_type.strip() if job_type else None
+    return (
+        company_id,
+        location or None,
+        job_type or None,
+        week_of(created_at),
+        closed_at is None,
+    )
+
+
+def rollup_keys(attributes: Attributes) -> List[RollupKey]:
+    """The rollup counts a job with these attributes contributes one to"""
+    company_id, location, job_type, week, is_open = attributes
+    keys = [("total", "all")]
+    if week is not None:
+        keys.append(("week", week.isoformat()))
+    if is_open:
+        keys += [
+            ("total", "open"),
+            ("company", "" if company_id is None else str(company_id)),
+            ("location", location or ""),
+            ("job_type", job_type or ""),
+        ]
+    return keys
+
+
+def _snapshots(session: Session, *criteria) -> Dict[int, Attributes]:
+    """Stored attributes of the snapshots matching ``criteria``, by job id"""
+    columns = [getattr(JobSnapshot, column) for column in SNAPSHOT_COLUMNS]
+    rows = session.execute(select(JobSnapshot.job_id, *columns).where(*criteria))
+    return {job_id: tuple(attributes) for job_id, *attributes in rows}
+
+
+def _lock_state(session: Session) -> RollupState:
+    """The refresh state row, locked so concurrent refreshes run one at a time"""
+    session.execute(
+        insert(RollupState.__table__)
+        .values(name=STATE_NAME)
+        .on_conflict_do_nothing(index_elements=["name"])
+    )
+    return session.execute(
+        select(RollupState).where(RollupState.name == STATE_NAME).with_for_update()
+    ).scalar_one()
+
+
+def _apply_deltas(session: Session, deltas: Dict[RollupKey, int]) -> int:
+    rows = [
+        {"dimension": dimension, "key": key, "job_count": delta}
+        for (dimension, key), delta in deltas.items()
+        if delta
+    ]
+    table = JobRollup.__table__
+    for chunk in batched(rows, 5000):
+        stmt = insert(table)
+        session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[table.c.dimension, table.c.key],
+                set_={"job_count": table.c.job_count + stmt.excluded.job_count},
+            ),
+            chunk,
+        )
+    if rows:
+        session.execute(delete(table).where(table.c.job_count <= 0))
+    return len(rows)
+
+
+def _diff_chunk(
+    session: Session,
+    rows: List[tuple],
+    deltas: Counter,
+    stats: RefreshStats,
+) -> List[Dict]:
+    """Count deltas for a chunk of changed jobs; returns their new snapshots"""
+    snapshots = _snapshots(session, JobSnapshot.job_id.in_([row[0] for row in rows]))
+    updates = []
+    for job_id, *values in rows:
+        attributes = job_attributes(*values)
+        previous = snapshots.get(job_id)
+        if previous == attributes:
+            stats.unchanged += 1
+            continue
+        stats.changed += 1
+        if previous is not None:
+            deltas.subtract(rollup_keys(previous))
+        deltas.update(rollup_keys(attributes))
+        updates.append({"job_id": job_id, **dict(zip(SNAPSHOT_COLUMNS, attributes))})
+    return updates
+
+
+def _save_snapshots(session: Session, snapshots: Iterable[Dict]) -> None:
+    table = JobSnapshot.__table__
+    for chunk in batched(snapshots, 5000):
+        stmt = insert(table)
+        session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[table.c.job_id],
+                set_={column: stmt.excluded[column] for column in SNAPSHOT_COLUMNS},
+            ),
+            chunk,
+        )
+
+
+def refresh_job_rollups(
+    session: Session, full: bool = False, chunk_size: int = 5000
+) -> RefreshStats:
+    """Bring the job rollups up to date with the jobs table
+
+    Reads jobs updated since the previous refresh, minus
+    ``settings.ANALYTICS_REFRESH_OVERLAP`` seconds so that transactions which
+    committed late are not missed; re-reading a job is harmless because an
+    unchanged snapshot produces no delta. ``full`` rebuilds the rollups from
+    scratch. The caller commits.
+    """
+    stats = RefreshStats()
+    started = time.monotonic()
+    state = _lock_state(session)
+    refreshed_at = datetime.utcnow()
+
+    since = None
+    if full:
+        session.execute(delete(JobSnapshot))
+        session.execute(delete(JobRollup))
+    elif state.watermark is not None:
+        since = state.watermark - timedelta(seconds=settings.ANALYTICS_REFRESH_OVERLAP)
+
+    deltas: Counter = Counter()
+    watermark = None if full else state.watermark
+    query = select(
+        Job.id,
+        Job.company_id,
+        Job.location,
+        Job.job_type,
+        Job.created_at,
+        Job.closed_at,
+        Job.updated_at,
+    ).order_by(Job.id)
+    if since is not None:
+        query = query.where(Job.updated_at >= since)
+    changed = session.execute(
+        query,
+        execution_options={"stream_results": True, "max_row_buffer": chunk_size},
+    )
+    for chunk in changed.partitions(chunk_size):
+        stats.scanned += len(chunk)
+        for row in chunk:
+            if row.updated_at and (watermark is None or row.updated_at > watermark):
+                watermark = row.updated_at
+        updates = _diff_chunk(
+            session, [tuple(row[:-1]) for row in chunk], deltas, stats
+        )
+        _save_snapshots(session, updates)
+
+    deleted = _snapshots(session, ~exists().where(Job.id == JobSnapshot.job_id))
+    for attributes in deleted.values():
+        deltas.subtract(rollup_keys(attributes))
+    for ids in batched(list(deleted), chunk_size):
+        session.execute(delete(JobSnapshot).where(JobSnapshot.job_id.in_(ids)))
+    stats.deleted = len(deleted)
+
+    stats.keys_updated = _apply_deltas(session, deltas)
+    state.watermark = watermark
+    state.refreshed_at = refreshed_at
+    session.flush()
+    stats.seconds = time.monotonic() - started
+    return stats
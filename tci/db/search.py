@@ -0,0 +1,59 @@
+"""Postgres full-text search helpers.
+
+Searchable models carry a ``search_vector`` column generated from
+:func:`weighted_tsvector` and backed by a GIN index. Queries are turned into
+prefix ``tsquery`` expressions so partial words typed in a search box already match,
+and results are ordered by ``ts_rank_cd`` relevance.
+"""
+
+import re
+from typing import Optional, Tuple
+
+from sqlalchemy import Computed, func
+from sqlalchemy.orm import Query
+
+# The 'simple' configuration lowercases without stemming, which works for both
+# Hebrew and English text
+SEARCH_CONFIG = "simple"
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def weighted_tsvector(*weighted_columns: Tuple[str, str]) -> Computed:
+    """Generated column expression combining columns with tsvector weights
+
+    Usage:
+        weighted_tsvector(("name", "A"), ("description", "B"))
+    """
+    parts = [
+        f"setweight(to_tsvector('{SEARCH_CONFIG}'::regconfig, "
+        f"coalesce({column}, '')), '{weight}')"
+        for column, weight in weighted_columns
+    ]
+    return Computed(" || ".join(parts), persisted=True)
+
+
+def to_prefix_tsquery(term: str) -> Optional[str]:
+    """Turn free text into a tsquery matching every word as a prefix
+
+    Returns None when the term contains no searchable words.
+    """
+    tokens = _TOKEN_RE.findall(term.lower())
+    if not tokens:
+        return None
+    return " & ".join(f"{token}:*" for token in tokens)
+
+
+def apply_search(query: Query, model, term: Optional[str]) -> Query:
+    """Filter ``query`` to rows of ``model`` matching ``term``, best first
+
+    Without searchable words in ``term`` every row is kept, in id order, so
+    that limit/offset pages stay stable.
+    """
+    tsquery_text = to_prefix_tsquery(term or "")
+    if tsquery_text is None:
+        return query.order_by(model.id)
+    tsquery = func.to_tsquery(SEARCH_CONFIG, tsquery_text)
+    return query.filter(model.search_vector.op("@@")(tsquery)).order_by(
+        func.ts_rank_cd(model.search_vector, tsquery).desc(), model.id
+    )
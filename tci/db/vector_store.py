@@ -0,0 +1,494 @@
+"""Local vector store for company and job embeddings.
+
+:class:`LocalVectorStore` keeps one collection per directory:
+
+* ``vectors.bin`` - a memory-mapped ``capacity x dim`` matrix of unit-length
+  vectors, stored as float32, float16 or int8 (int8 rows carry a float32
+  scale each). The file grows by doubling, so appends are amortized O(1).
+* ``ids.npy``, ``live.npy`` - the external id and a live flag per row. Deletes
+  and replacements only clear the live flag (a tombstone); :meth:`compact`
+  rewrites the file without them.
+* ``ivf.npz`` - optional coarse partition built by :meth:`build_ivf`.
+
+Searches are exact cosine top-k by default, computed blockwise with one
+matrix product per block for a whole batch of queries. With an IVF partition
+only the rows in the ``n_probe`` lists closest to a query are scored, which
+trades a little recall for much less work on large collections.
+
+The public API (``upsert`` / ``delete`` / ``search`` / ``count``) mirrors the
+subset of Qdrant's client used here, so a Qdrant-backed
+:class:`VectorStore` can be dropped in behind :func:`get_vector_store`.
+"""
+
+import json
+import os
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Union
+
+import numpy as np
+
+from tci.core.config import settings
+
+DTYPES = {"float32": np.float32, "float16": np.float16, "int8": np.int8}
+INT8_MAX = 127
+
+
+class ScoredVector(NamedTuple):
+    id: int
+    score: float
+
+
+class VectorStore(ABC):
+    """Collection of fixed-size vectors addressed by integer ids"""
+
+    dim: int
+
+    @abstractmethod
+    def upsert(self, ids: Sequence[int], vectors: np.ndarray) -> None:
+        """Insert vectors, replacing any stored under the same ids"""
+
+    @abstractmethod
+    def delete(self, ids: Iterable[int]) -> int:
+        """Remove vectors by id, returning how many were stored"""
+
+    @abstractmethod
+    def search_batch(
+        self, queries: np.ndarray, limit: int = 10
+    ) -> List[List[ScoredVector]]:
+        """Top ``limit`` matches by cosine similarity for each query row"""
+
+    @abstractmethod
+    def count(self) -> int:
+        """Number of stored (non-deleted) vectors"""
+
+    def search(self, query: np.ndarray, limit: int = 10) -> List[ScoredVector]:
+        """Top ``limit`` matches by cosine similarity, best first"""
+        return self.search_batch(np.asarray(query).reshape(1, -1), limit)[0]
+
+    def flush(self) -> None:
+        """Persist pending changes"""
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self) -> "VectorStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    """Scale rows to unit length as float32; zero rows stay zero"""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if vectors.ndim == 1:
+        vectors = vectors.reshape(1, -1)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+def kmeans(
+    vectors: np.ndarray, n_clusters: int, iterations: int = 10, seed: int = 0
+) -> np.ndarray:
+    """Spherical k-means on unit vectors, returning unit-length centroids"""
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), n_clusters, replace=False)]
+    for _ in range(iterations):
+        assignment = np.argmax(vectors @ centroids.T, axis=1)
+        order = np.argsort(assignment, kind="stable")
+        counts = np.bincount(assignment, minlength=n_clusters)
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        sums = np.add.reduceat(vectors[order], np.minimum(starts, len(order) - 1))
+        # reduceat returns a single row for empty clusters; restart those from
+        # random points instead
+        empty = counts == 0
+        sums[empty] = vectors[rng.choice(len(vectors), int(empty.sum()))]
+        centroids = normalize(sums)
+    return centroids
+
+
+class LocalVectorStore(VectorStore):
+    """Memory-mapped vector collection with exact or IVF cosine search
+
+    Usage:
+        store = LocalVectorStore("/data/vectors/jobs", dim=384)
+        store.upsert([1, 2], embeddings)
+        store.search(query_embedding, limit=5)  # [ScoredVector(id=2, score=0.91), ...]
+        store.flush()
+
+    Args:
+        path: Collection directory, created if missing. None keeps the
+            collection in memory only.
+        dim: Vector size. Required for a new collection, checked against an
+            existing one.
+        dtype: "float32", "float16" or "int8"; fixed once the collection exists.
+        block_size: Rows scored per matrix product, bounding temporary memory.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Union[str, Path]] = None,
+        dim: Optional[int] = None,
+        dtype: str = "float32",
+        block_size: int = 65536,
+    ):
+        self.path = Path(path) if path is not None else None
+        self.block_size = block_size
+        self._lock = threading.RLock()
+
+        meta = self._read_meta()
+        if meta:
+            if dim is not None and dim != meta["dim"]:
+                raise ValueError(f"Collection has dimension {meta['dim']}, not {dim}")
+            dim, dtype = meta["dim"], meta["dtype"]
+        if dim is None:
+            raise ValueError("dim is required for a new collection")
+        if dtype not in DTYPES:
+            raise ValueError(f"Unknown dtype: {dtype}")
+
+        self.dim = dim
+        self.dtype = dtype
+        self._size = meta["size"] if meta else 0
+        self._vectors = self._open_vectors(meta["capacity"] if meta else 0)
+        if meta:
+            self._ids = np.load(self.path / "ids.npy")
+            self._live = np.load(self.path / "live.npy")
+            self._scales = np.load(self.path / "scales.npy")
+        else:
+            self._ids = np.zeros(len(self._vectors), dtype=np.int64)
+            self._live = np.zeros(len(self._vectors), dtype=bool)
+            self._scales = np.ones(len(self._vectors), dtype=np.float32)
+        self._slots: Dict[int, int] = {
+            int(id_): slot
+            for slot, id_ in enumerate(self._ids[: self._size])
+            if self._live[slot]
+        }
+
+        self._centroids: Optional[np.ndarray] = None
+        self._assignment: Optional[np.ndarray] = None
+        self._lists: Optional[List[np.ndarray]] = None
+        self.n_probe = 1
+        if self.path is not None and (self.path / "ivf.npz").exists():
+            with np.load(self.path / "ivf.npz") as ivf:
+                self._centroids = ivf["centroids"]
+                self._assignment = ivf["assignment"]
+                self.n_probe = int(ivf["n_probe"])
+
+    # -- storage ---------------------------------------------------------
+
+    def _read_meta(self) -> Optional[dict]:
+        if self.path is None or not (self.path / "meta.json").exists():
+            return None
+        return json.loads((self.path / "meta.json").read_text())
+
+    def _open_vectors(self, capacity: int) -> np.ndarray:
+        shape = (capacity, self.dim)
+        if self.path is None:
+            return np.zeros(shape, dtype=DTYPES[self.dtype])
+        self.path.mkdir(parents=True, exist_ok=True)
+        file = self.path / "vectors.bin"
+        if capacity == 0:
+            file.touch()
+            return np.zeros(shape, dtype=DTYPES[self.dtype])
+        itemsize = np.dtype(DTYPES[self.dtype]).itemsize
+        with open(file, "r+b") as f:
+            f.truncate(capacity * self.dim * itemsize)
+        return np.memmap(file, dtype=DTYPES[self.dtype], mode="r+", shape=shape)
+
+    def _reserve(self, rows: int) -> None:
+        """Grow the row capacity to at least ``rows``"""
+        capacity = len(self._vectors)
+        if rows <= capacity:
+            return
+        new_capacity = max(rows, 2 * capacity, 1024)
+        if isinstance(self._vectors, np.memmap):
+            self._vectors.flush()
+            del self._vectors
+            self._vectors = self._open_vectors(new_capacity)
+        elif self.path is not None:
+            # The collection was empty; its file is created on first growth
+            self._vectors = self._open_vectors(new_capacity)
+        else:
+            vectors = np.zeros((new_capacity, self.dim), dtype=DTYPES[self.dtype])
+            vectors[:capacity] = self._vectors
+            self._vectors = vectors
+
+        def grow(array: np.ndarray, fill) -> np.ndarray:
+            grown = np.full(new_capacity, fill, dtype=array.dtype)
+            grown[: len(array)] = array
+            return grown
+
+        self._ids = grow(self._ids, 0)
+        self._live = grow(self._live, False)
+        self._scales = grow(self._scales, 1.0)
+        if self._assignment is not None:
+            self._assignment = grow(self._assignment, -1)
+
+    def _encode(self, unit: np.ndarray):
+        """Convert unit vectors to the storage dtype, with per-row scales"""
+        if self.dtype == "int8":
+            peak = np.abs(unit).max(axis=1)
+            scales = np.where(peak == 0, 1, peak / INT8_MAX).astype(np.float32)
+            codes = np.rint(unit / scales[:, None]).astype(np.int8)
+            return codes, scales
+        return unit.astype(DTYPES[self.dtype]), np.ones(len(unit), dtype=np.float32)
+
+    def flush(self) -> None:
+        """Write the matrix, id map and partition to disk"""
+        if self.path is None:
+            return
+        with self._lock:
+            if isinstance(self._vectors, np.memmap):
+                self._vectors.flush()
+            np.save(self.path / "ids.npy", self._ids)
+            np.save(self.path / "live.npy", self._live)
+            np.save(self.path / "scales.npy", self._scales)
+            if self._centroids is not None:
+                np.savez(
+                    self.path / "ivf.npz",
+                    centroids=self._centroids,
+                    assignment=self._assignment,
+                    n_probe=self.n_probe,
+                )
+            elif (self.path / "ivf.npz").exists():
+                (self.path / "ivf.npz").unlink()
+
+            meta = {
+                "dim": self.dim,
+                "dtype": self.dtype,
+                "size": self._size,
+                "capacity": len(self._vectors),
+            }
+            # Write-then-rename so a crash never leaves half a meta file
+            tmp = self.path / "meta.json.tmp"
+            tmp.write_text(json.dumps(meta))
+            os.replace(tmp, self.path / "meta.json")
+
+    # -- writes ----------------------------------------------------------
+
+    def upsert(self, ids: Sequence[int], vectors: np.ndarray) -> None:
+        unit = normalize(vectors)
+        if unit.shape != (len(ids), self.dim):
+            raise ValueError(
+                f"Expected {len(ids)} vectors of dimension {self.dim}, "
+                f"got shape {np.shape(vectors)}"
+            )
+        codes, scales = self._encode(unit)
+
+        with self._lock:
+            self._delete(ids)
+            start, end = self._size, self._size + len(ids)
+            self._reserve(end)
+            self._vectors[start:end] = codes
+            self._scales[start:end] = scales
+            self._ids[start:end] = ids
+            self._live[start:end] = True
+            for offset, id_ in enumerate(ids):
+                self._slots[int(id_)] = start + offset
+            if self._centroids is not None:
+                self._assignment[start:end] = np.argmax(
+                    unit @ self._centroids.T, axis=1
+                )
+                self._lists = None
+            self._size = end
+
+    def delete(self, ids: Iterable[int]) -> int:
+        with self._lock:
+            return self._delete(ids)
+
+    def _delete(self, ids: Iterable[int]) -> int:
+        removed = 0
+        for id_ in ids:
+            slot = self._slots.pop(int(id_), None)
+            if slot is not None:
+                self._live[slot] = False
+                removed += 1
+        return removed
+
+    def compact(self) -> None:
+        """Rewrite the collection without tombstoned rows"""
+        with self._lock:
+            keep = np.flatnonzero(self._live[: self._size])
+            vectors = np.array(self._vectors[keep])
+            ids, scales = self._ids[keep], self._scales[keep]
+            assignment = (
+                self._assignment[keep] if self._assignment is not None else None
+            )
+
+            self._size = len(keep)
+            self._ids = ids.copy()
+            self._live = np.ones(len(keep), dtype=bool)
+            self._scales = scales.copy()
+            self._assignment = assignment
+            self._lists = None
+            if isinstance(self._vectors, np.memmap):
+                del self._vectors
+            self._vectors = self._open_vectors(len(keep))
+            self._vectors[:] = vectors
+            self._slots = {int(id_): slot for slot, id_ in enumerate(ids)}
+            self.flush()
+
+    # -- reads -----------------------------------------------------------
+
+    def count(self) -> int:
+        return len(self._slots)
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, id_: int) -> bool:
+        return int(id_) in self._slots
+
+    def get(self, id_: int) -> Optional[np.ndarray]:
+        """Stored (unit-length, dequantized) vector for an id"""
+        slot = self._slots.get(int(id_))
+        if slot is None:
+            return None
+        return self._vectors[slot].astype(np.float32) * self._scales[slot]
+
+    def _score_rows(self, rows: np.ndarray, queries: np.ndarray) -> np.ndarray:
+        """Cosine scores of stored ``rows`` (slot numbers or a slice) vs queries"""
+        block = np.asarray(self._vectors[rows], dtype=np.float32)
+        scores = block @ queries.T
+        if self.dtype == "int8":
+            scores *= self._scales[rows][:, None]
+        scores[~self._live[rows]] = -np.inf
+        return scores
+
+    @staticmethod
+    def _top_k(scores: np.ndarray, slots: np.ndarray, limit: int) -> tuple:
+        """Best ``limit`` (scores, slots) per column of a rows x queries matrix
+
+        ``slots`` holds the slot of each score row, either once per row or
+        per score as a matrix shaped like ``scores``.
+        """
+        if slots.ndim == 1:
+            slots = np.broadcast_to(slots[:, None], scores.shape)
+        if len(scores) > limit:
+            top = np.argpartition(-scores, limit - 1, axis=0)[:limit]
+            scores = np.take_along_axis(scores, top, axis=0)
+            slots = np.take_along_axis(slots, top, axis=0)
+        return scores, slots
+
+    def _collect(
+        self, scores: np.ndarray, slots: np.ndarray, limit: int
+    ) -> List[ScoredVector]:
+        order = np.lexsort((slots, -scores))[:limit]
+        return [
+            ScoredVector(int(self._ids[slot]), float(score))
+            for score, slot in zip(scores[order], slots[order])
+            if score != -np.inf
+        ]
+
+    def search_batch(
+        self, queries: np.ndarray, limit: int = 10
+    ) -> List[List[ScoredVector]]:
+        queries = normalize(queries)
+        if queries.shape[1] != self.dim:
+            raise ValueError(f"Expected queries of dimension {self.dim}")
+        with self._lock:
+            if limit <= 0 or not self._slots:
+                return [[] for _ in queries]
+            if self._centroids is not None:
+                return [self._search_ivf(query, limit) for query in queries]
+
+            best_scores = np.empty((0, len(queries)), dtype=np.float32)
+            best_slots = np.empty((0, len(queries)), dtype=np.int64)
+            for start in range(0, self._size, self.block_size):
+                end = min(start + self.block_size, self._size)
+                scores, slots = self._top_k(
+                    self._score_rows(slice(start, end), queries),
+                    np.arange(start, end),
+                    limit,
+                )
+                best_scores, best_slots = self._top_k(
+                    np.concatenate([best_scores, scores]),
+                    np.concatenate([best_slots, slots]),
+                    limit,
+                )
+            return [
+                self._collect(best_scores[:, i], best_slots[:, i], limit)
+                for i in range(len(queries))
+            ]
+
+    # -- IVF -------------------------------------------------------------
+
+    def build_ivf(
+        self,
+        n_lists: Optional[int] = None,
+        n_probe: Optional[int] = None,
+        sample_size: Optional[int] = None,
+        seed: int = 0,
+    ) -> None:
+        """Partition the collection into ``n_lists`` clusters for faster search
+
+        Defaults to roughly ``sqrt(count)`` lists, probing about a tenth of
+        them, with centroids trained on up to 64 vectors per list. Vectors
+        appended later are assigned to their nearest list; build again after
+        large changes to rebalance.
+        """
+        with self._lock:
+            live = np.flatnonzero(self._live[: self._size])
+            if len(live) == 0:
+                raise ValueError("Cannot partition an empty collection")
+            n_lists = min(n_lists or max(1, int(np.sqrt(len(live)))), len(live))
+            rng = np.random.default_rng(seed)
+            sample_size = sample_size or 64 * n_lists
+            sample = rng.choice(live, min(sample_size, len(live)), replace=False)
+            n_lists = min(n_lists, len(sample))
+            training = normalize(self._dequantize(np.sort(sample)))
+            self._centroids = kmeans(training, n_lists, seed=seed)
+            self.n_probe = n_probe or max(1, n_lists // 10)
+
+            self._assignment = np.full(len(self._vectors), -1, dtype=np.int32)
+            for start in range(0, self._size, self.block_size):
+                end = min(start + self.block_size, self._size)
+                block = self._dequantize(slice(start, end))
+                self._assignment[start:end] = np.argmax(
+                    block @ self._centroids.T, axis=1
+                )
+            self._lists = None
+
+    def drop_ivf(self) -> None:
+        """Go back to exact search"""
+        with self._lock:
+            self._centroids = self._assignment = self._lists = None
+
+    def _dequantize(self, rows) -> np.ndarray:
+        block = np.asarray(self._vectors[rows], dtype=np.float32)
+        if self.dtype == "int8":
+            block *= self._scales[rows][:, None]
+        return block
+
+    def _search_ivf(self, query: np.ndarray, limit: int) -> List[ScoredVector]:
+        if self._lists is None:
+            assignment = self._assignment[: self._size]
+            order = np.argsort(assignment, kind="stable")
+            bounds = np.searchsorted(
+                assignment[order], np.arange(len(self._centroids) + 1)
+            )
+            self._lists = [
+                order[bounds[i] : bounds[i + 1]] for i in range(len(self._centroids))
+            ]
+
+        n_probe = min(self.n_probe, len(self._centroids))
+        probes = np.argpartition(-(self._centroids @ query), n_probe - 1)[:n_probe]
+        slots = np.concatenate([self._lists[i] for i in probes])
+        if len(slots) == 0:
+            return []
+        scores, slots = self._top_k(
+            self._score_rows(slots, query[None, :]), slots, limit
+        )
+        return self._collect(scores[:, 0], slots[:, 0], limit)
+
+
+def get_vector_store(
+    collection: str, dim: Optional[int] = None, dtype: str = "float32"
+) -> VectorStore:
+    """Open a collection with the backend configured in ``settings``"""
+    backend = settings.VECTOR_STORE_BACKEND
+    if backend == "local":
+        return LocalVectorStore(settings.VECTOR_STORE_PATH / collection, dim, dtype)
+    raise ValueError(f"Unknown vector store backend: {backend}")
@@ -0,0 +1,203 @@
+"""Shared building blocks for the sparse feature builders.
+
+Rows are streamed from Postgres in chunks as DataFrames, so every
+transformation below works on whole columns at a time. Built feature sets are
+cached as ``.npz`` files next to a ``manifest.json`` describing each entry:
+its shape, the column range of every feature block, the builder parameters
+and a fingerprint of the source tables. A cached set is reused as long as
+the parameters and the fingerprint still match.
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+from sqlalchemy import func
+from sqlalchemy.orm import Query, Session
+
+from tci.core.config import settings
+
+MANIFEST = "manifest.json"
+
+
+@dataclass
+class FeatureSet:
+    """A sparse feature matrix with one row per entity id"""
+
+    name: str
+    ids: np.ndarray
+    matrix: sparse.csr_matrix
+    # Feature block name -> (first column, end column)
+    blocks: Dict[str, Tuple[int, int]] = field(default_factory=dict)
+    # One-hot block name -> category of each column
+    vocabularies: Dict[str, List[str]] = field(default_factory=dict)
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.matrix.shape
+
+    def block(self, name: str) -> sparse.csr_matrix:
+        start, end = self.blocks[name]
+        return self.matrix[:, start:end]
+
+
+def stack_blocks(
+    name: str,
+    ids: np.ndarray,
+    blocks: Sequence[Tuple[str, sparse.spmatrix]],
+    vocabularies: Optional[Dict[str, List[str]]] = None,
+) -> FeatureSet:
+    """Join feature blocks side by side, recording their column ranges"""
+    ranges: Dict[str, Tuple[int, int]] = {}
+    start = 0
+    for block_name, matrix in blocks:
+        ranges[block_name] = (start, start + matrix.shape[1])
+        start += matrix.shape[1]
+    matrix = sparse.hstack([matrix for _, matrix in blocks], format="csr")
+    return FeatureSet(name, ids, matrix, ranges, vocabularies or {})
+
+
+def concat_ids(chunks: List[np.ndarray]) -> np.ndarray:
+    return np.concatenate(chunks) if chunks else np.empty(0, dtype=np.int64)
+
+
+def stream_frames(
+    session: Session, query: Query, chunk_size: int = 10000
+) -> Iterator[pd.DataFrame]:
+    """Read a query in chunks over a server-side cursor"""
+    result = session.execute(
+        query.statement,
+        execution_options={"stream_results": True, "max_row_buffer": chunk_size},
+    )
+    columns = list(result.keys())
+    for rows in result.partitions(chunk_size):
+        yield pd.DataFrame.from_records(rows, columns=columns)
+
+
+def text_column(frame: pd.DataFrame, *columns: str) -> pd.Series:
+    """Join text columns with spaces, treating NULL as empty"""
+    text = frame[columns[0]].fillna("").astype(str)
+    for column in columns[1:]:
+        text = text + " " + frame[column].fillna("").astype(str)
+    return text
+
+
+def hashed_counts(n_features: int) -> HashingVectorizer:
+    """Stateless term-count vectorizer, so chunks can be encoded independently"""
+    return HashingVectorizer(
+        n_features=n_features, alternate_sign=False, norm=None, dtype=np.float32
+    )
+
+
+def tfidf(chunks: List[sparse.spmatrix], n_features: int) -> sparse.csr_matrix:
+    """TF-IDF weighting over the whole corpus, applied after all chunks are read"""
+    if not chunks:
+        return sparse.csr_matrix((0, n_features), dtype=np.float32)
+    counts = sparse.vstack(chunks, format="csr")
+    return TfidfTransformer(sublinear_tf=True).fit_transform(counts).astype(np.float32)
+
+
+def one_hot(values: Sequence[Optional[str]]) -> Tuple[sparse.csr_matrix, List[str]]:
+    """Encode categories as a one-hot matrix; NULL and empty values get no column"""
+    values = pd.Series(values, dtype=object).fillna("").astype(str).str.strip()
+    codes, categories = pd.factorize(values, sort=True)
+    present = values.to_numpy() != ""
+    # Drop the empty category and shift the codes after it down by one
+    empty = np.flatnonzero(categories == "")
+    if len(empty):
+        codes = codes - (codes > empty[0])
+        categories = categories.delete(empty[0])
+    rows = np.flatnonzero(present)
+    matrix = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.float32), (rows, codes[present])),
+        shape=(len(values), len(categories)),
+    )
+    return matrix, list(categories)
+
+
+def count_column(counts: np.ndarray) -> sparse.csr_matrix:
+    """Single log-scaled count feature"""
+    return sparse.csr_matrix(np.log1p(counts.astype(np.float32)).reshape(-1, 1))
+
+
+def lookup_counts(ids: np.ndarray, keys: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Count for every id, 0 where ``keys`` does not contain it"""
+    if len(keys) == 0:
+        return np.zeros(len(ids), dtype=np.int64)
+    order = np.argsort(keys)
+    keys, counts = keys[order], counts[order]
+    positions = np.clip(np.searchsorted(keys, ids), 0, len(keys) - 1)
+    return np.where(keys[positions] == ids, counts[positions], 0)
+
+
+def table_fingerprint(session: Session, *models) -> Dict[str, Optional[str]]:
+    """Row count, id sum and latest update per table, to detect stale caches"""
+    fingerprint = {}
+    for model in models:
+        count, id_sum, latest = session.query(
+            func.count(model.id), func.sum(model.id), func.max(model.updated_at)
+        ).one()
+        fingerprint[model.__tablename__] = (
+            f"{count}:{id_sum}:{latest and latest.isoformat()}"
+        )
+    return fingerprint
+
+
+class FeatureCache:
+    """Directory of ``.npz`` feature sets described by a JSON manifest"""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path or settings.FEATURE_CACHE_PATH)
+
+    @property
+    def manifest(self) -> Dict[str, dict]:
+        file = self.path / MANIFEST
+        return json.loads(file.read_text()) if file.exists() else {}
+
+    @staticmethod
+    def key(params: dict, fingerprint: dict) -> str:
+        payload = json.dumps([params, fingerprint], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+    def load(self, name: str, params: dict, fingerprint: dict) -> Optional[FeatureSet]:
+        """Cached feature set, or None if missing or built from other inputs"""
+        entry = self.manifest.get(name)
+        if not entry or entry["key"] != self.key(params, fingerprint):
+            return None
+        try:
+            matrix = sparse.load_npz(self.path / entry["matrix"]).tocsr()
+            ids = np.load(self.path / entry["ids"])
+        except FileNotFoundError:
+            return None
+        blocks = {block: tuple(bounds) for block, bounds in entry["blocks"].items()}
+        return FeatureSet(name, ids, matrix, blocks, entry["vocabularies"])
+
+    def save(self, features: FeatureSet, params: dict, fingerprint: dict) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        sparse.save_npz(self.path / f"{features.name}.npz", features.matrix)
+        np.save(self.path / f"{features.name}.ids.npy", features.ids)
+
+        manifest = self.manifest
+        manifest[features.name] = {
+            "key": self.key(params, fingerprint),
+            "matrix": f"{features.name}.npz",
+            "ids": f"{features.name}.ids.npy",
+            "shape": list(features.shape),
+            "nnz": int(features.matrix.nnz),
+            "blocks": {name: list(bounds) for name, bounds in features.blocks.items()},
+            "vocabularies": features.vocabularies,
+            "params": params,
+            "fingerprint": fingerprint,
+            "created_at": datetime.utcnow().isoformat(),
+        }
+        tmp = self.path / f"{MANIFEST}.tmp"
+        tmp.write_text(json.dumps(manifest, indent=2, default=str))
+        os.replace(tmp, self.path / MANIFEST)
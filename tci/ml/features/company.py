@@ -0,0 +1,81 @@
+"""Sparse company features: TF-IDF of name and description plus job counts."""
+
+from typing import Optional
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from tci.db.models import Company, Job
+from tci.db.postgresql import db
+from tci.ml.features.base import (
+    FeatureCache,
+    FeatureSet,
+    concat_ids,
+    count_column,
+    hashed_counts,
+    lookup_counts,
+    stack_blocks,
+    stream_frames,
+    table_fingerprint,
+    text_column,
+    tfidf,
+)
+
+FEATURE_SET = "companies"
+FEATURES_VERSION = 1
+
+
+def build_company_features(
+    session: Optional[Session] = None,
+    cache: Optional[FeatureCache] = None,
+    n_features: int = 2**18,
+    chunk_size: int = 10000,
+    use_cache: bool = True,
+) -> FeatureSet:
+    """Build (or load from the cache) one feature row per company, ordered by id
+
+    Blocks:
+        text: TF-IDF of the hashed name and description terms
+        job_count: log(1 + number of jobs at the company)
+    """
+    if session is None:
+        with db.session_scope() as session:
+            return build_company_features(
+                session, cache, n_features, chunk_size, use_cache
+            )
+
+    cache = cache or FeatureCache()
+    params = {"n_features": n_features, "version": FEATURES_VERSION}
+    fingerprint = table_fingerprint(session, Company, Job)
+    if use_cache:
+        cached = cache.load(FEATURE_SET, params, fingerprint)
+        if cached is not None:
+            return cached
+
+    vectorizer = hashed_counts(n_features)
+    ids, counts = [], []
+    query = session.query(Company.id, Company.name, Company.description).order_by(
+        Company.id
+    )
+    for frame in stream_frames(session, query, chunk_size):
+        ids.append(frame["id"].to_numpy(dtype=np.int64))
+        counts.append(vectorizer.transform(text_column(frame, "name", "description")))
+    ids = concat_ids(ids)
+
+    job_counts = np.array(
+        session.query(Job.company_id, func.count(Job.id))
+        .filter(Job.company_id.isnot(None))
+        .group_by(Job.company_id)
+        .all(),
+        dtype=np.int64,
+    ).reshape(-1, 2)
+    per_company = lookup_counts(ids, job_counts[:, 0], job_counts[:, 1])
+
+    features = stack_blocks(
+        FEATURE_SET,
+        ids,
+        [("text", tfidf(counts, n_features)), ("job_count", count_column(per_company))],
+    )
+    cache.save(features, params, fingerprint)
+    return features
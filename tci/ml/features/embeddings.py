@@ -0,0 +1,296 @@
+"""Incremental embedding pipeline for companies and jobs.
+
+Each run reads only the rows updated since the previous run (or every row
+with ``full=True``), hashes the text that would be embedded and skips rows
+whose hash is unchanged. Vectors are cached by content hash, so a text that
+was encoded before - for the same row or any other - is never encoded again;
+only genuinely new texts reach the encoder, in batches sorted by length to
+keep padding (and therefore work) to a minimum.
+
+Output per encoder, under ``settings.VECTOR_STORE_PATH / "embeddings"``:
+
+* ``<encoder>/content`` - vector store keyed by content hash
+* ``<encoder>/<kind>`` - vector store keyed by company or job id, for
+  similarity search
+* ``<encoder>/<kind>/state.json`` - the updated_at watermark and the content
+  hash last embedded for every row
+"""
+
+import hashlib
+import json
+import os
+import time
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from tci.core.config import settings
+from tci.core.utils import batched
+from tci.data.processors.text import tokenize
+from tci.db.models import Company, Job
+from tci.db.postgresql import db
+from tci.db.vector_store import LocalVectorStore, normalize
+
+
+class Encoder(ABC):
+    """Turns texts into fixed-size vectors"""
+
+    name: str
+    dim: int
+
+    @abstractmethod
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        """Return a ``len(texts) x dim`` float32 matrix"""
+
+
+class HashingEncoder(Encoder):
+    """Deterministic feature-hashing encoder for offline use and tests
+
+    Words and word bigrams are hashed into ``dim`` signed buckets, so similar
+    texts get similar vectors without any model download.
+    """
+
+    def __init__(self, dim: int = 256):
+        self.dim = dim
+        self.name = f"hashing-{dim}"
+
+    def _bucket(self, feature: str) -> Tuple[int, float]:
+        digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+        value = int.from_bytes(digest, "little")
+        return value % self.dim, 1.0 if value >> 63 else -1.0
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            tokens = tokenize(text)
+            bigrams = [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+            for feature in tokens + bigrams:
+                bucket, sign = self._bucket(feature)
+                vectors[row, bucket] += sign
+        return normalize(vectors)
+
+
+class SentenceTransformerEncoder(Encoder):
+    """Encoder backed by a sentence-transformers model"""
+
+    def __init__(self, model_name: Optional[str] = None, device: Optional[str] = None):
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            raise ImportError(
+                "sentence-transformers is required for model embeddings; "
+                "set EMBEDDING_MODEL=hashing to embed without it"
+            ) from e
+        self.name = model_name or settings.EMBEDDING_MODEL
+        self.model = SentenceTransformer(self.name, device=device)
+        self.dim = self.model.get_sentence_embedding_dimension()
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        return self.model.encode(
+            list(texts), convert_to_numpy=True, normalize_embeddings=True
+        ).astype(np.float32)
+
+
+def get_encoder(name: Optional[str] = None) -> Encoder:
+    """Encoder for ``settings.EMBEDDING_MODEL``; "hashing" needs no model"""
+    name = name or settings.EMBEDDING_MODEL
+    if name == "hashing":
+        return HashingEncoder()
+    return SentenceTransformerEncoder(name)
+
+
+def company_text(name: str, description: Optional[str]) -> str:
+    return f"{name}. {description or ''}".strip()
+
+
+def job_text(title: str, location: Optional[str], description: Optional[str]) -> str:
+    return ". ".join(part for part in (title, location, description) if part)
+
+
+@dataclass(frozen=True)
+class EmbeddingSource:
+    model: type
+    columns: Tuple[str, ...]
+    text: Callable[..., str]
+
+
+SOURCES: Dict[str, EmbeddingSource] = {
+    "companies": EmbeddingSource(Company, ("name", "description"), company_text),
+    "jobs": EmbeddingSource(Job, ("title", "location", "description"), job_text),
+}
+
+
+def content_hash(text: str) -> int:
+    """Stable 64-bit hash of the text, used as the content cache key"""
+    digest = hashlib.sha256(text.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big", signed=True)
+
+
+@dataclass
+class EmbeddingStats:
+    """Outcome of one pipeline run"""
+
+    scanned: int = 0
+    unchanged: int = 0
+    reused: int = 0
+    encoded: int = 0
+    removed: int = 0
+    seconds: float = 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        return asdict(self)
+
+
+class EmbeddingPipeline:
+    """Keeps company and job embeddings in sync with the database
+
+    Usage:
+        pipeline = EmbeddingPipeline()
+        pipeline.run("jobs")  # EmbeddingStats(scanned=120, encoded=3, ...)
+        pipeline.store("jobs").search(query_vector, limit=10)
+    """
+
+    def __init__(
+        self,
+        encoder: Optional[Encoder] = None,
+        path: Optional[Path] = None,
+        batch_size: Optional[int] = None,
+        chunk_size: int = 5000,
+    ):
+        self.encoder = encoder or get_encoder()
+        root = Path(path or settings.VECTOR_STORE_PATH / "embeddings")
+        self.path = root / self.encoder.name.replace("/", "_")
+        self.batch_size = batch_size or settings.EMBEDDING_BATCH_SIZE
+        self.chunk_size = chunk_size
+        self.content = LocalVectorStore(self.path / "content", self.encoder.dim)
+        self._stores: Dict[str, LocalVectorStore] = {}
+
+    def store(self, kind: str) -> LocalVectorStore:
+        """Vectors keyed by company or job id"""
+        if kind not in self._stores:
+            self._stores[kind] = LocalVectorStore(self.path / kind, self.encoder.dim)
+        return self._stores[kind]
+
+    def _read_state(self, kind: str) -> Tuple[Optional[datetime], Dict[int, int]]:
+        file = self.path / kind / "state.json"
+        if not file.exists():
+            return None, {}
+        state = json.loads(file.read_text())
+        watermark = state["watermark"] and datetime.fromisoformat(state["watermark"])
+        return watermark, {int(id_): hash_ for id_, hash_ in state["hashes"].items()}
+
+    def _write_state(
+        self, kind: str, watermark: Optional[datetime], hashes: Dict[int, int]
+    ) -> None:
+        file = self.path / kind / "state.json"
+        file.parent.mkdir(parents=True, exist_ok=True)
+        state = {
+            "watermark": watermark.isoformat() if watermark else None,
+            "hashes": hashes,
+        }
+        tmp = file.with_suffix(".tmp")
+        tmp.write_text(json.dumps(state))
+        os.replace(tmp, file)
+
+    def _encode(self, texts: Dict[int, str]) -> Dict[int, np.ndarray]:
+        """Encode texts keyed by content hash, shortest first"""
+        ordered = sorted(texts.items(), key=lambda item: len(item[1]))
+        vectors: Dict[int, np.ndarray] = {}
+        for batch in batched(ordered, self.batch_size):
+            encoded = self.encoder.encode([text for _, text in batch])
+            vectors.update(zip((key for key, _ in batch), encoded))
+        return vectors
+
+    def _process_chunk(
+        self,
+        kind: str,
+        rows: List[tuple],
+        hashes: Dict[int, int],
+        stats: EmbeddingStats,
+    ) -> None:
+        source = SOURCES[kind]
+        changed: List[Tuple[int, int]] = []
+        missing: Dict[int, str] = {}
+        for id_, _, *values in rows:
+            text = source.text(*values)
+            key = content_hash(text)
+            if hashes.get(id_) == key:
+                stats.unchanged += 1
+                continue
+            changed.append((id_, key))
+            if key not in self.content and key not in missing:
+                missing[key] = text
+
+        if not changed:
+            return
+        encoded = self._encode(missing)
+        if encoded:
+            self.content.upsert(list(encoded), np.stack(list(encoded.values())))
+        stats.encoded += len(encoded)
+        stats.reused += len(changed) - len(encoded)
+
+        vectors = np.stack(
+            [
+                encoded[key] if key in encoded else self.content.get(key)
+                for _, key in changed
+            ]
+        )
+        self.store(kind).upsert([id_ for id_, _ in changed], vectors)
+        hashes.update(changed)
+
+    def run(
+        self, kind: str, session: Optional[Session] = None, full: bool = False
+    ) -> EmbeddingStats:
+        """Embed new and changed rows of ``kind`` ("companies" or "jobs")
+
+        Only rows updated since the last run are read unless ``full`` is set;
+        either way a row is re-embedded only if its text hash changed. Rows
+        deleted from the database are dropped from the id-keyed store.
+        """
+        if session is None:
+            with db.session_scope() as session:
+                return self.run(kind, session, full)
+
+        source = SOURCES[kind]
+        model = source.model
+        stats = EmbeddingStats()
+        started = time.monotonic()
+        watermark, hashes = self._read_state(kind)
+
+        query = session.query(
+            model.id,
+            model.updated_at,
+            *(getattr(model, column) for column in source.columns),
+        )
+        if watermark is not None and not full:
+            # >= so rows sharing the watermark timestamp are not missed; their
+            # unchanged hash makes the overlap free
+            query = query.filter(model.updated_at >= watermark)
+
+        new_watermark = watermark
+        for chunk in batched(query.yield_per(self.chunk_size), self.chunk_size):
+            stats.scanned += len(chunk)
+            latest = max((row[1] for row in chunk if row[1]), default=None)
+            if latest and (new_watermark is None or latest > new_watermark):
+                new_watermark = latest
+            self._process_chunk(kind, chunk, hashes, stats)
+
+        existing = {id_ for id_, in session.query(model.id)}
+        removed = [id_ for id_ in hashes if id_ not in existing]
+        stats.removed = self.store(kind).delete(removed)
+        for id_ in removed:
+            del hashes[id_]
+
+        self.content.flush()
+        self.store(kind).flush()
+        self._write_state(kind, new_watermark, hashes)
+        stats.seconds = time.monotonic() - started
+        return stats
+
+    def run_all(self, full: bool = False) -> Dict[str, EmbeddingStats]:
+        return {kind: self.run(kind, full=full) for kind in SOURCES}
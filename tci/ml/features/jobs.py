@@ -0,0 +1,113 @@
+"""Sparse job features: TF-IDF text blocks, one-hot categories, company size."""
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from sqlalchemy.orm import Session
+
+from tci.db.models import Job
+from tci.db.postgresql import db
+from tci.ml.features.base import (
+    FeatureCache,
+    FeatureSet,
+    concat_ids,
+    count_column,
+    hashed_counts,
+    one_hot,
+    stack_blocks,
+    stream_frames,
+    table_fingerprint,
+    text_column,
+    tfidf,
+)
+
+FEATURE_SET = "jobs"
+FEATURES_VERSION = 1
+
+
+def build_job_features(
+    session: Optional[Session] = None,
+    cache: Optional[FeatureCache] = None,
+    title_features: int = 2**16,
+    description_features: int = 2**18,
+    chunk_size: int = 10000,
+    use_cache: bool = True,
+) -> FeatureSet:
+    """Build (or load from the cache) one feature row per job, ordered by id
+
+    Blocks:
+        title, description: TF-IDF of hashed terms
+        job_type, location: one-hot, see ``FeatureSet.vocabularies``
+        company_job_count: log(1 + number of jobs at the same company)
+    """
+    if session is None:
+        with db.session_scope() as session:
+            return build_job_features(
+                session,
+                cache,
+                title_features,
+                description_features,
+                chunk_size,
+                use_cache,
+            )
+
+    cache = cache or FeatureCache()
+    params = {
+        "title_features": title_features,
+        "description_features": description_features,
+        "version": FEATURES_VERSION,
+    }
+    fingerprint = table_fingerprint(session, Job)
+    if use_cache:
+        cached = cache.load(FEATURE_SET, params, fingerprint)
+        if cached is not None:
+            return cached
+
+    titles, descriptions = hashed_counts(title_features), hashed_counts(
+        description_features
+    )
+    ids, company_ids, job_types, locations = [], [], [], []
+    title_counts, description_counts = [], []
+    query = session.query(
+        Job.id, Job.company_id, Job.title, Job.description, Job.job_type, Job.location
+    ).order_by(Job.id)
+    for frame in stream_frames(session, query, chunk_size):
+        ids.append(frame["id"].to_numpy(dtype=np.int64))
+        company_ids.append(frame["company_id"].fillna(-1).to_numpy(dtype=np.int64))
+        job_types.append(frame["job_type"])
+        locations.append(frame["location"])
+        title_counts.append(titles.transform(text_column(frame, "title")))
+        description_counts.append(
+            descriptions.transform(text_column(frame, "description"))
+        )
+    ids, company_ids = concat_ids(ids), concat_ids(company_ids)
+
+    job_type_matrix, job_type_vocabulary = one_hot(_concat_values(job_types))
+    location_matrix, location_vocabulary = one_hot(_concat_values(locations))
+
+    # Jobs per company, broadcast back to every job; jobs without a company
+    # count as a company of one
+    _, inverse, sizes = np.unique(company_ids, return_inverse=True, return_counts=True)
+    company_job_count = np.where(company_ids >= 0, sizes[inverse], 1)
+
+    features = stack_blocks(
+        FEATURE_SET,
+        ids,
+        [
+            ("title", tfidf(title_counts, title_features)),
+            ("description", tfidf(description_counts, description_features)),
+            ("job_type", job_type_matrix),
+            ("location", location_matrix),
+            ("company_job_count", count_column(company_job_count)),
+        ],
+        vocabularies={"job_type": job_type_vocabulary, "location": location_vocabulary},
+    )
+    cache.save(features, params, fingerprint)
+    return features
+
+
+def _concat_values(chunks) -> pd.Series:
+    if not chunks:
+        return pd.Series([], dtype=object)
+    return pd.concat(chunks, ignore_index=True)
@@ -0,0 +1,352 @@
+"""Cached, parallel training pipelines.
+
+A :class:`Pipeline` is an ordered list of :class:`Stage` functions. Every
+stage's output (its *artifact*) is stored under ``cache_dir`` keyed by a hash
+of the stage definition, its parameters and the content hashes of the
+artifacts it consumes. Re-running a pipeline therefore only recomputes
+stages whose inputs actually changed: a new job posting changes the loaded
+features and everything downstream, while a rerun on unchanged data loads
+every stage from disk.
+
+Source stages (those reading the database) declare a ``fingerprint`` so a
+cheap query decides whether they need to run at all.
+
+:func:`job_type_pipeline` is the concrete pipeline used by
+``scripts/train_models.py``: it predicts a job's type (full-time, part-time,
+...) from the sparse job features, choosing the regularization strength by
+cross-validation with folds and candidates spread over a process pool.
+"""
+
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from itertools import product
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import joblib
+import numpy as np
+from sklearn.base import clone
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score, f1_score
+from sklearn.model_selection import StratifiedKFold, train_test_split
+
+from tci.core.config import settings
+from tci.db.models import Job
+from tci.db.postgresql import db
+from tci.ml.features.base import table_fingerprint
+from tci.ml.features.jobs import build_job_features
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Stage:
+    """One step of a pipeline
+
+    Args:
+        name: Unique name, also how downstream stages refer to the output.
+        func: Called as ``func(**upstream_artifacts, **params, **options)``.
+        inputs: Names of the stages whose artifacts ``func`` receives.
+        params: Hyperparameters; part of the cache key.
+        options: Runtime settings such as worker counts; not part of the key.
+        fingerprint: For source stages, returns a summary of the external
+            data the stage reads (e.g. row counts), so the cache notices when
+            that data changes.
+        version: Bump to invalidate cached artifacts after changing ``func``.
+    """
+
+    name: str
+    func: Callable[..., Any]
+    inputs: Tuple[str, ...] = ()
+    params: Dict[str, Any] = field(default_factory=dict)
+    options: Dict[str, Any] = field(default_factory=dict)
+    fingerprint: Optional[Callable[[], Any]] = None
+    version: int = 1
+
+
+@dataclass
+class StageTiming:
+    name: str
+    seconds: float
+    cached: bool
+    key: str
+
+
+@dataclass
+class PipelineResult:
+    artifacts: Dict[str, Any]
+    timings: List[StageTiming]
+
+    def summary(self) -> str:
+        lines = []
+        for timing in self.timings:
+            source = "cached" if timing.cached else "ran"
+            lines.append(f"{timing.name:<16} {source:<7} {timing.seconds:8.2f}s")
+        return "\n".join(lines)
+
+
+class Pipeline:
+    """Runs stages in order, reusing cached artifacts whose inputs are unchanged
+
+    Usage:
+        pipeline = Pipeline("demo", [
+            Stage("load", load_data, fingerprint=data_version),
+            Stage("fit", fit_model, inputs=("load",), params={"C": 1.0}),
+        ])
+        result = pipeline.run()
+        result.artifacts["fit"], result.summary()
+    """
+
+    def __init__(
+        self, name: str, stages: Sequence[Stage], cache_dir: Optional[Path] = None
+    ):
+        names = [stage.name for stage in stages]
+        if len(set(names)) != len(names):
+            raise ValueError("Stage names must be unique")
+        for index, stage in enumerate(stages):
+            missing = set(stage.inputs) - set(names[:index])
+            if missing:
+                raise ValueError(
+                    f"Stage {stage.name!r} uses {sorted(missing)} before they run"
+                )
+        self.name = name
+        self.stages = list(stages)
+        self.cache_dir = Path(cache_dir or settings.MODEL_PATH / "cache") / name
+
+    def _key(self, stage: Stage, input_hashes: Dict[str, str]) -> str:
+        fingerprint = stage.fingerprint() if stage.fingerprint else None
+        return joblib.hash(
+            [
+                stage.name,
+                stage.version,
+                f"{stage.func.__module__}.{stage.func.__qualname__}",
+                stage.params,
+                input_hashes,
+                fingerprint,
+            ]
+        )
+
+    def run(self, force: Sequence[str] = ()) -> PipelineResult:
+        """Run the pipeline; stages named in ``force`` ignore their cache"""
+        artifacts: Dict[str, Any] = {}
+        hashes: Dict[str, str] = {}
+        timings: List[StageTiming] = []
+
+        for stage in self.stages:
+            started = time.perf_counter()
+            key = self._key(stage, {name: hashes[name] for name in stage.inputs})
+            path = self.cache_dir / stage.name / f"{key}.joblib"
+
+            cached = path.exists() and stage.name not in force
+            if cached:
+                artifact, content_hash = joblib.load(path)
+            else:
+                artifact = stage.func(
+                    **{name: artifacts[name] for name in stage.inputs},
+                    **stage.params,
+                    **stage.options,
+                )
+                # Downstream keys use the content, not this stage's key, so a
+                # rerun that produces identical output keeps them cached
+                content_hash = joblib.hash(artifact)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_suffix(".tmp")
+                joblib.dump((artifact, content_hash), tmp)
+                os.replace(tmp, path)
+
+            artifacts[stage.name] = artifact
+            hashes[stage.name] = content_hash
+            timing = StageTiming(stage.name, time.perf_counter() - started, cached, key)
+            timings.append(timing)
+            logger.info(
+                "%s/%s %s in %.2fs",
+                self.name,
+                stage.name,
+                "loaded" if cached else "ran",
+                timing.seconds,
+            )
+
+        return PipelineResult(artifacts, timings)
+
+
+# Cross-validation on a process pool. The training data is sent to each
+# worker once, through the pool initializer, instead of with every task.
+
+_worker_data: Dict[str, Any] = {}
+
+
+def _init_worker(X, y) -> None:
+    _worker_data["X"], _worker_data["y"] = X, y
+
+
+def _fit_fold(
+    estimator, params: Dict[str, Any], train: np.ndarray, test: np.ndarray
+) -> float:
+    X, y = _worker_data["X"], _worker_data["y"]
+    model = clone(estimator).set_params(**params)
+    model.fit(X[train], y[train])
+    return f1_score(y[test], model.predict(X[test]), average="macro")
+
+
+def cross_validate_candidates(
+    estimator,
+    candidates: Sequence[Dict[str, Any]],
+    X,
+    y: np.ndarray,
+    n_splits: int = 5,
+    n_jobs: Optional[int] = None,
+    seed: int = 0,
+) -> List[Dict[str, Any]]:
+    """Mean macro-F1 of every candidate parameter set over stratified folds
+
+    Each (candidate, fold) pair is a separate task on a process pool.
+    """
+    folds = list(
+        StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=seed).split(
+            np.zeros(len(y)), y
+        )
+    )
+    tasks = list(product(range(len(candidates)), folds))
+    with ProcessPoolExecutor(
+        max_workers=n_jobs, initializer=_init_worker, initargs=(X, y)
+    ) as pool:
+        futures = [
+            pool.submit(_fit_fold, estimator, candidates[index], train, test)
+            for index, (train, test) in tasks
+        ]
+        scores = [future.result() for future in futures]
+
+    results = []
+    for index, candidate in enumerate(candidates):
+        fold_scores = scores[index * len(folds) : (index + 1) * len(folds)]
+        results.append(
+            {
+                "params": candidate,
+                "mean_score": float(np.mean(fold_scores)),
+                "std_score": float(np.std(fold_scores)),
+            }
+        )
+    return results
+
+
+# Job type model
+
+
+def load_job_type_data(min_class_size: int = 5) -> Dict[str, Any]:
+    """Job features and job type labels, minus classes under ``min_class_size``"""
+    with db.session_scope() as session:
+        features = build_job_features(session)
+        labels = dict(
+            session.query(Job.id, Job.job_type).filter(Job.job_type.isnot(None))
+        )
+
+    y = np.array([labels.get(int(id_)) or "" for id_ in features.ids], dtype=object)
+    # job_type is the target, so its one-hot block must not be a feature
+    start, end = features.blocks["job_type"]
+    keep = np.r_[0:start, end : features.shape[1]]
+    X = features.matrix[:, keep]
+
+    classes, counts = np.unique(y[y != ""], return_counts=True)
+    usable = np.isin(y, classes[counts >= min_class_size])
+    if len(np.unique(y[usable])) < 2:
+        raise ValueError("Not enough labelled jobs to train a job type model")
+    return {"X": X[usable], "y": y[usable].astype(str), "ids": features.ids[usable]}
+
+
+def job_type_fingerprint() -> Dict[str, Optional[str]]:
+    """Fingerprint of the jobs table, which invalidates the cached data load"""
+    with db.session_scope() as session:
+        return table_fingerprint(session, Job)
+
+
+def split_data(
+    load: Dict[str, Any], test_size: float = 0.2, seed: int = 0
+) -> Dict[str, np.ndarray]:
+    indices = np.arange(len(load["y"]))
+    train, test = train_test_split(
+        indices, test_size=test_size, random_state=seed, stratify=load["y"]
+    )
+    return {"train": np.sort(train), "test": np.sort(test)}
+
+
+def search_job_type_model(
+    load: Dict[str, Any],
+    split: Dict[str, np.ndarray],
+    C: Sequence[float] = (0.1, 1.0, 10.0),
+    n_splits: int = 5,
+    seed: int = 0,
+    n_jobs: Optional[int] = None,
+) -> Dict[str, Any]:
+    X, y = load["X"][split["train"]], load["y"][split["train"]]
+    _, counts = np.unique(y, return_counts=True)
+    n_splits = max(2, min(n_splits, int(counts.min())))
+    estimator = LogisticRegression(max_iter=1000, class_weight="balanced")
+
+    results = cross_validate_candidates(
+        estimator,
+        [{"C": value} for value in C],
+        X,
+        y,
+        n_splits=n_splits,
+        n_jobs=n_jobs,
+        seed=seed,
+    )
+    best = max(results, key=lambda result: result["mean_score"])
+    model = clone(estimator).set_params(**best["params"]).fit(X, y)
+    return {"model": model, "cv_results": results, "best_params": best["params"]}
+
+
+def evaluate_job_type_model(
+    load: Dict[str, Any], split: Dict[str, np.ndarray], search: Dict[str, Any]
+) -> Dict[str, float]:
+    X, y = load["X"][split["test"]], load["y"][split["test"]]
+    predicted = search["model"].predict(X)
+    return {
+        "accuracy": float(accuracy_score(y, predicted)),
+        "macro_f1": float(f1_score(y, predicted, average="macro")),
+        "test_size": int(len(y)),
+    }
+
+
+def job_type_pipeline(
+    n_jobs: Optional[int] = None, cache_dir: Optional[Path] = None
+) -> Pipeline:
+    return Pipeline(
+        "job_type",
+        [
+            Stage("load", load_job_type_data, fingerprint=job_type_fingerprint),
+            Stage("split", split_data, inputs=("load",)),
+            Stage(
+                "search",
+                search_job_type_model,
+                inputs=("load", "split"),
+                options={"n_jobs": n_jobs},
+            ),
+            Stage(
+                "evaluate", evaluate_job_type_model, inputs=("load", "split", "search")
+            ),
+        ],
+        cache_dir,
+    )
+
+
+def save_model(
+    name: str, result: PipelineResult, model_path: Optional[Path] = None
+) -> Path:
+    """Write the fitted model and a JSON report under ``settings.MODEL_PATH``"""
+    model_path = Path(model_path or settings.MODEL_PATH)
+    model_path.mkdir(parents=True, exist_ok=True)
+    search = result.artifacts["search"]
+    joblib.dump(search["model"], model_path / f"{name}.joblib")
+    report = {
+        "best_params": search["best_params"],
+        "cv_results": search["cv_results"],
+        "metrics": result.artifacts.get("evaluate"),
+        "timings": [asdict(timing) for timing in result.timings],
+    }
+    (model_path / f"{name}.json").write_text(json.dumps(report, indent=2))
+    return model_path / f"{name}.joblib"
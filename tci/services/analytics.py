@@ -0,0 +1,77 @@
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional
+
+from sqlalchemy import Integer, cast, func, select
+
+from tci.core.cache import cached, query_cache
+from tci.db.models import Company, JobRollup, RollupState
+from tci.db.postgresql import db
+from tci.db.rollups import DIMENSIONS, STATE_NAME, RefreshStats, refresh_job_rollups
+
+
+class RollupCount(NamedTuple):
+    key: str
+    label: str
+    job_count: int
+
+
+class AnalyticsService:
+    """Reads of the precomputed job rollups, cached under "analytics"
+
+    Nothing here aggregates the jobs table; see ``tci.db.rollups`` for how
+    the rollups are maintained.
+    """
+
+    @cached("analytics")
+    def get_counts(
+        self, dimension: str, limit: Optional[int] = None, by_key: bool = False
+    ) -> List[RollupCount]:
+        """Job counts of one dimension, largest first or ordered by key
+
+        Company counts are labelled with the company name, empty keys (jobs
+        without a company, location or type) with "Unknown".
+        """
+        if dimension not in DIMENSIONS:
+            raise ValueError(f"Unknown dimension: {dimension!r}")
+        if dimension == "company":
+            label = Company.name
+            query = select(JobRollup.key, JobRollup.job_count, label).outerjoin(
+                Company, Company.id == cast(func.nullif(JobRollup.key, ""), Integer)
+            )
+        else:
+            query = select(JobRollup.key, JobRollup.job_count, JobRollup.key)
+        query = query.where(JobRollup.dimension == dimension)
+        if by_key:
+            query = query.order_by(JobRollup.key)
+        else:
+            query = query.order_by(JobRollup.job_count.desc(), JobRollup.key)
+        if limit is not None:
+            query = query.limit(limit)
+
+        with db.session_scope() as session:
+            return [
+                RollupCount(key, label or "Unknown", job_count)
+                for key, job_count, label in session.execute(query)
+            ]
+
+    @cached("analytics")
+    def get_totals(self) -> Dict[str, int]:
+        """Open and total job counts, keyed "open" and "all" respectively"""
+        return {row.key: row.job_count for row in self.get_counts("total")}
+
+    @cached("analytics")
+    def last_refreshed(self) -> Optional[datetime]:
+        with db.session_scope() as session:
+            return session.scalar(
+                select(RollupState.refreshed_at).where(RollupState.name == STATE_NAME)
+            )
+
+    def refresh(self, full: bool = False) -> RefreshStats:
+        """Apply job changes since the last refresh to the rollups"""
+        with db.session_scope() as session:
+            stats = refresh_job_rollups(session, full=full)
+        query_cache.invalidate("analytics")
+        return stats
+
+
+analytics_service = AnalyticsService()
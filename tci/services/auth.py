@@ -1,30 +1,55 @@
+import time
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Optional
 
-import bcrypt
 from jose import JWTError, jwt
 
+from tci.core.cache import TTLCache
 from tci.core.config import settings
 from tci.db.models import User
 from tci.db.postgresql import db
+from tci.services.hashing import PasswordHasher, password_hasher
 
 
 class AuthService:
-    def verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        return bcrypt.checkpw(
-            plain_password.encode("utf-8"), hashed_password.encode("utf-8")
+    def __init__(self, hasher: Optional[PasswordHasher] = None):
+        self.hasher = hasher or password_hasher
+        # token -> user id, each entry kept until the token expires
+        self._principals = TTLCache(
+            maxsize=settings.AUTH_CACHE_MAX_ENTRIES,
+            ttl=settings.TOKEN_EXPIRE_MINUTES * 60,
+        )
+        # user id -> User, dropped whenever the user changes
+        self._users = TTLCache(
+            maxsize=settings.AUTH_CACHE_MAX_ENTRIES, ttl=settings.AUTH_USER_CACHE_TTL
         )
 
+    def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        return self.hasher.verify(plain_password, hashed_password)
+
     def get_password_hash(self, password: str) -> str:
-        salt = bcrypt.gensalt()
-        return bcrypt.hashpw(password.encode("utf-8"), salt).decode("utf-8")
+        return self.hasher.hash(password)
 
     def authenticate_user(self, email: str, password: str) -> Optional[User]:
-        with db.get_session() as session:
+        """Check credentials, upgrading the stored hash if its cost is outdated
+
+        Hashing is slow and waits for the hasher's worker pool, so it runs
+        outside any session instead of holding a pooled connection.
+        """
+        with db.session_scope() as session:
             user = session.query(User).filter(User.email == email).first()
-            if user and self.verify_password(password, user.hashed_password):
-                return user
-        return None
+        if user is None or not self.verify_password(password, user.hashed_password):
+            return None
+        if self.hasher.needs_rehash(user.hashed_password):
+            old_hash = user.hashed_password
+            user.hashed_password = self.get_password_hash(password)
+            with db.session_scope() as session:
+                # Unless the password was changed meanwhile
+                session.query(User).filter(
+                    User.id == user.id, User.hashed_password == old_hash
+                ).update({"hashed_password": user.hashed_password})
+            self.invalidate_user(user.id)
+        return user
 
     def create_access_token(self, user_id: int) -> str:
         expire = datetime.utcnow() + timedelta(minutes=settings.TOKEN_EXPIRE_MINUTES)
@@ -32,24 +57,61 @@ class AuthService:
         return jwt.encode(to_encode, settings.SECRET_KEY, algorithm="HS256")
 
     def verify_token(self, token: str) -> Optional[User]:
-        try:
-            payload = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
-            with db.get_session() as session:
-                return session.query(User).get(payload["user_id"])
-        except JWTError:
+        """Return the active user a token belongs to, or None
+
+        Runs on every Streamlit rerun, so verified tokens and their users are
+        cached and repeat calls normally skip both the JWT decode and the
+        database.
+        """
+        user_id = self._principals.get((token,))
+        if user_id is None:
+            try:
+                payload = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
+            except JWTError:
+                return None
+            user_id = payload["user_id"]
+            if "exp" in payload:
+                self._principals.set(
+                    (token,), user_id, ttl=payload["exp"] - time.time()
+                )
+
+        user = self._users.get_or_set((user_id,), lambda: self._load_user(user_id))
+        if user is None or not user.is_active:
             return None
+        return user
+
+    def _load_user(self, user_id: int) -> Optional[User]:
+        with db.session_scope() as session:
+            return session.get(User, user_id)
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Forget the cached copy of a user; call after changing it elsewhere"""
+        self._users.invalidate(user_id)
+
+    def update_user(self, user_id: int, **kwargs: Any) -> Optional[User]:
+        """Update a user's fields, e.g. ``is_active`` or ``full_name``"""
+        with db.session_scope() as session:
+            user = session.get(User, user_id)
+            if user is None:
+                return None
+            for key, value in kwargs.items():
+                setattr(user, key, value)
+        self.invalidate_user(user_id)
+        return user
+
+    def deactivate_user(self, user_id: int) -> bool:
+        """Deactivate a user; their tokens stop verifying immediately"""
+        return self.update_user(user_id, is_active=False) is not None
 
     def register_user(self, email: str, password: str, full_name: str = None) -> User:
-        with db.get_session() as session:
+        with db.session_scope() as session:
             user = User(
                 email=email,
                 hashed_password=self.get_password_hash(password),
                 full_name=full_name,
             )
             session.add(user)
-            session.commit()
-            session.refresh(user)
-            return user
+        return user
 
 
 auth_service = AuthService()
@@ -1,55 +1,125 @@
+from dataclasses import replace
 from typing import List, Optional
 
-from sqlalchemy import or_
+from sqlalchemy.orm import selectinload
 
-from tci.db.models import Company
+from tci.core.cache import cached, query_cache
+from tci.db.models import Company, Job
+from tci.db.pagination import Page, paginate
 from tci.db.postgresql import db
+from tci.db.projections import CompanySummary, company_summaries, to_projections
+from tci.db.search import apply_search
+from tci.services.search import fetch_in_order, fetch_projected_in_order, search_index
+
+
+def _job_loader(with_jobs: bool) -> tuple:
+    # selectinload fetches the jobs of a whole page with a single IN query
+    # instead of one lazy load per company; closed jobs are left out
+    open_jobs = Company.jobs.and_(Job.closed_at.is_(None))
+    return (selectinload(open_jobs),) if with_jobs else ()
 
 
 class CompanyService:
+    @cached("companies")
     def get_company(self, company_id: int) -> Optional[Company]:
         """Get a single company by ID"""
-        with db.get_session() as session:
-            return session.query(Company).get(company_id)
-
-    def get_companies(self, search_term: str = None) -> List[Company]:
-        """Get all companies, optionally filtered by search term"""
-        with db.get_session() as session:
-            query = session.query(Company)
-            if search_term:
-                search = f"%{search_term}%"
-                query = query.filter(
-                    or_(Company.name.ilike(search), Company.description.ilike(search))
+        with db.session_scope() as session:
+            return session.get(Company, company_id)
+
+    @cached("companies")
+    def get_companies(
+        self,
+        search_term: str = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        with_jobs: bool = False,
+    ) -> List[Company]:
+        """Get companies, optionally filtered by search term
+
+        Searches use the full-text index (or the in-memory BM25 index when
+        `settings.SEARCH_BACKEND` is "memory") and return the most relevant
+        companies first. With `with_jobs` the open jobs of all returned companies
+        are loaded up front in one extra query.
+        """
+        options = _job_loader(with_jobs)
+        with db.session_scope() as session:
+            if search_term and search_index.enabled:
+                end = None if limit is None else offset + limit
+                ids = search_index.search_company_ids(search_term, end)
+                return fetch_in_order(session, Company, ids[offset:end], *options)
+
+            query = apply_search(
+                session.query(Company).options(*options), Company, search_term
+            )
+            if limit is not None:
+                query = query.limit(limit)
+            return query.offset(offset).all()
+
+    @cached("companies")
+    def get_companies_page(
+        self, cursor: Optional[str] = None, limit: int = 50, with_jobs: bool = False
+    ) -> Page[Company]:
+        """Get a page of companies, newest first, using cursor pagination"""
+        with db.session_scope() as session:
+            query = session.query(Company).options(*_job_loader(with_jobs))
+            return paginate(query, Company, cursor, limit)
+
+    @cached("companies")
+    def get_company_summaries(
+        self, search_term: str = None, limit: int = 50, offset: int = 0
+    ) -> List[CompanySummary]:
+        """Like `get_companies`, returning read-only `CompanySummary` rows"""
+        with db.session_scope() as session:
+            if search_term and search_index.enabled:
+                ids = search_index.search_company_ids(search_term, offset + limit)
+                return fetch_projected_in_order(
+                    session, CompanySummary, Company, ids[offset:]
                 )
-            return query.all()
+
+            query = apply_search(company_summaries(session), Company, search_term)
+            return to_projections(CompanySummary, query.limit(limit).offset(offset))
+
+    @cached("companies")
+    def get_company_summaries_page(
+        self, cursor: Optional[str] = None, limit: int = 50
+    ) -> Page[CompanySummary]:
+        """Like `get_companies_page`, returning read-only `CompanySummary` rows"""
+        with db.session_scope() as session:
+            page = paginate(company_summaries(session), Company, cursor, limit)
+            return replace(page, items=to_projections(CompanySummary, page.items))
 
     def create_company(self, name: str, description: str, website: str) -> Company:
         """Create a new company"""
-        with db.get_session() as session:
+        with db.session_scope() as session:
             company = Company(name=name, description=description, website=website)
             session.add(company)
-            session.commit()
-            return company
+        search_index.index_company(company.id, company.name, company.description)
+        query_cache.invalidate("companies")
+        return company
 
     def update_company(self, company_id: int, **kwargs) -> Optional[Company]:
         """Update an existing company"""
-        with db.get_session() as session:
-            company = session.query(Company).get(company_id)
-            if company:
-                for key, value in kwargs.items():
-                    setattr(company, key, value)
-                session.commit()
-            return company
+        with db.session_scope() as session:
+            company = session.get(Company, company_id)
+            if company is None:
+                return None
+            for key, value in kwargs.items():
+                setattr(company, key, value)
+        search_index.index_company(company.id, company.name, company.description)
+        query_cache.invalidate("companies")
+        return company
 
     def delete_company(self, company_id: int) -> bool:
         """Delete a company"""
-        with db.get_session() as session:
-            company = session.query(Company).get(company_id)
-            if company:
-                session.delete(company)
-                session.commit()
-                return True
-            return False
+        with db.session_scope() as session:
+            company = session.get(Company, company_id)
+            if company is None:
+                return False
+            session.delete(company)
+        search_index.remove_company(company_id)
+        # Deleting a company also detaches its jobs
+        query_cache.invalidate("companies", "jobs")
+        return True
 
 
 company_service = CompanyService()
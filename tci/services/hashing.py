@@ -0,0 +1,90 @@
+"""Password hashing on a bounded worker pool.
+
+bcrypt is deliberately slow and releases the GIL while it works, so running
+it on a small thread pool keeps a burst of logins from occupying every
+server thread while still using several cores. The pool size caps how much
+CPU hashing can take at once; callers beyond that queue up.
+"""
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
+
+import bcrypt
+
+from tci.core.config import settings
+
+
+def hash_rounds(hashed_password: str) -> Optional[int]:
+    """Cost factor of a ``$2b$<rounds>$...`` bcrypt hash, None if unparseable"""
+    parts = hashed_password.split("$")
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+class PasswordHasher:
+    """bcrypt hashing and verification running on a worker pool
+
+    Usage:
+        hasher = PasswordHasher()
+        hashed = hasher.hash("secret")
+        hasher.verify("secret", hashed)  # True
+    """
+
+    def __init__(self, rounds: Optional[int] = None, max_workers: Optional[int] = None):
+        self.rounds = rounds or settings.BCRYPT_LOG_ROUNDS
+        self.max_workers = max_workers or settings.PASSWORD_HASH_WORKERS
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        # Created lazily so importing the service does not start threads
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="bcrypt"
+                )
+            return self._executor
+
+    def _hash(self, password: str) -> str:
+        salt = bcrypt.gensalt(rounds=self.rounds)
+        return bcrypt.hashpw(password.encode("utf-8"), salt).decode("utf-8")
+
+    @staticmethod
+    def _verify(password: str, hashed_password: str) -> bool:
+        try:
+            return bcrypt.checkpw(
+                password.encode("utf-8"), hashed_password.encode("utf-8")
+            )
+        except ValueError:
+            # Malformed stored hash
+            return False
+
+    def hash_async(self, password: str) -> "Future[str]":
+        return self.executor.submit(self._hash, password)
+
+    def verify_async(self, password: str, hashed_password: str) -> "Future[bool]":
+        return self.executor.submit(self._verify, password, hashed_password)
+
+    def hash(self, password: str) -> str:
+        """Hash a password with the configured cost"""
+        return self.hash_async(password).result()
+
+    def verify(self, password: str, hashed_password: str) -> bool:
+        """Check a password against a stored hash"""
+        return self.verify_async(password, hashed_password).result()
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """Whether a stored hash was made with a different cost than configured"""
+        return hash_rounds(hashed_password) != self.rounds
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+
+password_hasher = PasswordHasher()
@@ -1,37 +1,109 @@
+from dataclasses import replace
 from typing import List, Optional
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Query, Session
 
+from tci.core.cache import cached
 from tci.db.models import Job
+from tci.db.pagination import Page, paginate
 from tci.db.postgresql import db
+from tci.db.projections import JobSummary, job_summaries, to_projections
+from tci.db.search import apply_search
+from tci.services.search import fetch_in_order, fetch_projected_in_order, search_index
+
+
+def _open_job_summaries(session: Session) -> Query:
+    return job_summaries(session).filter(Job.closed_at.is_(None))
 
 
 class JobService:
+    """Job reads, cached under the "jobs" namespace of the query cache
+
+    Job writes must call ``query_cache.invalidate("jobs", "companies",
+    "analytics")`` after committing, as company reads and analytics cover jobs.
+    Lists and searches leave out closed jobs; ``get_job_by_id`` still returns
+    them so that links to a closed posting keep working.
+    """
+
     def __init__(self):
         self.db = db
 
+    @cached("jobs")
     def get_jobs(self, limit: int = 100, offset: int = 0) -> List[Job]:
-        """Get a list of jobs with pagination"""
-        with self.db.get_session() as session:
-            return session.query(Job).offset(offset).limit(limit).all()
+        """Get a list of jobs with offset pagination, newest first"""
+        with self.db.session_scope() as session:
+            query = (
+                session.query(Job)
+                .filter(Job.closed_at.is_(None))
+                .order_by(Job.created_at.desc(), Job.id.desc())
+            )
+            return query.offset(offset).limit(limit).all()
 
+    @cached("jobs")
+    def get_jobs_page(self, cursor: Optional[str] = None, limit: int = 50) -> Page[Job]:
+        """Get a page of jobs, newest first, using cursor pagination
+
+        Pass the returned page's `next_cursor`/`prev_cursor` to move between
+        pages.
+        """
+        with self.db.session_scope() as session:
+            return paginate(
+                session.query(Job).filter(Job.closed_at.is_(None)), Job, cursor, limit
+            )
+
+    @cached("jobs")
     def get_job_by_id(self, job_id: int) -> Optional[Job]:
         """Get a job by its ID"""
-        with self.db.get_session() as session:
+        with self.db.session_scope() as session:
             return session.query(Job).filter(Job.id == job_id).first()
 
-    def search_jobs(self, query: str, limit: int = 100) -> List[Job]:
-        """Search jobs by title or description"""
-        with self.db.get_session() as session:
+    @cached("jobs")
+    def search_jobs(self, query: str, limit: int = 100, offset: int = 0) -> List[Job]:
+        """Search jobs by title, description or location, most relevant first"""
+        with self.db.session_scope() as session:
+            if query and search_index.enabled:
+                ids = search_index.search_job_ids(query, offset + limit)
+                return fetch_in_order(session, Job, ids[offset:])
             return (
-                session.query(Job)
-                .filter(
-                    (Job.title.ilike(f"%{query}%"))
-                    | (Job.description.ilike(f"%{query}%"))
+                apply_search(
+                    session.query(Job).filter(Job.closed_at.is_(None)), Job, query
                 )
+                .offset(offset)
                 .limit(limit)
                 .all()
             )
 
+    @cached("jobs")
+    def get_job_summaries(self, limit: int = 100, offset: int = 0) -> List[JobSummary]:
+        """Like `get_jobs`, returning read-only `JobSummary` rows"""
+        with self.db.session_scope() as session:
+            query = _open_job_summaries(session).order_by(Job.id)
+            return to_projections(JobSummary, query.offset(offset).limit(limit))
+
+    @cached("jobs")
+    def get_job_summaries_page(
+        self, cursor: Optional[str] = None, limit: int = 50
+    ) -> Page[JobSummary]:
+        """Like `get_jobs_page`, returning read-only `JobSummary` rows"""
+        with self.db.session_scope() as session:
+            page = paginate(_open_job_summaries(session), Job, cursor, limit)
+            return replace(page, items=to_projections(JobSummary, page.items))
+
+    @cached("jobs")
+    def search_job_summaries(
+        self, query: str, limit: int = 100, offset: int = 0
+    ) -> List[JobSummary]:
+        """Like `search_jobs`, returning read-only `JobSummary` rows"""
+        with self.db.session_scope() as session:
+            if query and search_index.enabled:
+                ids = search_index.search_job_ids(query, offset + limit)
+                return fetch_projected_in_order(session, JobSummary, Job, ids[offset:])
+            rows = (
+                apply_search(_open_job_summaries(session), Job, query)
+                .offset(offset)
+                .limit(limit)
+            )
+            return to_projections(JobSummary, rows)
+
 
 job_service = JobService()
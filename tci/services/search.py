@@ -0,0 +1,226 @@
+"""In-process BM25 search backend for companies and jobs.
+
+Enabled with ``settings.SEARCH_BACKEND = "memory"``. The indexes are built
+from the database on first use and then kept current by the service write
+methods and by a periodic sync of rows updated since, which picks up bulk
+loads and imports that bypass the services. Searches only hit Postgres to
+load the matching rows.
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Type
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from tci.core.config import settings
+from tci.data.processors.text import BM25Index
+from tci.db.models import Company, Job
+from tci.db.postgresql import db
+from tci.db.projections import project_query
+
+LOAD_BATCH_SIZE = 5000
+# Seconds re-read before the sync watermark, for transactions committed late
+SYNC_OVERLAP = 300
+
+
+def company_document(name: str, description: Optional[str]) -> str:
+    # Repeating the name weighs it above the description
+    return f"{name} {name} {description or ''}"
+
+
+def job_document(
+    title: str, description: Optional[str], location: Optional[str]
+) -> str:
+    return f"{title} {title} {location or ''} {description or ''}"
+
+
+def fetch_in_order(
+    session: Session, model: Type, ids: Sequence[int], *options: Any
+) -> List:
+    """Load rows by primary key, keeping the order of ``ids``
+
+    ``options`` are passed to ``Query.options``, e.g. eager loaders.
+    """
+    if not ids:
+        return []
+    query = session.query(model).options(*options).filter(model.id.in_(ids))
+    rows: Dict[int, object] = {row.id: row for row in query}
+    return [rows[id_] for id_ in ids if id_ in rows]
+
+
+def fetch_projected_in_order(
+    session: Session, projection: Type, model: Type, ids: Sequence[int]
+) -> List:
+    """Like :func:`fetch_in_order`, returning read-only projections"""
+    if not ids:
+        return []
+    query = project_query(session, projection, model).filter(model.id.in_(ids))
+    rows = {row.id: row for row in query}
+    return [projection._make(rows[id_]) for id_ in ids if id_ in rows]
+
+
+class SearchIndexService:
+    def __init__(self):
+        self.companies = BM25Index()
+        self.jobs = BM25Index()
+        # id -> updated_at of every indexed row, to skip unchanged re-reads
+        self._versions: Dict[str, Dict[int, Optional[datetime]]] = {
+            "companies": {},
+            "jobs": {},
+        }
+        self._watermark: Optional[datetime] = None
+        self._synced_at: Optional[float] = None
+        self._loaded = False
+        self._lock = threading.RLock()
+
+    @property
+    def enabled(self) -> bool:
+        return settings.SEARCH_BACKEND == "memory"
+
+    def ensure_loaded(self) -> None:
+        """Build both indexes on first use, then keep them in sync
+
+        At most every ``settings.SEARCH_REFRESH_INTERVAL`` seconds, rows
+        updated since the last sync are re-indexed and closed jobs dropped.
+        Rows the sync cannot see, like rows deleted outside the services,
+        leave the indexed counts out of step with the database, which
+        rebuilds both indexes.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if (
+                self._loaded
+                and self._synced_at is not None
+                and now - self._synced_at < settings.SEARCH_REFRESH_INTERVAL
+            ):
+                return
+            with db.session_scope() as session:
+                if self._loaded:
+                    self._sync(session)
+                if not self._loaded or not self._in_step(session):
+                    self._rebuild(session)
+            self._synced_at = now
+
+    def mark_stale(self) -> None:
+        """Sync with the database on the next search; call after bulk writes"""
+        with self._lock:
+            self._synced_at = None
+
+    def _rebuild(self, session: Session) -> None:
+        companies, jobs = BM25Index(), BM25Index()
+        self._versions = {"companies": {}, "jobs": {}}
+        self._watermark = None
+        self._index_rows(session, companies, jobs)
+        self.companies, self.jobs = companies, jobs
+        self._loaded = True
+
+    def _sync(self, session: Session) -> None:
+        since = None
+        if self._watermark is not None:
+            since = self._watermark - timedelta(seconds=SYNC_OVERLAP)
+        self._index_rows(session, self.companies, self.jobs, since)
+
+    def _index_rows(
+        self,
+        session: Session,
+        companies: BM25Index,
+        jobs: BM25Index,
+        since: Optional[datetime] = None,
+    ) -> None:
+        """Index the companies and open jobs updated at or after ``since``"""
+        company_rows = session.query(
+            Company.id, Company.updated_at, Company.name, Company.description
+        )
+        job_rows = session.query(
+            Job.id,
+            Job.updated_at,
+            Job.closed_at,
+            Job.title,
+            Job.description,
+            Job.location,
+        )
+        if since is None:
+            job_rows = job_rows.filter(Job.closed_at.is_(None))
+        else:
+            company_rows = company_rows.filter(Company.updated_at >= since)
+            job_rows = job_rows.filter(Job.updated_at >= since)
+
+        versions = self._versions["companies"]
+        for company_id, updated_at, name, description in company_rows.yield_per(
+            LOAD_BATCH_SIZE
+        ):
+            self._advance(updated_at)
+            if company_id in versions and versions[company_id] == updated_at:
+                continue
+            versions[company_id] = updated_at
+            companies.add(company_id, company_document(name, description))
+
+        versions = self._versions["jobs"]
+        for job_id, updated_at, closed_at, *document in job_rows.yield_per(
+            LOAD_BATCH_SIZE
+        ):
+            self._advance(updated_at)
+            if closed_at is not None:
+                versions.pop(job_id, None)
+                jobs.remove(job_id)
+            elif job_id not in versions or versions[job_id] != updated_at:
+                versions[job_id] = updated_at
+                jobs.add(job_id, job_document(*document))
+
+    def _advance(self, updated_at: Optional[datetime]) -> None:
+        if updated_at is not None and (
+            self._watermark is None or updated_at > self._watermark
+        ):
+            self._watermark = updated_at
+
+    def _in_step(self, session: Session) -> bool:
+        """Whether the indexes hold as many rows as the database"""
+        companies = session.query(func.count(Company.id)).scalar()
+        jobs = session.query(func.count(Job.id)).filter(Job.closed_at.is_(None))
+        return companies == len(self.companies) and jobs.scalar() == len(self.jobs)
+
+    def index_company(
+        self, company_id: int, name: str, description: Optional[str]
+    ) -> None:
+        """Add or refresh a company; a no-op until the index has been loaded"""
+        with self._lock:
+            if self._loaded:
+                self.companies.add(company_id, company_document(name, description))
+
+    def remove_company(self, company_id: int) -> None:
+        with self._lock:
+            self._versions["companies"].pop(company_id, None)
+            self.companies.remove(company_id)
+
+    def index_job(
+        self,
+        job_id: int,
+        title: str,
+        description: Optional[str],
+        location: Optional[str],
+    ) -> None:
+        """Add or refresh a job; a no-op until the index has been loaded"""
+        with self._lock:
+            if self._loaded:
+                self.jobs.add(job_id, job_document(title, description, location))
+
+    def remove_job(self, job_id: int) -> None:
+        with self._lock:
+            self._versions["jobs"].pop(job_id, None)
+            self.jobs.remove(job_id)
+
+    def search_company_ids(self, term: str, limit: Optional[int] = None) -> List[int]:
+        self.ensure_loaded()
+        limit = len(self.companies) if limit is None else limit
+        return [company_id for company_id, _ in self.companies.search(term, limit)]
+
+    def search_job_ids(self, term: str, limit: Optional[int] = None) -> List[int]:
+        self.ensure_loaded()
+        limit = len(self.jobs) if limit is None else limit
+        return [job_id for job_id, _ in self.jobs.search(term, limit)]
+
+
+search_index = SearchIndexService()
@@ -5,6 +5,7 @@ from typing import Optional
 import streamlit as st
 
 from tci.core.config import settings
+from tci.services.analytics import analytics_service
 from tci.services.company import CompanyService, company_service
 from tci.services.jobs import JobService, job_service
 from tci.web import pages
@@ -51,7 +52,7 @@ class TechCompaniesApp:
         elif page == "Jobs":
             pages.job_board.show(job_service)
         elif page == "Analytics":
-            pages.analytics.show(company_service, job_service)
+            pages.analytics.show(analytics_service)
         else:
             pages.ml_insights.show(company_service, job_service)
 
@@ -1,6 +1,53 @@
+import pandas as pd
+import plotly.express as px
 import streamlit as st
 
+TOP_N = 15
 
-def show(company_service, job_service):
+
+def _bar_chart(rows, title: str):
+    frame = pd.DataFrame(
+        {"label": [row.label for row in rows], "jobs": [row.job_count for row in rows]}
+    )
+    figure = px.bar(frame, x="jobs", y="label", orientation="h", title=title)
+    figure.update_layout(yaxis={"autorange": "reversed", "title": None})
+    st.plotly_chart(figure, use_container_width=True)
+
+
+def show(analytics_service):
     st.title("Analytics")
-    st.info("Coming soon: Analytics and insights about the Israeli tech ecosystem")
+
+    # Every chart reads the precomputed rollups, never the jobs table
+    refreshed_at = analytics_service.last_refreshed()
+    if refreshed_at is None:
+        st.info("No analytics yet: run scripts/refresh_analytics.py to build them")
+        return
+
+    totals = analytics_service.get_totals()
+    open_jobs, all_jobs = st.columns(2)
+    open_jobs.metric("Open jobs", f"{totals.get('open', 0):,}")
+    all_jobs.metric("Jobs seen", f"{totals.get('all', 0):,}")
+
+    left, right = st.columns(2)
+    with left:
+        _bar_chart(
+            analytics_service.get_counts("company", TOP_N), "Open jobs by company"
+        )
+        _bar_chart(analytics_service.get_counts("job_type", TOP_N), "Open jobs by type")
+    with right:
+        _bar_chart(
+            analytics_service.get_counts("location", TOP_N), "Open jobs by location"
+        )
+
+    weeks = analytics_service.get_counts("week", by_key=True)
+    frame = pd.DataFrame(
+        {
+            "week": pd.to_datetime([row.key for row in weeks]),
+            "jobs": [row.job_count for row in weeks],
+        }
+    )
+    st.plotly_chart(
+        px.line(frame, x="week", y="jobs", title="Jobs posted per week"),
+        use_container_width=True,
+    )
+    st.caption(f"Last refreshed {refreshed_at:%Y-%m-%d %H:%M} UTC")
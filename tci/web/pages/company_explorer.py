@@ -1,7 +1,53 @@
+from typing import List, Optional
+
 import streamlit as st
 
+from tci.db.models import Company
 from tci.services.company import CompanyService
 
+PAGE_SIZE = 20
+
+
+def _reset_paging(search_query: str) -> None:
+    """Start again from the first page whenever the search changes"""
+    if st.session_state.get("company_search") != search_query:
+        st.session_state.company_search = search_query
+        st.session_state.company_cursor = None
+        st.session_state.company_offset = 0
+
+
+def _load_page(company_service: CompanyService, search_query: str) -> List[Company]:
+    """Fetch the current page, storing the links to its neighbours in state
+
+    Browsing walks the company list with cursors; searches are ordered by
+    relevance and page by offset instead.
+    """
+    if search_query:
+        offset = st.session_state.company_offset
+        # One extra row tells whether there is a next page
+        companies = company_service.get_companies(
+            search_query, limit=PAGE_SIZE + 1, offset=offset, with_jobs=True
+        )
+        st.session_state.company_next = (
+            offset + PAGE_SIZE if len(companies) > PAGE_SIZE else None
+        )
+        st.session_state.company_prev = max(offset - PAGE_SIZE, 0) if offset else None
+        return companies[:PAGE_SIZE]
+
+    page = company_service.get_companies_page(
+        st.session_state.company_cursor, limit=PAGE_SIZE, with_jobs=True
+    )
+    st.session_state.company_next = page.next_cursor
+    st.session_state.company_prev = page.prev_cursor
+    return page.items
+
+
+def _go_to(position: Optional[object], search_query: str) -> None:
+    if search_query:
+        st.session_state.company_offset = position
+    else:
+        st.session_state.company_cursor = position
+
 
 def show(company_service: CompanyService):
     """Show company explorer page"""
@@ -10,7 +56,7 @@ def show(company_service: CompanyService):
     # Search bar
     search_query = st.text_input(
         "Search companies", placeholder="Enter company name..."
-    )
+    ).strip()
 
     # Filters
     col1, col2 = st.columns(2)
@@ -22,10 +68,14 @@ def show(company_service: CompanyService):
         st.selectbox("Size", ["All", "1-10", "11-50", "51-200", "201-1000", "1000+"])
 
     # Company list
-    companies = company_service.get_companies()
+    _reset_paging(search_query)
+    companies = _load_page(company_service, search_query)
 
     if not companies:
-        st.info("No companies found. Companies will appear here once added.")
+        if search_query:
+            st.info(f"No companies match '{search_query}'.")
+        else:
+            st.info("No companies found. Companies will appear here once added.")
         return
 
     for company in companies:
@@ -34,8 +84,25 @@ def show(company_service: CompanyService):
             if company.description:
                 st.write(company.description)
 
-            # Show job openings if any
+            # Jobs were loaded together with the page
             if company.jobs:
                 st.subheader("Open Positions")
                 for job in company.jobs:
                     st.write(f"- {job.title} ({job.location})")
+
+    # Pagination
+    prev_col, next_col = st.columns(2)
+    with prev_col:
+        st.button(
+            "Previous",
+            disabled=st.session_state.company_prev is None,
+            on_click=_go_to,
+            args=(st.session_state.company_prev, search_query),
+        )
+    with next_col:
+        st.button(
+            "Next",
+            disabled=st.session_state.company_next is None,
+            on_click=_go_to,
+            args=(st.session_state.company_next, search_query),
+        )
@@ -0,0 +1,103 @@
+import gzip
+
+import pytest
+from fastapi.testclient import TestClient
+
+from tci.api.responses import etag_matches, negotiate_encoding
+from tci.api.routes import create_app
+from tci.core.cache import query_cache
+from tci.db.models import Company, Job
+from tci.services.jobs import job_service
+
+
+@pytest.fixture
+def client(service_db, db_session, monkeypatch):
+    # The job service binds the database when it is created
+    monkeypatch.setattr(job_service, "db", service_db)
+    db_session.add_all(
+        [
+            Company(
+                name=f"Company {i}",
+                website=f"https://company{i}.com",
+                description="Cloud security platform " * 20,
+            )
+            for i in range(5)
+        ]
+    )
+    db_session.add(Job(title="Backend Engineer", location="Tel Aviv"))
+    db_session.flush()
+    return TestClient(create_app())
+
+
+def test_cursor_pagination(client):
+    first = client.get("/companies", params={"limit": 3}).json()
+    assert len(first["items"]) == 3 and first["prev_cursor"] is None
+
+    second = client.get(
+        "/companies", params={"limit": 3, "cursor": first["next_cursor"]}
+    ).json()
+    assert len(second["items"]) == 2 and second["next_cursor"] is None
+    names = {item["name"] for item in first["items"] + second["items"]}
+    assert names == {f"Company {i}" for i in range(5)}
+
+    assert client.get("/companies", params={"cursor": "bogus"}).status_code == 400
+
+
+def test_detail_and_not_found(client, db_session):
+    company = db_session.query(Company).filter_by(name="Company 1").one()
+    body = client.get(f"/companies/{company.id}").json()
+    assert body["website"] == "https://company1.com"
+    assert client.get("/companies/0").status_code == 404
+
+    job = client.get("/jobs").json()["items"][0]
+    assert client.get(f"/jobs/{job['id']}").json()["title"] == "Backend Engineer"
+
+
+def test_etag_revalidation_follows_updates(client, db_session):
+    response = client.get("/companies")
+    etag = response.headers["etag"]
+    assert client.get("/companies", headers={"If-None-Match": etag}).status_code == 304
+
+    db_session.query(Company).filter_by(name="Company 2").one().description = "New"
+    db_session.flush()
+    query_cache.invalidate("companies")
+
+    response = client.get("/companies", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+def test_compression(client):
+    response = client.get("/companies", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    # httpx decodes the body transparently
+    assert len(response.json()["items"]) == 5
+
+    raw = client.get("/companies", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in raw.headers
+    assert len(gzip.compress(raw.content)) < len(raw.content)
+
+
+def test_search(client):
+    body = client.get(
+        "/search", params={"q": "security", "kind": "companies", "limit": 2}
+    ).json()
+    assert len(body["items"]) == 2 and body["next_cursor"]
+    rest = client.get(
+        "/search",
+        params={"q": "security", "kind": "companies", "cursor": body["next_cursor"]},
+    ).json()
+    assert len(rest["items"]) == 3 and rest["prev_cursor"]
+
+    jobs = client.get("/search", params={"q": "backend"}).json()
+    assert [job["title"] for job in jobs["items"]] == ["Backend Engineer"]
+    assert client.get("/search", params={"q": "x", "kind": "users"}).status_code == 422
+
+
+def test_header_parsing():
+    assert etag_matches('"a", W/"b"', 'W/"b"')
+    assert etag_matches("*", 'W/"b"')
+    assert not etag_matches('"a"', 'W/"b"')
+    assert negotiate_encoding("gzip;q=0, identity") is None
+    assert negotiate_encoding("deflate, gzip") == "gzip"
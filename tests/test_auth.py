@@ -1,6 +1,10 @@
+from unittest.mock import patch
+
 import pytest
 
+from tci.db.models import User
 from tci.services.auth import AuthService
+from tci.services.hashing import PasswordHasher, hash_rounds
 
 
 def test_password_hashing():
@@ -32,3 +36,46 @@ def test_token_creation_and_verification(test_db):
 
     # Test invalid token
     assert auth.verify_token("invalid-token") is None
+
+
+def test_verify_token_is_cached(service_db):
+    """Test repeat verifications skip the database until the user changes"""
+    auth = AuthService()
+    user = auth.register_user("cached@example.com", "test123")
+    token = auth.create_access_token(user.id)
+
+    assert auth.verify_token(token).id == user.id
+    with patch.object(auth, "_load_user", side_effect=AssertionError):
+        assert auth.verify_token(token).id == user.id
+
+    auth.deactivate_user(user.id)
+    assert auth.verify_token(token) is None
+
+    auth.update_user(user.id, is_active=True)
+    assert auth.verify_token(token).id == user.id
+
+
+def test_hasher_honours_rounds():
+    """Test the configured bcrypt cost is used and outdated hashes detected"""
+    hasher = PasswordHasher(rounds=4, max_workers=2)
+    hashed = hasher.hash("test123")
+
+    assert hash_rounds(hashed) == 4
+    assert hasher.verify("test123", hashed)
+    assert not hasher.verify("test123", "not-a-hash")
+    assert hasher.needs_rehash(PasswordHasher(rounds=5).hash("test123"))
+    assert not hasher.needs_rehash(hashed)
+    hasher.shutdown()
+
+
+def test_login_rehashes_outdated_cost(service_db):
+    """Test a successful login upgrades a hash made with a different cost"""
+    AuthService(PasswordHasher(rounds=4)).register_user("rehash@example.com", "pw")
+
+    auth = AuthService(PasswordHasher(rounds=5))
+    user = auth.authenticate_user("rehash@example.com", "pw")
+    assert hash_rounds(user.hashed_password) == 5
+    with service_db.session_scope() as session:
+        assert session.get(User, user.id).hashed_password == user.hashed_password
+    assert auth.authenticate_user("rehash@example.com", "pw").id == user.id
+    assert auth.authenticate_user("rehash@example.com", "wrong") is None
@@ -0,0 +1,33 @@
+from tci.db.bulk import UpsertCounts, upsert_companies
+from tci.db.models import Company
+
+
+def test_upsert_companies_counts(db_session):
+    """Test that added/updated/skipped reflect what actually changed"""
+    first = upsert_companies(
+        db_session,
+        [
+            {"name": "Example Tech", "website": "https://example.com"},
+            {"name": "Another", "website": None, "description": "Software"},
+        ],
+    )
+    assert first == UpsertCounts(added=2, updated=0, skipped=0)
+
+    second = upsert_companies(
+        db_session,
+        [
+            # Unchanged
+            {"name": "Example Tech", "website": "https://example.com"},
+            # New description, missing website keeps the stored value
+            {"name": "Another", "website": None, "description": "Cloud software"},
+            {"name": "Third", "website": "https://third.io"},
+            # Repeated name within the chunk, the last row wins
+            {"name": "Third", "website": "https://third.co.il"},
+        ],
+    )
+    assert second == UpsertCounts(added=1, updated=1, skipped=2)
+
+    companies = {c.name: c for c in db_session.query(Company)}
+    assert len(companies) == 3
+    assert companies["Another"].description == "Cloud software"
+    assert companies["Third"].website == "https://third.co.il"
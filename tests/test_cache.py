@@ -0,0 +1,59 @@
+import time
+
+from tci.core.cache import TTLCache
+
+
+def test_ttl_expiry_and_hit_rate():
+    cache = TTLCache(maxsize=10, ttl=0.05)
+    cache.set(("companies", 1), "a")
+
+    assert cache.get(("companies", 1)) == "a"
+    time.sleep(0.06)
+    assert cache.get(("companies", 1)) is None
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+    assert stats["hit_rate"] == 0.5
+
+
+def test_lru_eviction():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set(("jobs", 1), 1)
+    cache.set(("jobs", 2), 2)
+    cache.get(("jobs", 1))
+    cache.set(("jobs", 3), 3)
+
+    assert cache.get(("jobs", 2)) is None
+    assert cache.get(("jobs", 1)) == 1
+    assert cache.stats()["evictions"] == 1
+
+
+def test_invalidate_namespace():
+    cache = TTLCache()
+    cache.set(("companies", 1), "company")
+    cache.set(("jobs", 1), "job")
+    cache.invalidate("companies")
+
+    assert cache.get(("companies", 1)) is None
+    assert cache.get(("jobs", 1)) == "job"
+
+
+def test_get_or_set_discards_reads_racing_a_write():
+    cache = TTLCache()
+
+    def load():
+        # A write commits while the read is in flight
+        cache.invalidate("companies")
+        return "stale"
+
+    assert cache.get_or_set(("companies", "list"), load) == "stale"
+    assert cache.get_or_set(("companies", "list"), lambda: "fresh") == "fresh"
+    assert cache.get(("companies", "list")) == "fresh"
+
+
+def test_disabled_cache_always_loads():
+    cache = TTLCache(ttl=0)
+    calls = []
+    for _ in range(2):
+        cache.get_or_set(("jobs",), lambda: calls.append(1))
+    assert len(calls) == 2
@@ -0,0 +1,127 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event
+
+from tci.db.models import Company, Job
+from tci.db.projections import CompanySummary, JobSummary
+from tci.services.company import CompanyService
+from tci.services.jobs import JobService
+
+
+@pytest.fixture
+def companies(db_session):
+    rows = []
+    for i in range(6):
+        company = Company(name=f"Explorer Co {i}", description="Cyber security")
+        company.jobs = [Job(title=f"Engineer {i}.{j}") for j in range(3)]
+        rows.append(company)
+    db_session.add_all(rows)
+    db_session.flush()
+    return rows
+
+
+@pytest.fixture
+def statements(db_session):
+    executed = []
+    connection = db_session.get_bind()
+
+    def record(conn, cursor, statement, *args):
+        executed.append(statement)
+
+    event.listen(connection, "before_cursor_execute", record)
+    yield executed
+    event.remove(connection, "before_cursor_execute", record)
+
+
+def test_companies_page_loads_jobs_in_one_query(service_db, companies, statements):
+    page = CompanyService().get_companies_page(limit=4, with_jobs=True)
+    statements.clear()
+
+    assert len(page.items) == 4
+    assert all(len(company.jobs) == 3 for company in page.items)
+    assert statements == []
+
+
+def test_search_loads_jobs_up_front(service_db, companies, statements):
+    statements.clear()
+    found = CompanyService().get_companies("cyber", limit=10, with_jobs=True)
+
+    assert {company.name for company in found} == {c.name for c in companies}
+    assert sum(len(company.jobs) for company in found) == 18
+    selects = [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+    assert len(selects) == 2
+
+
+def test_reads_are_cached_until_a_write(service_db, companies, statements):
+    service = CompanyService()
+    first = service.get_companies_page(limit=2)
+    statements.clear()
+
+    assert service.get_companies_page(limit=2) is first
+    assert statements == []
+
+    service.update_company(first.items[0].id, description="Renamed")
+    refreshed = service.get_companies_page(limit=2)
+    assert refreshed is not first
+    assert refreshed.items[0].description == "Renamed"
+
+
+def test_unsearched_companies_are_paged_in_id_order(service_db, companies):
+    service = CompanyService()
+    pages = [service.get_companies(limit=2, offset=offset) for offset in (0, 2, 4)]
+
+    ids = [company.id for page in pages for company in page]
+    assert ids == sorted(company.id for company in companies)
+
+
+def test_summaries_are_projections(service_db, companies):
+    service = CompanyService()
+    page = service.get_company_summaries_page(limit=4)
+    found = service.get_company_summaries("cyber", limit=3)
+
+    assert [type(item) for item in page.items] == [CompanySummary] * 4
+    assert page.next_cursor is not None
+    assert len(found) == 3
+    assert {item.name for item in found} <= {c.name for c in companies}
+
+
+def test_job_summaries(service_db, companies):
+    service = JobService()
+    jobs = service.search_job_summaries("engineer", limit=5)
+    page = service.get_job_summaries_page(limit=10)
+
+    assert len(jobs) == 5
+    assert all(isinstance(job, JobSummary) for job in jobs + page.items)
+    assert tuple(page.items[0]._asdict()) == JobSummary._fields
+
+
+def test_job_offset_pages_match_keyset_order(service_db, companies):
+    service = JobService()
+    offset_ids = [
+        job.id
+        for offset in (0, 5, 10, 15)
+        for job in service.get_jobs(limit=5, offset=offset)
+    ]
+    keyset_ids = [job.id for job in service.get_jobs_page(limit=18).items]
+    assert offset_ids == keyset_ids
+
+
+def test_closed_jobs_are_left_out(service_db, db_session, companies):
+    closed = companies[0].jobs[0]
+    closed.closed_at = datetime.utcnow()
+    db_session.flush()
+
+    jobs = JobService()
+    listed = [job.id for job in jobs.get_jobs(limit=100)]
+    assert len(listed) == 17 and closed.id not in listed
+    assert closed.id not in [job.id for job in jobs.get_jobs_page(limit=100).items]
+    assert closed.id not in [job.id for job in jobs.search_jobs("engineer")]
+    summaries = jobs.get_job_summaries_page(limit=100).items
+    assert closed.id not in [job.id for job in summaries]
+
+    found = CompanyService().get_companies("cyber", limit=10, with_jobs=True)
+    explorer = {company.id: company for company in found}
+    assert {job.id for job in explorer[companies[0].id].jobs} == {
+        job.id for job in companies[0].jobs[1:]
+    }
@@ -0,0 +1,23 @@
+import subprocess
+
+import pytest
+
+from tci.core.config import settings
+
+
+@pytest.mark.parametrize(
+    "setting",
+    ["FEATURE_CACHE_PATH", "MODEL_PATH", "SCRAPE_CACHE_DIR", "VECTOR_STORE_PATH"],
+)
+def test_generated_files_stay_in_the_checkout(setting):
+    path = getattr(settings, setting)
+    assert (settings.PROJECT_ROOT / "pyproject.toml").exists()
+    assert path.is_relative_to(settings.PROJECT_ROOT)
+
+    if not (settings.PROJECT_ROOT / ".git").exists():
+        pytest.skip("not a git checkout")
+    ignored = subprocess.run(
+        ["git", "check-ignore", "-q", str(path / "entry")],
+        cwd=settings.PROJECT_ROOT,
+    )
+    assert ignored.returncode == 0
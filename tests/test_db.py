@@ -0,0 +1,42 @@
+import pytest
+from sqlalchemy import text
+
+from tci.db.models import Company
+
+
+def test_session_scope_commits(test_db):
+    """Test that the scope commits and objects stay usable afterwards"""
+    with test_db.session_scope() as session:
+        company = Company(name="Scoped Commit")
+        session.add(company)
+
+    assert company.id is not None
+    assert company.name == "Scoped Commit"
+    with test_db.session_scope() as session:
+        assert session.get(Company, company.id) is not None
+        session.delete(session.get(Company, company.id))
+
+
+def test_session_scope_rolls_back(test_db):
+    """Test that an exception discards the transaction"""
+    with pytest.raises(RuntimeError):
+        with test_db.session_scope() as session:
+            session.add(Company(name="Scoped Rollback"))
+            session.flush()
+            raise RuntimeError("boom")
+
+    with test_db.session_scope() as session:
+        assert session.query(Company).filter_by(name="Scoped Rollback").count() == 0
+
+
+def test_pool_stats_and_statement_timeout(test_db):
+    """Test pool statistics and the configured statement timeout"""
+    with test_db.session_scope() as session:
+        timeout = session.execute(text("SHOW statement_timeout")).scalar()
+        assert test_db.pool_stats()["checked_out"] == 1
+
+    assert timeout == "30s"
+    stats = test_db.pool_stats()
+    assert stats["checked_out"] == 0
+    assert stats["wait_count"] >= 1
+    assert set(stats) >= {"size", "overflow", "wait_avg_ms", "wait_max_ms", "timeouts"}
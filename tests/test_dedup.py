@@ -0,0 +1,115 @@
+import pytest
+
+from tci.data.processors.dedup import JobDeduplicator, MinHashIndex, optimal_bands
+from tci.db.models import Job
+
+DESCRIPTION = (
+    "We are looking for a backend engineer to design and build scalable "
+    "services in Python and PostgreSQL, own our data pipelines end to end, "
+    "mentor other engineers and work closely with product on new features "
+    "for customers across Europe and Israel."
+)
+
+
+def posting(title="Senior Backend Engineer", description=DESCRIPTION, **extra):
+    return {"title": title, "location": "Tel Aviv", "description": description, **extra}
+
+
+def test_optimal_bands_cover_all_permutations():
+    bands, rows = optimal_bands(0.8, 128)
+    assert bands * rows <= 128
+    assert (1 / bands) ** (1 / rows) == pytest.approx(0.8, abs=0.05)
+
+
+def test_index_finds_near_duplicates_only():
+    index = MinHashIndex(threshold=0.7)
+    index.add("career-page", DESCRIPTION)
+    index.add("other", "Frontend developer building React dashboards for fintech")
+
+    reworded = DESCRIPTION.replace("and Israel.", "and Israel!") + " Apply today."
+    matches = index.query(reworded)
+    assert [key for key, _ in matches] == ["career-page"]
+    assert matches[0][1] >= 0.7
+    assert index.query("Data scientist for computer vision research") == []
+
+    index.remove("career-page")
+    assert index.query(reworded) == []
+
+
+def test_threshold_setting():
+    strict, loose = MinHashIndex(threshold=0.95), MinHashIndex(threshold=0.5)
+    # Jaccard similarity 0.6
+    edited = DESCRIPTION.replace("Python", "Go").replace("mentor", "coach")
+    for index in (strict, loose):
+        index.add("job", DESCRIPTION)
+    assert strict.query(edited) == []
+    assert loose.query(edited) != []
+
+
+def test_filter_drops_duplicates_incrementally():
+    dedup = JobDeduplicator(MinHashIndex(threshold=0.7))
+    records = [
+        posting(apply_link="https://acme.example/jobs/1"),
+        posting(
+            apply_link="https://aggregator.example/7",
+            description=DESCRIPTION + " Hybrid.",
+        ),
+        posting(
+            title="QA Engineer",
+            description="Manual and automated testing of mobile apps",
+        ),
+        posting(apply_link="https://acme.example/jobs/1"),
+    ]
+
+    unique = list(dedup.filter(records))
+    assert unique == [records[0], records[2], records[3]]
+    assert (dedup.stats.seen, dedup.stats.duplicates) == (4, 1)
+
+
+def test_existing_jobs_are_indexed(db_session):
+    db_session.add(
+        Job(
+            title="Senior Backend Engineer",
+            location="Tel Aviv",
+            description=DESCRIPTION,
+        )
+    )
+    db_session.flush()
+
+    dedup = JobDeduplicator(MinHashIndex(threshold=0.7))
+    assert dedup.load_existing(db_session) >= 1
+    assert dedup.find_duplicate(posting())[0] == "job"
+
+
+def test_rescraped_posting_is_not_its_own_duplicate(db_session):
+    link = "https://example.com/apply/1"
+    careers = "https://example.com/careers"
+    db_session.add(
+        Job(
+            title="Senior Backend Engineer",
+            location="Tel Aviv",
+            description=DESCRIPTION,
+            apply_link=link,
+            source_url=careers,
+        )
+    )
+    db_session.flush()
+
+    dedup = JobDeduplicator(MinHashIndex(threshold=0.7))
+    dedup.load_existing(db_session)
+    assert dedup.check(posting(apply_link=link, source_url=careers)) is None
+    assert dedup.check(
+        posting(
+            apply_link="https://jobs.aggregator.io/9",
+            source_url="https://jobs.aggregator.io/israel",
+        )
+    ) == (careers, link)
+
+
+def test_aggregator_copy_with_the_company_apply_link_is_a_duplicate():
+    link = "https://acme.example/apply/1"
+    dedup = JobDeduplicator(MinHashIndex(threshold=0.7))
+    company = posting(apply_link=link, source_url="https://acme.example/careers")
+    copy = posting(apply_link=link, source_url="https://jobs.aggregator.io/acme")
+
+    assert list(dedup.filter([company, copy])) == [company]
@@ -0,0 +1,122 @@
+import importlib.util
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from tci.db.models import Company, Job
+from tci.ml.features.embeddings import (
+    SOURCES,
+    EmbeddingPipeline,
+    EmbeddingStats,
+    HashingEncoder,
+)
+
+SCRIPT = Path(__file__).parent.parent / "scripts" / "update_embeddings.py"
+
+
+class CountingEncoder(HashingEncoder):
+    def __init__(self):
+        super().__init__(dim=64)
+        self.texts = []
+
+    def encode(self, texts):
+        self.texts.extend(texts)
+        return super().encode(texts)
+
+
+@pytest.fixture
+def pipeline(tmp_path):
+    return EmbeddingPipeline(CountingEncoder(), path=tmp_path, batch_size=2)
+
+
+def test_hashing_encoder_is_deterministic():
+    a = HashingEncoder(dim=32).encode(["Backend engineer", "Data scientist"])
+    b = HashingEncoder(dim=32).encode(["Backend engineer", "Data scientist"])
+
+    assert a.shape == (2, 32)
+    np.testing.assert_array_equal(a, b)
+    assert np.linalg.norm(a[0]) == pytest.approx(1.0)
+
+
+def test_pipeline_only_encodes_new_text(db_session, pipeline):
+    companies = [
+        Company(name="Embed A", description="Cloud security"),
+        Company(name="Embed B", description="Chip design for data centers"),
+        Company(name="Embed C", description="Cloud security"),
+    ]
+    db_session.add_all(companies)
+    db_session.flush()
+
+    first = pipeline.run("companies", db_session)
+    assert first.encoded == 3
+    assert pipeline.store("companies").count() >= 3
+    # Texts are encoded shortest first
+    lengths = [len(text) for text in pipeline.encoder.texts]
+    assert lengths == sorted(lengths)
+
+    second = pipeline.run("companies", db_session)
+    assert (second.encoded, second.reused) == (0, 0)
+
+    companies[0].description = "Chip design for data centers"
+    db_session.flush()
+    third = pipeline.run("companies", db_session)
+    assert third.encoded == 1
+    assert third.unchanged >= 1
+
+    db_session.delete(companies[2])
+    db_session.flush()
+    assert pipeline.run("companies", db_session).removed == 1
+    assert companies[2].id not in pipeline.store("companies")
+
+
+def test_identical_texts_share_vectors(db_session, pipeline):
+    db_session.add_all([Job(title="QA Engineer", location="Haifa") for _ in range(3)])
+    db_session.flush()
+
+    stats = pipeline.run("jobs", db_session)
+    assert (stats.encoded, stats.reused) == (1, 2)
+
+    # A new row with known text is served from the content cache, also after
+    # reopening the pipeline
+    reopened = EmbeddingPipeline(pipeline.encoder, path=pipeline.path.parent)
+    db_session.add(Job(title="QA Engineer", location="Haifa"))
+    db_session.flush()
+    stats = reopened.run("jobs", db_session)
+    assert (stats.encoded, stats.reused) == (0, 1)
+    assert pipeline.encoder.texts == ["QA Engineer. Haifa"]
+
+
+@pytest.fixture
+def update_embeddings(monkeypatch):
+    """The update_embeddings script, with a pipeline that records its runs"""
+    spec = importlib.util.spec_from_file_location("update_embeddings", SCRIPT)
+    script = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(script)
+
+    class RecordingPipeline:
+        runs = []
+
+        def __init__(self, encoder):
+            pass
+
+        def run(self, kind, full=False):
+            self.runs.append(kind)
+            return EmbeddingStats()
+
+    monkeypatch.setattr(script, "EmbeddingPipeline", RecordingPipeline)
+    monkeypatch.setattr(script, "get_encoder", lambda name: None)
+    return script, RecordingPipeline.runs
+
+
+def test_update_embeddings_defaults_to_every_kind(update_embeddings):
+    script, runs = update_embeddings
+    script.main([])
+    assert runs == sorted(SOURCES)
+
+    runs.clear()
+    script.main(["jobs"])
+    assert runs == ["jobs"]
+
+    with pytest.raises(SystemExit):
+        script.main(["users"])
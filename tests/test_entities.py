@@ -0,0 +1,113 @@
+import pytest
+
+from tci.data.processors.entities import (
+    CompanyResolver,
+    canonical_domain,
+    company_domain,
+    normalize_name,
+)
+from tci.db.models import Company
+
+
+@pytest.mark.parametrize(
+    "name, expected",
+    [
+        ("Example Tech Ltd.", "example tech"),
+        ("EXAMPLE TECH, Inc", "example tech"),
+        ("Example Israel Ltd", "example"),
+        ("Wix.com Ltd", "wix"),
+        ("Ben & Jerry's", "ben and jerrys"),
+        ('אקזמפל טכנולוגיות בע"מ', "אקזמפל טכנולוגיות"),
+        ("אקזמפל טכנולוגיות בע״מ", "אקזמפל טכנולוגיות"),
+        ("Limited", "limited"),
+    ],
+)
+def test_normalize_name(name, expected):
+    assert normalize_name(name) == expected
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        ("https://www.Example.com/about?x=1", "example.com"),
+        ("example.com", "example.com"),
+        ("http://jobs.example.co.il:8080", "example.co.il"),
+        ("m.example.co.uk", "example.co.uk"),
+        ("not a url", None),
+        (None, None),
+    ],
+)
+def test_canonical_domain(url, expected):
+    assert canonical_domain(url) == expected
+
+
+def test_company_domain_ignores_shared_hosts():
+    assert company_domain("https://www.example.co.il/careers") == "example.co.il"
+    assert company_domain("https://www.linkedin.com/company/example") is None
+    assert company_domain("https://example.wixsite.com/home") is None
+    assert company_domain("https://sites.google.com/view/example") is None
+
+
+def test_resolver_matches_spelling_and_domain_variants():
+    resolver = CompanyResolver(threshold=0.9)
+    resolver.add("Example Tech", "https://example.com")
+    resolver.add("Other Labs", None)
+
+    assert resolver.resolve("Example Tech Ltd").name == "Example Tech"
+    assert resolver.resolve("Examplle Tech").name == "Example Tech"
+    by_domain = resolver.resolve("ExTech", "http://www.example.com/careers")
+    assert (by_domain.name, by_domain.reason) == ("Example Tech", "domain")
+    assert resolver.resolve("Example Tech", "https://example.co.il").name == (
+        "Example Tech"
+    )
+    # Same name but a different company website is not a match
+    assert resolver.resolve("Example Tech Inc", "https://another.io") is None
+    assert resolver.resolve("Unrelated Robotics") is None
+
+
+def test_resolver_needs_the_same_company_website():
+    resolver = CompanyResolver(threshold=0.9)
+    resolver.add("Wiz", "https://www.linkedin.com/company/wiz")
+    resolver.add("Alpha", "https://alpha.com")
+
+    assert resolver.resolve("Monday.com", "linkedin.com/company/monday") is None
+    assert resolver.resolve("Alpha Omega", "https://alpha.co.il") is None
+    assert resolver.resolve("Alpha", "https://alpha.co.il").name == "Alpha"
+
+
+def test_canonicalize_collapses_duplicates_within_a_batch():
+    resolver = CompanyResolver()
+    records = [
+        {"name": "Acme Robotics Ltd", "website": "acme.io"},
+        {"name": "ACME Robotics", "website": None},
+        {"name": "Acme", "website": "https://www.acme.io"},
+        {"name": "Beta Systems", "website": None},
+    ]
+
+    names = [record["name"] for record in resolver.canonicalize_all(records)]
+    assert names == [
+        "Acme Robotics Ltd",
+        "Acme Robotics Ltd",
+        "Acme Robotics Ltd",
+        "Beta Systems",
+    ]
+    assert len(resolver) == 2
+
+
+def test_load_existing(db_session):
+    db_session.add_all(
+        [
+            Company(name="Example Tech", website="https://example.com"),
+            Company(name="Other Labs"),
+        ]
+    )
+    db_session.flush()
+
+    resolver = CompanyResolver()
+    assert resolver.load_existing(db_session) == 2
+    record = resolver.canonicalize({"name": "Example Tech Ltd", "website": None})
+    assert record == {
+        "name": "Example Tech",
+        "website": None,
+        "source_name": "Example Tech Ltd",
+    }
@@ -0,0 +1,103 @@
+import csv
+import io
+from datetime import datetime, timedelta
+
+import orjson
+import pyarrow.parquet as pq
+import pytest
+from fastapi.testclient import TestClient
+
+from tci.api.routes import create_app
+from tci.data.export import export, stream_export
+from tci.db.models import Company, Job
+
+NOW = datetime(2024, 5, 1, 12, 0)
+
+
+@pytest.fixture
+def companies(db_session):
+    rows = [
+        Company(
+            name=f"Company {i}",
+            website=f"https://company{i}.com",
+            description=None if i % 2 else f"Line one\nline, two {i}",
+            updated_at=NOW - timedelta(days=i),
+        )
+        for i in range(7)
+    ]
+    db_session.add_all(rows)
+    db_session.flush()
+    return rows
+
+
+def test_ndjson_is_streamed_in_chunks(db_session, companies):
+    chunks = list(
+        stream_export("companies", "ndjson", chunk_size=3, session=db_session)
+    )
+    assert len(chunks) == 3
+
+    rows = [orjson.loads(line) for line in b"".join(chunks).splitlines()]
+    assert [row["name"] for row in rows] == [f"Company {i}" for i in range(7)]
+    assert rows[0]["updated_at"].startswith("2024-05-01T12:00:00")
+    assert rows[1]["description"] is None
+
+
+def test_csv_round_trips(db_session, companies):
+    out = io.BytesIO()
+    stats = export("companies", "csv", out, chunk_size=2, session=db_session)
+    assert stats.rows == 7 and stats.bytes == len(out.getvalue())
+
+    rows = list(csv.DictReader(io.StringIO(out.getvalue().decode("utf-8"))))
+    assert len(rows) == 7
+    assert rows[0]["description"] == "Line one\nline, two 0"
+
+
+def test_parquet_row_groups_and_incremental_filter(db_session, companies):
+    out = io.BytesIO()
+    since = NOW - timedelta(days=3)
+    stats = export(
+        "companies",
+        "parquet",
+        out,
+        updated_since=since,
+        chunk_size=2,
+        session=db_session,
+    )
+    assert stats.rows == 4
+
+    parquet = pq.ParquetFile(io.BytesIO(out.getvalue()))
+    assert parquet.metadata.num_row_groups == 2
+    table = parquet.read()
+    assert table.column("name").to_pylist() == [f"Company {i}" for i in range(4)]
+    assert table.schema.field("updated_at").type.unit == "us"
+
+
+def test_unknown_export(db_session):
+    with pytest.raises(ValueError):
+        stream_export("users", "ndjson", session=db_session)
+    with pytest.raises(ValueError):
+        stream_export("jobs", "xml", session=db_session)
+
+
+def test_export_endpoint(service_db, db_session, companies, monkeypatch):
+    monkeypatch.setattr("tci.data.export.db", service_db)
+    db_session.add(Job(title="Backend Engineer"))
+    db_session.flush()
+    client = TestClient(create_app())
+
+    response = client.get("/export/jobs")
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert [orjson.loads(line)["title"] for line in response.content.splitlines()] == [
+        "Backend Engineer"
+    ]
+
+    response = client.get(
+        "/export/companies",
+        params={"format": "csv", "updated_since": "2024-04-30T12:00:00+00:00"},
+    )
+    assert 'filename="companies.csv"' in response.headers["content-disposition"]
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["name"] for row in rows] == ["Company 0", "Company 1"]
+
+    assert client.get("/export/users").status_code == 404
+    assert client.get("/export/jobs", params={"format": "xml"}).status_code == 422
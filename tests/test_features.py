@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from tci.db.models import Company, Job
+from tci.ml.features.base import FeatureCache, one_hot
+from tci.ml.features.company import build_company_features
+from tci.ml.features.jobs import build_job_features
+
+
+@pytest.fixture
+def catalog(db_session):
+    acme = Company(name="Feature Acme", description="Cloud security platform")
+    beta = Company(name="Feature Beta", description="Chip design")
+    acme.jobs = [
+        Job(title="Backend Engineer", job_type="Full-time", location="Tel Aviv"),
+        Job(title="Security Researcher", job_type="Full-time", location="Haifa"),
+    ]
+    beta.jobs = [Job(title="Chip Designer", job_type="Part-time", location=None)]
+    db_session.add_all([acme, beta, Job(title="Freelance QA")])
+    db_session.flush()
+    return acme, beta
+
+
+def test_one_hot_skips_missing_values():
+    matrix, categories = one_hot(["b", None, "a", " b ", ""])
+
+    assert categories == ["a", "b"]
+    np.testing.assert_array_equal(
+        matrix.toarray(), [[0, 1], [0, 0], [1, 0], [0, 1], [0, 0]]
+    )
+
+
+def test_company_features(db_session, catalog, tmp_path):
+    acme, beta = catalog
+    features = build_company_features(
+        db_session, FeatureCache(tmp_path), n_features=2**10, chunk_size=1
+    )
+
+    assert list(features.ids[-2:]) == [acme.id, beta.id]
+    assert features.shape == (len(features.ids), 2**10 + 1)
+    job_counts = features.block("job_count").toarray().ravel()
+    np.testing.assert_allclose(np.expm1(job_counts[-2:]), [2, 1], rtol=1e-6)
+
+
+def test_job_features_and_cache(db_session, catalog, tmp_path):
+    cache = FeatureCache(tmp_path)
+    features = build_job_features(
+        db_session, cache, title_features=2**8, description_features=2**8
+    )
+    rows = np.searchsorted(features.ids, [job.id for job in catalog[0].jobs])
+
+    assert set(features.vocabularies["job_type"]) >= {"Full-time", "Part-time"}
+    locations = features.vocabularies["location"]
+    tel_aviv = locations.index("Tel Aviv")
+    assert features.block("location")[rows[0], tel_aviv] == 1
+    np.testing.assert_allclose(
+        np.expm1(features.block("company_job_count")[rows].toarray().ravel()), [2, 2]
+    )
+    assert cache.manifest["jobs"]["shape"] == list(features.shape)
+
+    cached = build_job_features(
+        db_session, cache, title_features=2**8, description_features=2**8
+    )
+    assert (cached.matrix != features.matrix).nnz == 0
+    assert cached.blocks == features.blocks
+
+    # New rows invalidate the cached set
+    db_session.add(Job(title="Product Manager", location="Tel Aviv"))
+    db_session.flush()
+    rebuilt = build_job_features(
+        db_session, cache, title_features=2**8, description_features=2**8
+    )
+    assert rebuilt.shape[0] == features.shape[0] + 1
@@ -0,0 +1,181 @@
+from tci.core.cache import query_cache
+from tci.data.loaders.jobs import JobLoader, content_hash, ingest_jobs, source_key
+from tci.data.processors.dedup import JobDeduplicator, MinHashIndex
+from tci.db.bulk import JobSyncCounts
+from tci.db.models import Company, Job
+
+PAGE = "https://example.com/careers"
+
+
+def posting(title, apply_link=None, description="Build things", **extra):
+    return {
+        "title": title,
+        "description": description,
+        "location": "Tel Aviv",
+        "department": "R&D",
+        "apply_link": apply_link,
+        "source_url": PAGE,
+        **extra,
+    }
+
+
+def test_keys_and_hashes_are_stable():
+    record = posting("Backend Engineer", "https://example.com/apply/1")
+    assert source_key(record) == source_key({**record, "title": "Renamed"})
+    assert source_key(record) != source_key({**record, "source_url": "https://x.io"})
+    # Without an apply link the title identifies the posting
+    assert source_key(posting("A")) != source_key(posting("B"))
+
+    assert content_hash(record) == content_hash(
+        {**record, "description": "  Build   things\n", "scraped_date": "today"}
+    )
+    assert content_hash(record) != content_hash({**record, "location": "Haifa"})
+
+
+def test_rescrape_touches_only_the_delta(db_session):
+    first = ingest_jobs(
+        [
+            posting("Backend Engineer", "https://example.com/apply/1"),
+            posting("Frontend Engineer", "https://example.com/apply/2"),
+            posting("Data Scientist"),
+            posting("  ", "https://example.com/apply/untitled"),
+        ],
+        session=db_session,
+        chunk_size=2,
+    )
+    assert first == JobSyncCounts(inserted=3, changed=0, unchanged=0, closed=0)
+    jobs = {job.title: job for job in db_session.query(Job)}
+    assert jobs["Backend Engineer"].department == "R&D"
+    assert jobs["Backend Engineer"].apply_link == "https://example.com/apply/1"
+    untouched = jobs["Frontend Engineer"].updated_at
+
+    second = ingest_jobs(
+        [
+            posting("Backend Engineer", "https://example.com/apply/1", "New stack"),
+            posting("Frontend Engineer", "https://example.com/apply/2"),
+            posting("DevOps Engineer", "https://example.com/apply/3"),
+        ],
+        session=db_session,
+    )
+    assert second == JobSyncCounts(inserted=1, changed=1, unchanged=1, closed=1)
+
+    db_session.expire_all()
+    jobs = {job.title: job for job in db_session.query(Job)}
+    assert jobs["Backend Engineer"].description == "New stack"
+    assert jobs["Frontend Engineer"].updated_at == untouched
+    assert jobs["Data Scientist"].closed_at is not None
+    assert all(
+        job.closed_at is None
+        for title, job in jobs.items()
+        if title != "Data Scientist"
+    )
+
+    # A posting listed again is reopened
+    third = ingest_jobs([posting("Data Scientist")], session=db_session)
+    assert (third.changed, third.closed) == (1, 3)
+    db_session.expire_all()
+    assert db_session.query(Job).filter(Job.closed_at.is_(None)).count() == 1
+
+
+def test_only_scraped_pages_are_closed(db_session):
+    other = posting("Designer", source_url="https://other.io/jobs")
+    ingest_jobs([posting("Backend Engineer"), other], session=db_session)
+
+    counts = ingest_jobs([posting("Backend Engineer")], session=db_session)
+    assert counts == JobSyncCounts(unchanged=1)
+
+    counts = ingest_jobs([], session=db_session, sources=["https://other.io/jobs"])
+    assert counts.closed == 1
+
+
+def test_job_changes_invalidate_dependent_caches(db_session):
+    namespaces = ("jobs", "companies", "analytics")
+    query_cache.clear()
+    for namespace in namespaces:
+        query_cache.set((namespace, "read"), "stale")
+
+    ingest_jobs([posting("Backend Engineer")], session=db_session)
+    assert all(query_cache.get((ns, "read")) is None for ns in namespaces)
+
+    # An unchanged rescrape keeps the caches
+    query_cache.set(("companies", "read"), "fresh")
+    ingest_jobs([posting("Backend Engineer")], session=db_session)
+    assert query_cache.get(("companies", "read")) == "fresh"
+    query_cache.clear()
+
+
+def test_loader_resolves_companies_and_drops_duplicates(db_session):
+    company = Company(name="Example", website="https://www.example.com")
+    db_session.add(company)
+    db_session.flush()
+
+    description = (
+        "Design and build scalable backend services in Python and PostgreSQL "
+        "and own our data pipelines end to end"
+    )
+    records = [
+        posting("Backend Engineer", "https://example.com/a/1", description),
+        # The same posting on an aggregator
+        posting(
+            "Backend Engineer",
+            "https://jobs.aggregator.io/77",
+            description,
+            source_url="https://jobs.aggregator.io/israel",
+        ),
+        posting("Product Manager", source_url="https://careers.example.com/jobs"),
+        posting("", "https://example.com/a/untitled"),
+    ]
+    loader = JobLoader(
+        batch_size=2, deduplicator=JobDeduplicator(MinHashIndex(threshold=0.7))
+    )
+    stats = loader.load(records, session=db_session)
+
+    assert stats.counts == JobSyncCounts(inserted=2)
+    assert (stats.scraped, stats.duplicates, stats.untitled) == (4, 1, 1)
+    assert (stats.batches, stats.unresolved) == (1, 0)
+    assert stats.rows_per_second > 0
+    assert {job.company_id for job in db_session.query(Job)} == {company.id}
+
+
+def test_renamed_posting_is_not_lost_to_dedup(db_session):
+    description = (
+        "Design and build scalable backend services in Python and PostgreSQL "
+        "and own our data pipelines end to end"
+    )
+    ingest_jobs([posting("Backend Engineer", description=description)], db_session)
+
+    # The page now lists the same posting under a new title, without an
+    # apply link, so it has a new source key
+    dedup = JobDeduplicator(MinHashIndex(threshold=0.7))
+    dedup.load_existing(db_session)
+    renamed = posting("Senior Backend Engineer", description=description)
+    stats = JobLoader(deduplicator=dedup, resolve_companies=False).load(
+        [renamed], session=db_session
+    )
+
+    assert stats.duplicates == 0
+    assert stats.counts == JobSyncCounts(inserted=1, closed=1)
+    db_session.expire_all()
+    open_jobs = db_session.query(Job).filter(Job.closed_at.is_(None)).all()
+    assert [job.title for job in open_jobs] == ["Senior Backend Engineer"]
+
+    # Likewise when the posting gets an apply link
+    linked = {**renamed, "apply_link": "https://example.com/apply/9"}
+    stats = JobLoader(deduplicator=dedup, resolve_companies=False).load(
+        [linked], session=db_session
+    )
+    assert stats.counts == JobSyncCounts(inserted=1, closed=1)
+    db_session.expire_all()
+    open_jobs = db_session.query(Job).filter(Job.closed_at.is_(None)).all()
+    assert [job.apply_link for job in open_jobs] == ["https://example.com/apply/9"]
+
+
+def test_loader_ignores_shared_host_websites(db_session):
+    db_session.add(Company(name="Wiz", website="https://linkedin.com/company/wiz"))
+    db_session.flush()
+
+    linkedin = posting("Designer", source_url="https://www.linkedin.com/jobs/42")
+    stats = JobLoader().load([linkedin], session=db_session)
+
+    assert stats.unresolved == 1
+    assert db_session.query(Job).one().company_id is None
@@ -0,0 +1,35 @@
+from sqlalchemy import text
+
+from tci.db.bulk import upsert_companies
+from tci.db.migrations import has_unique_company_names, unique_company_names
+from tci.db.models import Company, Job
+
+
+def test_unique_company_names_merges_duplicates(db_session):
+    # A database created before names were unique
+    db_session.execute(text("ALTER TABLE companies DROP CONSTRAINT companies_name_key"))
+    assert not has_unique_company_names(db_session)
+    first = Company(name="Acme", description="Robots")
+    second = Company(name="Acme", website="https://acme.io")
+    other = Company(name="Beta")
+    db_session.add_all([first, second, other])
+    db_session.flush()
+    job = Job(title="Engineer", company_id=second.id)
+    db_session.add(job)
+    db_session.flush()
+
+    counts = unique_company_names(db_session)
+    assert (counts.companies, counts.jobs) == (1, 1)
+    assert has_unique_company_names(db_session)
+    db_session.expire_all()
+    acme = db_session.query(Company).filter(Company.name == "Acme").one()
+    assert (acme.id, acme.website, acme.description) == (
+        first.id,
+        "https://acme.io",
+        "Robots",
+    )
+    assert db_session.get(Job, job.id).company_id == first.id
+
+    # ON CONFLICT (name) works again, and the migration is idempotent
+    assert upsert_companies(db_session, [{"name": "Acme"}]).skipped == 1
+    assert unique_company_names(db_session).companies == 0
@@ -0,0 +1,63 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from tci.db.models import Company, Job
+from tci.db.pagination import decode_cursor, encode_cursor, paginate
+
+
+@pytest.fixture
+def jobs(db_session):
+    company = Company(name="Example")
+    start = datetime(2024, 1, 1)
+    jobs = [
+        # Two jobs share a timestamp, the id breaks the tie
+        Job(
+            title=f"Job {i}",
+            company=company,
+            created_at=start + timedelta(hours=i // 2),
+        )
+        for i in range(7)
+    ]
+    db_session.add_all(jobs)
+    db_session.flush()
+    return sorted(jobs, key=lambda j: (j.created_at, j.id), reverse=True)
+
+
+def test_cursor_round_trip():
+    """Test that cursors survive encoding"""
+    created_at = datetime(2024, 5, 1, 12, 30)
+    assert decode_cursor(encode_cursor(created_at, 42)) == (created_at, 42, "next")
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+def test_paginate_forward_and_back(db_session, jobs):
+    """Test walking pages in both directions"""
+    query = db_session.query(Job)
+
+    first = paginate(query, Job, limit=3)
+    assert first.items == jobs[:3]
+    assert first.prev_cursor is None
+
+    second = paginate(query, Job, first.next_cursor, limit=3)
+    assert second.items == jobs[3:6]
+
+    last = paginate(query, Job, second.next_cursor, limit=3)
+    assert last.items == jobs[6:]
+    assert last.next_cursor is None
+
+    back = paginate(query, Job, last.prev_cursor, limit=3)
+    assert back.items == jobs[3:6]
+    assert paginate(query, Job, back.prev_cursor, limit=3).items == jobs[:3]
+
+
+def test_paginate_is_stable_under_inserts(db_session, jobs):
+    """Test that new rows do not shift the following pages"""
+    query = db_session.query(Job)
+    first = paginate(query, Job, limit=3)
+
+    db_session.add(Job(title="Newest", company=jobs[0].company))
+    db_session.flush()
+
+    assert paginate(query, Job, first.next_cursor, limit=3).items == jobs[3:6]
@@ -0,0 +1,119 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import func, select
+
+from tci.db.models import Company, Job, JobRollup, RollupState
+from tci.db.rollups import refresh_job_rollups
+from tci.services.analytics import analytics_service
+
+CREATED = datetime(2024, 5, 8, 9, 0)  # a Wednesday
+
+
+def rollups(session):
+    return {
+        (row.dimension, row.key): row.job_count
+        for row in session.scalars(select(JobRollup))
+    }
+
+
+def aggregated(session):
+    """The rollups computed the slow way, straight from the jobs table"""
+    expected = {("total", "all"): session.scalar(select(func.count(Job.id)))}
+    open_jobs = select(Job).where(Job.closed_at.is_(None)).subquery()
+    for dimension, column in (
+        ("company", open_jobs.c.company_id),
+        ("location", open_jobs.c.location),
+        ("job_type", open_jobs.c.job_type),
+    ):
+        for value, count in session.execute(
+            select(column, func.count()).group_by(column)
+        ):
+            expected[(dimension, "" if value is None else str(value))] = count
+    open_count = session.scalar(select(func.count()).select_from(open_jobs))
+    if open_count:
+        expected[("total", "open")] = open_count
+    for job in session.scalars(select(Job)):
+        week = job.created_at.date() - timedelta(days=job.created_at.weekday())
+        key = ("week", week.isoformat())
+        expected[key] = expected.get(key, 0) + 1
+    return expected
+
+
+@pytest.fixture
+def jobs(db_session):
+    company = Company(name="Acme")
+    db_session.add(company)
+    db_session.flush()
+    rows = [
+        Job(
+            title=f"Engineer {i}",
+            company_id=company.id if i % 2 else None,
+            location="Tel Aviv" if i < 3 else "Haifa",
+            job_type="Full-time",
+            created_at=CREATED - timedelta(days=7 * (i % 2)),
+        )
+        for i in range(5)
+    ]
+    db_session.add_all(rows)
+    db_session.flush()
+    return rows
+
+
+def test_full_refresh_matches_group_by(db_session, jobs):
+    stats = refresh_job_rollups(db_session, full=True)
+    assert stats.scanned == 5 and stats.changed == 5
+
+    counts = rollups(db_session)
+    assert counts == aggregated(db_session)
+    assert counts[("location", "Tel Aviv")] == 3
+    assert counts[("week", "2024-05-06")] == 3
+    assert counts[("company", "")] == 3
+
+
+def test_incremental_refresh_applies_changes(db_session, jobs):
+    refresh_job_rollups(db_session)
+    stats = refresh_job_rollups(db_session)
+    assert stats.changed == 0 and stats.keys_updated == 0
+
+    jobs[0].location = "Haifa"
+    jobs[1].closed_at = datetime.utcnow()
+    db_session.delete(jobs[2])
+    db_session.add(Job(title="New", location="Jerusalem", created_at=CREATED))
+    db_session.flush()
+
+    stats = refresh_job_rollups(db_session)
+    assert (stats.changed, stats.deleted) == (3, 1)
+    counts = rollups(db_session)
+    assert counts == aggregated(db_session)
+    assert ("location", "Tel Aviv") not in counts
+    assert counts[("location", "Jerusalem")] == 1
+
+
+def test_refresh_only_reads_jobs_changed_since_watermark(db_session, jobs):
+    refresh_job_rollups(db_session)
+    state = db_session.get(RollupState, "jobs")
+    assert state.watermark == max(job.updated_at for job in jobs)
+
+    # Pretend the jobs were last refreshed long ago
+    state.watermark += timedelta(days=1)
+    db_session.flush()
+    assert refresh_job_rollups(db_session).scanned == 0
+
+
+def test_analytics_service_reads_rollups(service_db, db_session, jobs):
+    assert analytics_service.last_refreshed() is None
+
+    analytics_service.refresh()
+    assert analytics_service.get_totals() == {"all": 5, "open": 5}
+    companies = analytics_service.get_counts("company")
+    assert [(row.label, row.job_count) for row in companies] == [
+        ("Unknown", 3),
+        ("Acme", 2),
+    ]
+    weeks = analytics_service.get_counts("week", by_key=True)
+    assert [row.key for row in weeks] == ["2024-04-29", "2024-05-06"]
+    assert analytics_service.last_refreshed() is not None
+
+    with pytest.raises(ValueError):
+        analytics_service.get_counts("salary")
@@ -0,0 +1,254 @@
+import time
+
+import pytest
+import requests
+
+from tci.data.scrapers.base import Crawler, HostRateLimiter
+from tci.data.scrapers.cache import FetchCache
+from tci.data.scrapers.company import scrape_startup_database
+from tci.data.scrapers.jobs import (
+    extract_job_openings,
+    iter_crawled_job_openings,
+    iter_job_openings,
+    parse_job_openings,
+    scrape_job_openings,
+)
+from tci.data.scrapers.parsers import get_parser
+
+JOBS_PAGE = b"""
+<html><body>
+  <div class="job-posting">
+    <h3 class="job-title">Backend Engineer</h3>
+    <div class="department">R&amp;D</div>
+    <div class="location">Tel Aviv</div>
+    <div class="job-description">Build APIs</div>
+    <a class="apply-button" href="/apply/1">Apply</a>
+  </div>
+  <div class="job-posting">
+    <h3 class="job-title">Data Scientist</h3>
+    <div class="location">Haifa</div>
+  </div>
+</body></html>
+"""
+
+COMPANIES_PAGE = b"""
+<div class="portfolio-company">
+  <h3 class="company-name">Example Tech</h3>
+  <p class="company-description">Cloud security</p>
+  <a class="company-website" href="https://example.com">site</a>
+</div>
+"""
+
+
+def test_scrape_job_openings(http_server):
+    """Test scraping a single career page through the crawler"""
+    base_url, pages, _ = http_server
+    pages["/careers"] = JOBS_PAGE
+
+    df = scrape_job_openings(f"{base_url}/careers", crawler=Crawler(delay=0))
+
+    assert list(df["title"]) == ["Backend Engineer", "Data Scientist"]
+    assert df.loc[0, "apply_link"] == "/apply/1"
+    assert df["department"].isna().tolist() == [False, True]
+    assert (df["source_url"] == f"{base_url}/careers").all()
+
+
+def test_scrape_startup_database(http_server):
+    """Test scraping a startup database page through the crawler"""
+    base_url, pages, requests_log = http_server
+    pages["/portfolio"] = COMPANIES_PAGE
+
+    df = scrape_startup_database(f"{base_url}/portfolio", crawler=Crawler(delay=0))
+
+    assert df.to_dict("records") == [
+        {
+            "name": "Example Tech",
+            "description": "Cloud security",
+            "website": "https://example.com",
+            "source_url": f"{base_url}/portfolio",
+        }
+    ]
+    assert requests_log[0][1]["User-Agent"] == "TCI Bot/1.0"
+
+
+def test_scrape_job_openings_missing_page(http_server):
+    """Test that fetch errors keep surfacing as RequestException"""
+    base_url, _, _ = http_server
+    with pytest.raises(requests.RequestException):
+        scrape_job_openings(f"{base_url}/missing", crawler=Crawler(delay=0))
+
+
+def test_crawl_collects_results_and_stats(http_server):
+    """Test concurrent crawling with an extractor and throughput stats"""
+    base_url, pages, _ = http_server
+    urls = []
+    for i in range(10):
+        pages[f"/jobs/{i}"] = JOBS_PAGE
+        urls.append(f"{base_url}/jobs/{i}")
+    urls.append(f"{base_url}/missing")
+
+    with Crawler(max_workers=4, delay=0) as crawler:
+        results = list(crawler.crawl(urls, extract_job_openings))
+
+    ok = [r for r in results if r.ok]
+    failed = [r for r in results if not r.ok]
+    assert len(ok) == 10
+    assert all(len(r.data) == 2 for r in ok)
+    assert [r.status_code for r in failed] == [404]
+    assert crawler.stats.pages == 10
+    assert crawler.stats.failures == 1
+    assert crawler.stats.pages_per_second > 0
+
+
+def test_crawl_bounds_outstanding_pages(http_server):
+    """Test that only a window of URLs is submitted ahead of the consumer"""
+    base_url, pages, _ = http_server
+    submitted = 0
+
+    def urls():
+        nonlocal submitted
+        for i in range(50):
+            pages[f"/page/{i}"] = JOBS_PAGE
+            submitted += 1
+            yield f"{base_url}/page/{i}"
+
+    consumed = 0
+    with Crawler(max_workers=2, delay=0) as crawler:
+        for result in crawler.crawl(urls(), lambda url, content: content):
+            assert result.ok
+            consumed += 1
+            assert submitted - consumed < 4
+
+    assert consumed == 50
+
+
+def test_parse_job_openings_is_lazy():
+    """Test that records are yielded one container at a time"""
+    records = parse_job_openings("http://example.com", JOBS_PAGE)
+    assert next(records)["title"] == "Backend Engineer"
+    assert next(records)["title"] == "Data Scientist"
+    assert next(records, None) is None
+
+
+def test_iter_job_openings_batches(http_server):
+    """Test streaming records in fixed-size batches"""
+    base_url, pages, _ = http_server
+    pages["/careers"] = JOBS_PAGE * 3
+
+    batches = list(
+        iter_job_openings(f"{base_url}/careers", batch_size=4, crawler=Crawler(delay=0))
+    )
+
+    assert [len(batch) for batch in batches] == [4, 2]
+
+
+def test_iter_crawled_job_openings_skips_failed_pages(http_server):
+    """Test streaming records from many pages"""
+    base_url, pages, _ = http_server
+    pages["/a"] = JOBS_PAGE
+    pages["/b"] = JOBS_PAGE
+    urls = [f"{base_url}/a", f"{base_url}/b", f"{base_url}/missing"]
+
+    records = list(iter_crawled_job_openings(urls, crawler=Crawler(delay=0)))
+
+    assert len(records) == 4
+    assert {r["source_url"] for r in records} == set(urls[:2])
+
+
+def test_host_rate_limiter_spaces_requests_per_host():
+    """Test that the limiter only delays requests to the same host"""
+    limiter = HostRateLimiter(0.05)
+    start = time.monotonic()
+    limiter.wait("http://a.example/1")
+    limiter.wait("http://b.example/1")
+    assert time.monotonic() - start < 0.05
+
+    limiter.wait("http://a.example/2")
+    assert time.monotonic() - start >= 0.05
+
+
+def test_fetch_cache_serves_not_modified_from_disk(http_server, tmp_path):
+    """Test conditional revalidation against the local server"""
+    base_url, pages, requests_log = http_server
+    pages["/careers"] = JOBS_PAGE
+    url = f"{base_url}/careers"
+    cache = FetchCache(tmp_path)
+    crawler = Crawler(delay=0, cache=cache)
+
+    first = crawler.fetch(url)
+    second = crawler.fetch(url)
+
+    assert not first.from_cache
+    assert second.from_cache
+    assert second.content == JOBS_PAGE
+    assert "If-None-Match" not in requests_log[0][1]
+    assert (
+        requests_log[1][1]["If-None-Match"]
+        == cache.conditional_headers(url)["If-None-Match"]
+    )
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+    # Changed pages are downloaded again and replace the cached body
+    pages["/careers"] = COMPANIES_PAGE
+    third = crawler.fetch(url)
+    assert not third.from_cache
+    assert third.content == COMPANIES_PAGE
+
+    # The cache survives a restart
+    cache.close()
+    reopened = FetchCache(tmp_path)
+    assert Crawler(delay=0, cache=reopened).fetch(url).from_cache
+
+
+def test_fetch_cache_evicts_least_recently_used(tmp_path):
+    """Test that the cache stays within its size bound"""
+    cache = FetchCache(tmp_path, max_bytes=250)
+    headers = {"ETag": '"v1"'}
+    cache.store("http://a.example/1", b"a" * 100, headers)
+    cache.store("http://a.example/2", b"b" * 100, headers)
+    assert cache.load("http://a.example/1") == b"a" * 100
+
+    cache.store("http://a.example/3", b"c" * 100, headers)
+
+    assert cache.size == 200
+    assert cache.evictions == 1
+    assert cache.conditional_headers("http://a.example/2") == {}
+    assert cache.conditional_headers("http://a.example/1") == {"If-None-Match": '"v1"'}
+
+
+@pytest.mark.parametrize("parser", ["soup", "lxml"])
+def test_parser_backends_agree(parser):
+    """Test that both backends extract the same fields"""
+    content = """
+    <html><head><meta charset="utf-8"></head><body>
+    <section id="jobs"><ul>
+      <li class="job"><h3>מפתח/ת Backend</h3><a href="/a">Apply</a></li>
+      <li class="job"><h3>Data &amp; ML</h3><!-- note --></li>
+    </ul></section>
+    <aside><li class="job"><h3>Elsewhere</h3></li></aside>
+    """.encode()
+    selectors = {
+        "job_container": "section#jobs ul > li.job",
+        "title": "h3",
+        "link": "a",
+        # Reaches above the container, which soupsieve allows
+        "section": "#jobs li.job > h3",
+    }
+
+    records = list(
+        get_parser(parser).iter_records(
+            content, selectors, "job_container", href_fields=("link",)
+        )
+    )
+
+    assert records == [
+        {"title": "מפתח/ת Backend", "link": "/a", "section": "מפתח/ת Backend"},
+        {"title": "Data & ML", "link": None, "section": "Data & ML"},
+    ]
+
+
+def test_invalid_selector_raises_value_error():
+    """Test that bad selectors surface as ValueError"""
+    with pytest.raises(ValueError):
+        extract_job_openings("http://example.com", JOBS_PAGE, {"job_container": "div["})
@@ -0,0 +1,86 @@
+import pytest
+
+from tci.core.cache import query_cache
+from tci.core.config import settings
+from tci.data.loaders.jobs import JobLoader
+from tci.db.models import Company, Job
+from tci.db.search import apply_search, to_prefix_tsquery
+from tci.services.jobs import JobService
+from tci.services.search import SearchIndexService
+
+
+def test_to_prefix_tsquery():
+    """Test that every word becomes a prefix term"""
+    assert to_prefix_tsquery("Cyber Sec") == "cyber:* & sec:*"
+    assert to_prefix_tsquery("מפתח/ת") == "מפתח:* & ת:*"
+    assert to_prefix_tsquery("  '&|!  ") is None
+
+
+def test_apply_search_ranks_companies(db_session):
+    """Test prefix matching and relevance ordering"""
+    db_session.add_all(
+        [
+            Company(name="Acme", description="Payments with cyber security"),
+            Company(name="CyberArk", description="Identity security"),
+            Company(name="Wix", description="Website builder"),
+        ]
+    )
+    db_session.flush()
+
+    query = apply_search(db_session.query(Company), Company, "cyber")
+    assert [c.name for c in query] == ["CyberArk", "Acme"]
+
+    assert apply_search(db_session.query(Company), Company, "").count() == 3
+
+
+def test_apply_search_jobs_hebrew(db_session):
+    """Test that Hebrew text is searchable"""
+    company = Company(name="Example")
+    db_session.add_all(
+        [
+            Job(title="מפתח Backend", location="תל אביב", company=company),
+            Job(title="Data Scientist", location="Haifa", company=company),
+        ]
+    )
+    db_session.flush()
+
+    query = apply_search(db_session.query(Job), Job, "תל")
+    assert [j.title for j in query] == ["מפתח Backend"]
+
+
+@pytest.fixture
+def memory_search(service_db, monkeypatch):
+    monkeypatch.setattr(settings, "SEARCH_BACKEND", "memory")
+    index = SearchIndexService()
+    monkeypatch.setattr("tci.services.jobs.search_index", index)
+    monkeypatch.setattr("tci.data.loaders.jobs.search_index", index)
+    return index
+
+
+def test_memory_index_picks_up_new_and_closed_jobs(
+    db_session, memory_search, monkeypatch
+):
+    service = JobService()
+    page = "https://example.com/careers"
+    posting = {"title": "Kubernetes Engineer", "source_url": page}
+    assert service.search_jobs("kubernetes") == []
+
+    # Loaded jobs are found on the next search
+    JobLoader(resolve_companies=False).load([posting], session=db_session)
+    assert [job.title for job in service.search_jobs("kubernetes")] == [
+        "Kubernetes Engineer"
+    ]
+
+    # So are rows written elsewhere, once the refresh interval has passed
+    monkeypatch.setattr(settings, "SEARCH_REFRESH_INTERVAL", 0)
+    db_session.add(Job(title="Kubernetes SRE"))
+    db_session.flush()
+    query_cache.invalidate("jobs")
+    assert len(service.search_jobs("kubernetes")) == 2
+
+    # Closed jobs drop out
+    JobLoader(resolve_companies=False).load([], session=db_session, sources=[page])
+    assert [job.title for job in service.search_jobs("kubernetes")] == [
+        "Kubernetes SRE"
+    ]
+    assert len(memory_search.jobs) == 1
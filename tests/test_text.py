@@ -0,0 +1,51 @@
+from tci.data.processors.text import BM25Index, tokenize
+
+
+def test_tokenize_english_and_hebrew():
+    """Test normalization, stopwords and Hebrew prefix expansion"""
+    assert tokenize("Senior Engineers in the Cloud") == ["senior", "engineer", "cloud"]
+    assert tokenize("מְפַתֵּחַ") == ["מפתח"]
+    assert tokenize("ובתל אביב", expand_prefixes=True) == ["ובתל", "בתל", "אביב"]
+
+
+def test_bm25_ranking():
+    """Test that documents are ranked by relevance"""
+    index = BM25Index()
+    index.add(1, "Backend engineer, Python and PostgreSQL")
+    index.add(2, "Python Python data engineer")
+    index.add(3, "Product designer")
+
+    assert [doc_id for doc_id, _ in index.search("python")] == [2, 1]
+    assert index.search("designer")[0][0] == 3
+    assert index.search("kotlin") == []
+
+
+def test_bm25_prefix_and_hebrew_queries():
+    """Test search-as-you-type and Hebrew prefixes"""
+    index = BM25Index()
+    index.add("a", "מפתחת Full Stack בתל אביב")
+    index.add("b", "Data analyst in Haifa")
+
+    assert [doc_id for doc_id, _ in index.search("anal")] == ["b"]
+    assert [doc_id for doc_id, _ in index.search("anal", prefix=False)] == []
+    assert [doc_id for doc_id, _ in index.search("תל אביב")] == ["a"]
+
+
+def test_bm25_update_and_delete():
+    """Test incremental updates, deletes and compaction"""
+    index = BM25Index(compact_ratio=0.5)
+    for doc_id in range(4):
+        index.add(doc_id, f"engineer number{doc_id}")
+
+    index.update(0, "designer")
+    assert 0 not in [doc_id for doc_id, _ in index.search("engineer")]
+    assert index.search("designer")[0][0] == 0
+
+    assert index.remove(1)
+    assert not index.remove(1)
+    index.remove(2)
+    assert len(index) == 2
+    # Compaction dropped the tombstoned slots
+    assert len(index._doc_ids) == 2
+    assert [doc_id for doc_id, _ in index.search("engineer")] == [3]
+    assert [doc_id for doc_id, _ in index.search("number3")] == [3]
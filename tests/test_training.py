@@ -0,0 +1,121 @@
+import numpy as np
+import pytest
+from scipy import sparse
+from sklearn.linear_model import LogisticRegression
+
+from tci.ml.training.pipelines import (
+    Pipeline,
+    Stage,
+    cross_validate_candidates,
+    evaluate_job_type_model,
+    save_model,
+    search_job_type_model,
+    split_data,
+)
+
+calls = []
+source = {"value": 1}
+
+
+def load(scale=1):
+    calls.append("load")
+    return source["value"] * scale
+
+
+def parity(load):
+    calls.append("parity")
+    return load % 2
+
+
+def describe(parity):
+    calls.append("describe")
+    return "odd" if parity else "even"
+
+
+def make_pipeline(tmp_path, scale=1):
+    return Pipeline(
+        "toy",
+        [
+            Stage("load", load, params={"scale": scale}, fingerprint=lambda: source),
+            Stage("parity", parity, inputs=("load",)),
+            Stage("describe", describe, inputs=("parity",)),
+        ],
+        cache_dir=tmp_path,
+    )
+
+
+def test_pipeline_reruns_only_affected_stages(tmp_path):
+    calls.clear()
+    source["value"] = 1
+    assert make_pipeline(tmp_path).run().artifacts["describe"] == "odd"
+    assert calls == ["load", "parity", "describe"]
+
+    calls.clear()
+    result = make_pipeline(tmp_path).run()
+    assert calls == []
+    assert all(timing.cached for timing in result.timings)
+
+    # New source data with the same parity: only the first two stages rerun
+    calls.clear()
+    source["value"] = 3
+    assert make_pipeline(tmp_path).run().artifacts["describe"] == "odd"
+    assert calls == ["load", "parity"]
+
+    calls.clear()
+    make_pipeline(tmp_path, scale=2).run()
+    assert calls == ["load", "parity", "describe"]
+
+
+def test_pipeline_rejects_unknown_inputs(tmp_path):
+    with pytest.raises(ValueError):
+        Pipeline("bad", [Stage("fit", parity, inputs=("load",))], tmp_path)
+
+
+@pytest.fixture
+def dataset():
+    rng = np.random.default_rng(0)
+    y = np.array(["full-time", "part-time"] * 30)
+    X = rng.normal(size=(60, 8)) + (y == "part-time")[:, None] * 2
+    return {"X": sparse.csr_matrix(X), "y": y, "ids": np.arange(60)}
+
+
+def test_cross_validation_in_process_pool(dataset):
+    results = cross_validate_candidates(
+        LogisticRegression(),
+        [{"C": 0.01}, {"C": 1.0}],
+        dataset["X"],
+        dataset["y"],
+        n_splits=3,
+        n_jobs=2,
+    )
+
+    assert [result["params"] for result in results] == [{"C": 0.01}, {"C": 1.0}]
+    assert all(0.5 < result["mean_score"] <= 1.0 for result in results)
+
+
+def test_job_type_stages_and_save(dataset, tmp_path):
+    split = split_data(dataset)
+    search = search_job_type_model(dataset, split, C=(1.0,), n_splits=3, n_jobs=1)
+    metrics = evaluate_job_type_model(dataset, split, search)
+    assert metrics["accuracy"] > 0.7
+
+    pipeline = Pipeline(
+        "job_type",
+        [
+            Stage("load", lambda: dataset),
+            Stage("split", split_data, inputs=("load",)),
+            Stage(
+                "search",
+                search_job_type_model,
+                inputs=("load", "split"),
+                params={"C": (1.0,), "n_splits": 3},
+            ),
+            Stage(
+                "evaluate", evaluate_job_type_model, inputs=("load", "split", "search")
+            ),
+        ],
+        cache_dir=tmp_path / "cache",
+    )
+    path = save_model("job_type", pipeline.run(), tmp_path / "models")
+    assert path.exists()
+    assert (tmp_path / "models" / "job_type.json").exists()
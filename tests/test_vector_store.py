@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+
+from tci.db.vector_store import LocalVectorStore, ScoredVector
+
+
+@pytest.fixture
+def vectors():
+    rng = np.random.default_rng(42)
+    return rng.normal(size=(500, 16)).astype(np.float32)
+
+
+def exact_top_k(vectors, query, k):
+    unit = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    scores = unit @ (query / np.linalg.norm(query))
+    return list(np.argsort(-scores)[:k])
+
+
+@pytest.mark.parametrize("dtype", ["float32", "float16", "int8"])
+def test_search_matches_exact_cosine(vectors, dtype):
+    store = LocalVectorStore(dim=16, dtype=dtype, block_size=128)
+    store.upsert(list(range(500)), vectors)
+    query = vectors[7] + 0.1
+
+    results = store.search(query, limit=5)
+    assert results[0].id == 7
+    expected = exact_top_k(vectors, query, 5)
+    overlap = len({r.id for r in results} & set(expected))
+    assert overlap == 5 if dtype == "float32" else overlap >= 4
+    assert results[0].score == pytest.approx(
+        float(
+            np.dot(vectors[7], query)
+            / np.linalg.norm(vectors[7])
+            / np.linalg.norm(query)
+        ),
+        abs=1e-2,
+    )
+
+
+def test_batched_search(vectors):
+    store = LocalVectorStore(dim=16, block_size=64)
+    store.upsert(list(range(500)), vectors)
+
+    results = store.search_batch(vectors[:3], limit=2)
+    assert [batch[0].id for batch in results] == [0, 1, 2]
+    assert all(len(batch) == 2 for batch in results)
+
+
+def test_upsert_and_delete_use_tombstones(vectors):
+    store = LocalVectorStore(dim=16)
+    store.upsert([1, 2, 3], vectors[:3])
+    store.upsert([2], vectors[10:11])
+
+    assert store.count() == 3
+    assert store.search(vectors[1], limit=1) != [ScoredVector(2, pytest.approx(1.0))]
+    assert store.search(vectors[10], limit=1)[0].id == 2
+    assert store.delete([1, 99]) == 1
+    assert 1 not in store
+    assert all(r.id != 1 for r in store.search(vectors[0], limit=3))
+
+    store.compact()
+    assert store.count() == 2
+    assert store.search(vectors[10], limit=1)[0].id == 2
+
+
+def test_persistence_and_growth(tmp_path, vectors):
+    path = tmp_path / "jobs"
+    with LocalVectorStore(path, dim=16, dtype="float16") as store:
+        for start in range(0, 500, 100):
+            store.upsert(list(range(start, start + 100)), vectors[start : start + 100])
+        store.delete([5])
+
+    reopened = LocalVectorStore(path)
+    assert (reopened.dim, reopened.dtype, reopened.count()) == (16, "float16", 499)
+    assert reopened.search(vectors[123], limit=1)[0].id == 123
+    assert 5 not in reopened
+    with pytest.raises(ValueError):
+        LocalVectorStore(path, dim=8)
+
+
+def test_ivf_search(tmp_path, vectors):
+    store = LocalVectorStore(tmp_path / "ivf", dim=16)
+    store.upsert(list(range(500)), vectors)
+    store.build_ivf(n_lists=8, n_probe=8)
+
+    # Probing every list is exact
+    assert [r.id for r in store.search(vectors[42], limit=5)] == exact_top_k(
+        vectors, vectors[42], 5
+    )
+
+    store.n_probe = 2
+    store.upsert([1000], vectors[42] * 2)
+    assert {r.id for r in store.search(vectors[42], limit=2)} == {42, 1000}
+    store.flush()
+    assert LocalVectorStore(tmp_path / "ivf").search(vectors[42], limit=1)[0].id in (
+        42,
+        1000,
+    )